@@ -0,0 +1,125 @@
+"""
+Throughput of the sync (WSGI) and async (ASGI) deployments under concurrent connections.
+
+Start both deployments against the same database and Redis, e.g.::
+
+    gunicorn blog_api.wsgi:application -w 4 -b 127.0.0.1:8000
+    BLOG_ASYNC_READS=true DB_CONN_MAX_AGE=0 \\
+        gunicorn blog_api.asgi:application -w 4 -k uvicorn.workers.UvicornWorker \\
+        -b 127.0.0.1:8001
+
+then drive them with the same number of keep-alive connections::
+
+    uv run python -m benchmarks.bench_asgi \\
+        --url http://127.0.0.1:8000/api/posts/ --url http://127.0.0.1:8001/api/posts/ \\
+        --concurrency 200 --duration 20
+
+The load generator is a plain asyncio HTTP/1.1 client, so it needs no extra
+packages and is not itself the bottleneck at a few hundred connections.
+"""
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.common import parser
+
+
+async def read_response(reader):
+    """
+    Read one response with a Content-Length body.
+
+    Returns the status and whether the server keeps the connection open.
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed by server')
+    status = int(status_line.split()[1])
+    keep_alive = status_line.startswith(b'HTTP/1.1')
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'connection':
+            keep_alive = value == 'keep-alive'
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def connection_worker(url, deadline, latencies, errors):
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    request = (
+        f'GET {path or "/"} HTTP/1.1\r\n'
+        f'Host: {parts.netloc}\r\n'
+        'Accept: application/json\r\n'
+        'Connection: keep-alive\r\n\r\n'
+    ).encode()
+
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(
+                    parts.hostname, parts.port or 80
+                )
+            started = time.perf_counter()
+            writer.write(request)
+            status, keep_alive = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+            if not keep_alive:
+                writer.close()
+                reader = writer = None
+        except (ConnectionError, OSError, asyncio.IncompleteReadError) as exc:
+            errors.append(type(exc).__name__)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run(url, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        connection_worker(url, deadline, latencies, errors) for _ in range(concurrency)
+    ))
+    return latencies, errors
+
+
+def main():
+    argument_parser = parser(__doc__)
+    argument_parser.add_argument(
+        '--url', action='append', required=True,
+        help='Endpoint to load; pass once per deployment to compare.'
+    )
+    argument_parser.add_argument(
+        '--concurrency', type=int, default=100,
+        help='Concurrent keep-alive connections.'
+    )
+    argument_parser.add_argument(
+        '--duration', type=float, default=10.0, help='Seconds to run each scenario.'
+    )
+    args = argument_parser.parse_args()
+
+    for url in args.url:
+        latencies, errors = asyncio.run(run(url, args.concurrency, args.duration))
+        ordered = sorted(latencies) or [0.0]
+        p99 = ordered[max(int(len(ordered) * 0.99) - 1, 0)]
+        print(
+            f'{url:<45} {len(latencies) / args.duration:9.1f} req/s  '
+            f'median {statistics.median(ordered) * 1000:8.2f} ms  '
+            f'p99 {p99 * 1000:8.2f} ms  errors {len(errors)}'
+        )
+
+
+if __name__ == '__main__':
+    main()
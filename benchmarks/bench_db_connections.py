@@ -0,0 +1,47 @@
+"""
+Per-request database connection overhead with and without persistent connections.
+
+Simulates the request lifecycle (request_started -> one query -> request_finished)
+so Django opens, reuses and closes connections exactly as it does when serving
+requests. Run it against PostgreSQL to see the TCP + auth + backend fork cost::
+
+    uv run python -m benchmarks.bench_db_connections --settings settings.dev
+"""
+from benchmarks.common import measure, parser, report, setup_django
+
+
+SCENARIOS = [
+    ('CONN_MAX_AGE=0 (connect per request)', 0, False),
+    ('CONN_MAX_AGE=60', 60, False),
+    ('CONN_MAX_AGE=60 + CONN_HEALTH_CHECKS', 60, True),
+]
+
+
+def main():
+    args = parser(__doc__, default_settings='settings.dev').parse_args()
+    setup_django(args.settings)
+
+    from django.core import signals
+    from django.db import connection
+
+    if connection.vendor == 'sqlite':
+        print(
+            'Note: SQLite connections are local; use PostgreSQL for meaningful numbers.'
+        )
+
+    def request_cycle():
+        signals.request_started.send(sender=None)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        signals.request_finished.send(sender=None)
+
+    for label, max_age, health_checks in SCENARIOS:
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+        report(label, measure(request_cycle, args.iterations))
+    connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Middleware overhead: the default stack versus the API-only profile (settings.api).
+
+Times cached GET /api/posts/ requests, anonymous and with a token, through the
+full middleware chain and through the lean one that skips sessions, CSRF,
+auth, messages and clickjacking for /api/::
+
+    uv run python -m benchmarks.bench_middleware
+"""
+from benchmarks.common import measure, parser, report, setup_django
+
+
+def main():
+    args = parser(__doc__).parse_args()
+    setup_django(args.settings, migrate=True)
+
+    from django.contrib.auth.models import User
+    from django.test import Client, override_settings
+    from rest_framework.authtoken.models import Token
+    from rest_framework.settings import api_settings
+    from rest_framework.views import APIView
+    from blog.models import BlogPost
+    import settings.api as api_profile
+
+    author = User.objects.create_user(username='bench', email='bench@example.com')
+    token = Token.objects.create(user=author)
+    # create(), not bulk_create(): the list reads the PostSummary rows its signals write
+    for i in range(20):
+        BlogPost.objects.create(title=f'Post {i}', content='Body.', author=author)
+
+    # The test client's host is not in ALLOWED_HOSTS outside the test runner
+    profiles = {
+        'full stack': {'ALLOWED_HOSTS': ['testserver']},
+        'lean API': {
+            'ALLOWED_HOSTS': ['testserver'],
+            'MIDDLEWARE': api_profile.MIDDLEWARE,
+            'BLOG_FULL_STACK_MIDDLEWARE': api_profile.BLOG_FULL_STACK_MIDDLEWARE,
+            'BLOG_LEAN_PATH_PREFIXES': api_profile.BLOG_LEAN_PATH_PREFIXES,
+            'REST_FRAMEWORK': api_profile.REST_FRAMEWORK,
+        },
+    }
+    client = Client()
+    for name, overrides in profiles.items():
+        with override_settings(**overrides):
+            # Views read their authentication classes when they are first imported
+            APIView.authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+            print(f'\n{name}')
+            for label, headers in [
+                ('anonymous', {}),
+                ('token', {'HTTP_AUTHORIZATION': f'Token {token.key}'}),
+            ]:
+                response = client.get('/api/posts/', **headers)
+                assert response.status_code == 200, response.status_code
+                assert response.json()['results'], 'the posts list is empty'
+                timings = measure(
+                    lambda: client.get('/api/posts/', **headers), args.iterations
+                )
+                report(f'  GET /api/posts/ ({label})', timings)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+JSON rendering: DRF's JSONRenderer versus blog.renderers.FastJSONRenderer.
+
+Renders post detail payloads with 10, 100 and 10,000 comments (as built by the
+fast read path) both ways and checks the output is identical::
+
+    uv run python -m benchmarks.bench_renderers
+"""
+from benchmarks.common import measure, parser, report, setup_django
+
+
+SIZES = [10, 100, 10_000]
+
+
+def main():
+    args = parser(__doc__).parse_args()
+    setup_django(args.settings, migrate=True)
+
+    from django.contrib.auth.models import User
+    from rest_framework.renderers import JSONRenderer
+    from blog import fast_serializers, renderers
+    from blog.models import BlogPost, Comment
+    from blog.renderers import FastJSONRenderer
+
+    if renderers.orjson is None:
+        print('orjson is not installed: FastJSONRenderer falls back to the stdlib.')
+
+    author = User.objects.create_user(username='bench', email='bench@example.com')
+    stdlib_renderer = JSONRenderer()
+    fast_renderer = FastJSONRenderer()
+
+    for size in SIZES:
+        post = BlogPost.objects.create(
+            title=f'{size} comments', content='Body.', author=author
+        )
+        Comment.objects.bulk_create(
+            Comment(post=post, author=author, content=f'Comentário número {i}.')
+            for i in range(size)
+        )
+        data = fast_serializers.get_post_detail(post.id)
+        assert fast_renderer.render(data) == stdlib_renderer.render(data)
+        iterations = max(10, min(args.iterations, 1_000_000 // size))
+
+        print(f'\n{size} comments ({iterations} iterations)')
+        for label, renderer in [
+            ('JSONRenderer', stdlib_renderer), ('FastJSONRenderer', fast_renderer)
+        ]:
+            report(f'  {label}', measure(lambda: renderer.render(data), iterations))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Post detail serialization: DRF ModelSerializer versus the fast values() path.
+
+Builds a post with 10, 100 and 10,000 comments in an in-memory SQLite database
+and times loading + serializing the detail both ways::
+
+    uv run python -m benchmarks.bench_serializers
+"""
+from benchmarks.common import measure, parser, report, setup_django
+
+
+SIZES = [10, 100, 10_000]
+
+
+def main():
+    args = parser(__doc__).parse_args()
+    setup_django(args.settings, migrate=True)
+
+    from django.contrib.auth.models import User
+    from blog import fast_serializers
+    from blog.models import BlogPost, Comment
+    from blog.serializers import BlogPostDetailSerializer
+    from blog.views import BlogPostDetailView
+
+    author = User.objects.create_user(username='bench', email='bench@example.com')
+
+    for size in SIZES:
+        post = BlogPost.objects.create(
+            title=f'{size} comments', content='Body.', author=author
+        )
+        Comment.objects.bulk_create(
+            Comment(post=post, author=author, content=f'Comment number {i}.')
+            for i in range(size)
+        )
+        # Large payloads take long enough that fewer iterations suffice
+        iterations = max(3, min(args.iterations, 100_000 // size))
+
+        def drf():
+            instance = BlogPostDetailView.queryset.get(id=post.id)
+            return BlogPostDetailSerializer(instance).data
+
+        def fast():
+            return fast_serializers.get_post_detail(post.id)
+
+        print(f'\n{size} comments ({iterations} iterations)')
+        report('  BlogPostDetailSerializer', measure(drf, iterations, warmup=1))
+        report(
+            '  fast_serializers.get_post_detail', measure(fast, iterations, warmup=1)
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Run a benchmark from the project root, e.g.::
+
+    uv run python -m benchmarks.bench_db_connections --settings settings.dev
+"""
+import argparse
+import os
+import statistics
+import time
+
+
+def parser(description, default_settings='settings.test'):
+    """Argument parser with the options every benchmark accepts."""
+    argument_parser = argparse.ArgumentParser(description=description)
+    argument_parser.add_argument(
+        '--settings', default=default_settings,
+        help=f'Django settings module (default: {default_settings}).'
+    )
+    argument_parser.add_argument(
+        '--iterations', type=int, default=1000,
+        help='Number of timed iterations per scenario.'
+    )
+    return argument_parser
+
+
+def setup_django(settings_module, migrate=False):
+    """Configure Django and optionally create the schema (for in-memory databases)."""
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+
+    import django
+    django.setup()
+
+    if migrate:
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+
+
+def measure(func, iterations, warmup=10):
+    """Call ``func`` repeatedly and return the duration of each call in seconds."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def report(label, timings):
+    """Print summary statistics for a list of timings."""
+    ordered = sorted(timings)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f'{label:<40} '
+        f'mean {statistics.mean(ordered) * 1000:8.3f} ms  '
+        f'median {statistics.median(ordered) * 1000:8.3f} ms  '
+        f'p95 {p95 * 1000:8.3f} ms'
+    )
@@ -0,0 +1,79 @@
+"""
+Async access to the blog cache for the ASGI read path.
+
+``AsyncBlogCache`` reads and writes the same keys and values as
+``BlogCacheHelper``, so the sync write paths keep invalidating what the async
+views cache. It calls the cache's public sync API in asgiref's thread pool
+(``thread_sensitive=False``): Django's own ``aget_many`` runs one ``get`` after
+another on the single thread shared by every thread-sensitive call, whereas
+``get_many`` is one round trip (``MGET`` with Redis) and concurrent requests
+do not queue behind each other.
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+from . import metrics
+from .cache_helpers import BlogCacheHelper
+
+
+def run_in_pool(method):
+    return sync_to_async(method, thread_sensitive=False)
+
+
+class AsyncBlogCache:
+    """Async counterpart of the BlogCacheHelper operations used by the read path."""
+
+    async def get_many(self, keys):
+        """Return ``{key: value}`` for the keys found, in a single round trip."""
+        try:
+            return await run_in_pool(cache.get_many)(keys)
+        except Exception:
+            return {}
+
+    async def set_many(self, values, timeout=BlogCacheHelper.CACHE_TIMEOUT):
+        try:
+            await run_in_pool(cache.set_many)(values, timeout)
+        except Exception:
+            pass  # Silently fail if cache is not available
+
+    async def get_with_metadata(self, key):
+        """Return the cached body and validators of a response (either may be None)."""
+        metadata_key = BlogCacheHelper.METADATA_KEY.format(key)
+        values = await self.get_many([key, metadata_key])
+        kind = BlogCacheHelper.key_kind(key)
+        metrics.record_cache_lookup(kind, 'hit' if key in values else 'miss')
+        metrics.record_cache_lookup(
+            'metadata', 'hit' if metadata_key in values else 'miss'
+        )
+        return values.get(key), values.get(metadata_key)
+
+    async def set(self, key, data, metadata=None):
+        values = {key: data}
+        if metadata is not None:
+            values[BlogCacheHelper.METADATA_KEY.format(key)] = metadata
+        await self.set_many(values)
+
+    async def set_metadata(self, key, metadata):
+        await self.set_many({BlogCacheHelper.METADATA_KEY.format(key): metadata})
+
+    async def posts_list_key(self, query=''):
+        """Async ``BlogCacheHelper.posts_list_key``."""
+        version_key = BlogCacheHelper.POSTS_LIST_VERSION_KEY
+        try:
+            version = await run_in_pool(cache.get)(version_key)
+            if version is None:
+                version = time.time_ns()
+                if not await run_in_pool(cache.add)(version_key, version, None):
+                    version = await run_in_pool(cache.get)(version_key, version)
+        except Exception:
+            version = 0
+        suffix = f'?{query}' if query else ''
+        return BlogCacheHelper.POSTS_LIST_KEY.format(version, suffix)
+
+    def post_detail_key(self, post_id):
+        return BlogCacheHelper.post_detail_key(post_id)
+
+
+async_cache = AsyncBlogCache()
@@ -0,0 +1,195 @@
+"""
+Async versions of the post list and detail read paths, for ASGI deployments.
+
+GET requests are answered with the async ORM and ``AsyncBlogCache`` and produce
+the same body, ETag and Last-Modified as the DRF views (same cache entries,
+fast serializers and renderer). Writes, and requests for the browsable API,
+are handed to the DRF views in a thread. Enabled with ``BLOG_ASYNC_READS``.
+"""
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.request import Request
+
+from . import fast_serializers
+from .async_cache import async_cache
+from .conditional import (
+    build_metadata,
+    conditional_response,
+    set_validators,
+)
+from .edge_cache import post_detail_surrogate_keys, post_list_surrogate_keys
+from .models import BlogPost, PostSummary
+from .renderers import FastJSONRenderer
+from .routers import CacheFill
+from .views import BlogPostDetailView, BlogPostListCreateView
+
+
+renderer = FastJSONRenderer()
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        renderer.render(data), status=status, content_type=renderer.media_type
+    )
+
+
+def wants_browsable_api(request):
+    """Whether DRF content negotiation would pick something other than JSON."""
+    requested_format = request.GET.get('format')
+    if requested_format:
+        return requested_format != 'json'
+    return 'text/html' in request.META.get('HTTP_ACCEPT', '')
+
+
+class AsyncCachedReadView(View):
+    """
+    Async CachedResponseMixin: serve GET from the cache with ETag/Last-Modified.
+
+    Every other method goes to ``sync_view_class``, the DRF view for the route.
+    """
+    sync_view_class = None
+    sync_view = None
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        initkwargs.setdefault('sync_view', cls.sync_view_class.as_view())
+        # DRF views are CSRF exempt and rely on their own session checks
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def get_cache_key(self):
+        raise NotImplementedError
+
+    async def get_data(self):
+        """Build the response body from the database."""
+        raise NotImplementedError
+
+    def get_surrogate_keys(self, data):
+        return []
+
+    async def delegate(self, request, *args, **kwargs):
+        return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        if wants_browsable_api(request):
+            return await self.delegate(request, *args, **kwargs)
+        try:
+            return await self.cached_get(request)
+        except Http404:
+            return json_response({'detail': NotFound.default_detail}, status=404)
+        except APIException as exc:
+            return json_response({'detail': exc.detail}, status=exc.status_code)
+
+    async def cached_get(self, request):
+        key = await self.get_cache_key()
+        data, metadata = await async_cache.get_with_metadata(key)
+        if metadata is not None:
+            response = conditional_response(request, metadata)
+            if response is not None:
+                return response
+
+        if data is None:
+            fill = await CacheFill.astart()
+            with fill.reads():
+                data = await self.get_data()
+            metadata = build_metadata(
+                data, surrogate_keys=self.get_surrogate_keys(data)
+            )
+            if await fill.acacheable():
+                await async_cache.set(key, data, metadata)
+        elif metadata is None:
+            metadata = build_metadata(
+                data, surrogate_keys=self.get_surrogate_keys(data)
+            )
+            await async_cache.set_metadata(key, metadata)
+
+        not_modified = conditional_response(request, metadata)
+        if not_modified is not None:
+            return not_modified
+        response = json_response(data)
+        # Lets CompressionMiddleware cache the compressed body next to the data
+        response.blog_cache_key = key
+        return set_validators(response, metadata)
+
+    async def post(self, request, *args, **kwargs):
+        return await self.delegate(request, *args, **kwargs)
+
+    put = patch = delete = options = post
+
+
+class AsyncBlogPostListView(AsyncCachedReadView):
+    """
+    GET /api/posts - List all posts with comment count (async)
+    POST /api/posts - Create a new post (handled by BlogPostListCreateView)
+    """
+    sync_view_class = BlogPostListCreateView
+
+    async def get_cache_key(self):
+        pagination = self.sync_view_class.pagination_class()
+        query = pagination.cache_query(self.request.GET)
+        return await async_cache.posts_list_key(query)
+
+    def get_surrogate_keys(self, data):
+        return post_list_surrogate_keys(data)
+
+    async def get_data(self):
+        """Paginate like PageNumberPagination, with async queries."""
+        queryset = PostSummary.objects.order_by('-created_at').values(
+            *fast_serializers.POST_SUMMARY_FIELDS
+        )
+        pagination = self.sync_view_class.pagination_class()
+        request = Request(self.request)
+
+        paginator = pagination.django_paginator_class(
+            queryset, pagination.get_page_size(request)
+        )
+        paginator.count = await queryset.acount()
+        page_number = pagination.get_page_number(request, paginator)
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(pagination.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+
+        pagination.request, pagination.page = request, page
+        return {
+            'count': paginator.count,
+            'next': pagination.get_next_link(),
+            'previous': pagination.get_previous_link(),
+            'results': [
+                fast_serializers.post_summary_from_row(row)
+                async for row in page.object_list
+            ],
+        }
+
+
+class AsyncBlogPostDetailView(AsyncCachedReadView):
+    """
+    GET /api/posts/{id} - Retrieve a specific post with comments (async)
+    """
+    sync_view_class = BlogPostDetailView
+
+    async def get_cache_key(self):
+        return async_cache.post_detail_key(self.kwargs.get('id'))
+
+    def get_surrogate_keys(self, data):
+        return post_detail_surrogate_keys(data)
+
+    async def get_data(self):
+        post_row = await (
+            BlogPost.objects
+            .filter(id=self.kwargs.get('id'))
+            .values(*fast_serializers.POST_DETAIL_FIELDS)
+            .afirst()
+        )
+        if post_row is None:
+            raise Http404
+        comment_rows = [
+            row async for row in fast_serializers.comments_queryset([post_row['id']])
+        ]
+        return fast_serializers.post_detail_from_rows(post_row, comment_rows)
@@ -0,0 +1,163 @@
+"""
+Token authentication that keeps token -> user lookups in the cache.
+
+DRF's ``TokenAuthentication`` queries ``authtoken_token`` joined to
+``auth_user`` on every request. ``CachedTokenAuthentication`` stores the two
+rows' field values in the cache tier for ``BLOG_AUTH_CACHE_TIMEOUT`` seconds
+and, when ``BLOG_AUTH_L1_TIMEOUT`` is set, in a small per-process cache in
+front of it, so authenticated requests usually cost no queries.
+
+Entries are keyed by a SHA-256 of the token (raw tokens never appear in cache
+keys) and are invalidated by the signal handlers in ``blog.signals`` when a
+token is deleted or regenerated and when its user is saved (e.g. deactivated)
+or deleted. Other processes' L1 entries can only expire, which is why the L1
+lifetime is kept short. The user's password hash and last login are never
+cached; they are loaded from the database if a request needs them.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+
+TOKEN_CACHE_KEY = 'auth_token_{}'
+
+
+def token_cache_key(key):
+    return TOKEN_CACHE_KEY.format(hashlib.sha256(key.encode()).hexdigest())
+
+
+class LocalTokenCache:
+    """Per-process LRU of cached token entries with a fixed lifetime."""
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key):
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            return value
+
+    def set(self, cache_key, value, timeout):
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, cache_keys):
+        with self._lock:
+            for cache_key in cache_keys:
+                self._entries.pop(cache_key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_token_cache = LocalTokenCache()
+
+# Left out of cached users: secrets, and values authentication does not need
+USER_UNCACHED_FIELDS = frozenset({'password', 'last_login'})
+
+
+def row_values(instance, exclude=frozenset()):
+    """``{attname: value}`` of an instance's concrete fields, except ``exclude``."""
+    return {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if field.attname not in exclude
+    }
+
+
+def from_values(model, values):
+    """
+    Rebuild a model instance as if it had been loaded from the database.
+
+    Fields missing from ``values`` are deferred, as with ``only()``.
+    """
+    return model.from_db(router.db_for_read(model), list(values), list(values.values()))
+
+
+def get_cached_token(key):
+    """The cached Token (with its user) for ``key``, or None."""
+    cache_key = token_cache_key(key)
+    entry = None
+    if settings.BLOG_AUTH_L1_TIMEOUT:
+        entry = local_token_cache.get(cache_key)
+    if entry is None:
+        try:
+            entry = cache.get(cache_key)
+        except Exception:
+            return None
+        if entry is None:
+            return None
+        if settings.BLOG_AUTH_L1_TIMEOUT:
+            local_token_cache.set(cache_key, entry, settings.BLOG_AUTH_L1_TIMEOUT)
+    # Fresh instances per request, so no request sees another one's changes
+    token = from_values(Token, entry['token'])
+    token.user = from_values(get_user_model(), entry['user'])
+    return token
+
+
+def cache_token(token):
+    cache_key = token_cache_key(token.key)
+    entry = {
+        'token': row_values(token),
+        'user': row_values(token.user, exclude=USER_UNCACHED_FIELDS),
+    }
+    try:
+        cache.set(cache_key, entry, settings.BLOG_AUTH_CACHE_TIMEOUT)
+    except Exception:
+        pass  # Silently fail if cache is not available
+    if settings.BLOG_AUTH_L1_TIMEOUT:
+        local_token_cache.set(cache_key, entry, settings.BLOG_AUTH_L1_TIMEOUT)
+
+
+def invalidate_tokens(keys):
+    """Drop the cached entries of the given token keys."""
+    cache_keys = [token_cache_key(key) for key in keys]
+    if not cache_keys:
+        return
+    local_token_cache.delete_many(cache_keys)
+    try:
+        cache.delete_many(cache_keys)
+    except Exception:
+        pass
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """``TokenAuthentication`` backed by the cache; same headers and errors."""
+
+    def authenticate_credentials(self, key):
+        token = get_cached_token(key)
+        if token is None:
+            try:
+                token = Token.objects.select_related('user').get(key=key)
+            except Token.DoesNotExist:
+                raise AuthenticationFailed(_('Invalid token.'))
+            # Inactive users are cached too: deactivation invalidates the entry
+            cache_token(token)
+
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (token.user, token)
@@ -1,78 +1,222 @@
 """
 Cache helpers for blog app.
+
+Every lookup is counted as a hit, miss or error in ``blog_cache_lookups``.
 """
+import time
+
 from django.core.cache import cache
-from django.core.serializers import serialize
-from django.core.serializers.json import DjangoJSONEncoder
-import json
+
+from . import metrics
+from .routers import mark_recent_write
 
 
 class BlogCacheHelper:
     """Helper class for managing blog-related cache operations."""
     
     # Cache keys
-    POSTS_LIST_KEY = 'posts_list'
+    POSTS_LIST_KEY = 'posts_list_v{}{}'
+    POSTS_LIST_VERSION_KEY = 'posts_list_version'
     POST_DETAIL_KEY = 'post_detail_{}'
     POST_COMMENTS_KEY = 'post_comments_{}'
+    # Validators (ETag / Last-Modified) of a cached response, stored next to it
+    METADATA_KEY = '{}_meta'
+    # Compressed rendering of a cached response: key, content coding, body digest
+    COMPRESSED_KEY = '{}_{}_{}'
     
     # Cache timeout in seconds (5 minutes)
     CACHE_TIMEOUT = 300
     
     @classmethod
-    def get_posts_list(cls):
-        """Get cached posts list."""
+    def key_kind(cls, key):
+        """Kind of cached response ``key`` belongs to, as labelled in the metrics."""
+        if key.startswith('posts_list_v'):
+            return 'posts_list'
+        if key.startswith('post_detail_'):
+            return 'post_detail'
+        return 'other'
+    
+    @classmethod
+    def get(cls, key, kind=None):
+        """Get a cached response body."""
+        kind = kind or cls.key_kind(key)
         try:
-            return cache.get(cls.POSTS_LIST_KEY)
+            value = cache.get(key)
         except Exception:
+            metrics.record_cache_lookup(kind, 'error')
             return None
+        metrics.record_cache_lookup(kind, 'miss' if value is None else 'hit')
+        return value
     
     @classmethod
-    def set_posts_list(cls, data):
-        """Cache posts list data."""
+    def set(cls, key, data, metadata=None):
+        """Cache a response body, and its validators when given."""
+        values = {key: data}
+        if metadata is not None:
+            values[cls.METADATA_KEY.format(key)] = metadata
         try:
-            cache.set(cls.POSTS_LIST_KEY, data, cls.CACHE_TIMEOUT)
+            cache.set_many(values, cls.CACHE_TIMEOUT)
         except Exception:
             pass  # Silently fail if cache is not available
     
+    @classmethod
+    def get_metadata(cls, key):
+        """Get the validators of a cached response."""
+        return cls.get(cls.METADATA_KEY.format(key), kind='metadata')
+    
+    @classmethod
+    def set_metadata(cls, key, metadata):
+        """Cache the validators of a response."""
+        try:
+            cache.set(cls.METADATA_KEY.format(key), metadata, cls.CACHE_TIMEOUT)
+        except Exception:
+            pass
+    
+    @classmethod
+    def get_compressed(cls, key, encoding, digest):
+        """Get the compressed body of a cached response."""
+        cache_key = cls.COMPRESSED_KEY.format(key, encoding, digest)
+        return cls.get(cache_key, kind='compressed')
+    
+    @classmethod
+    def set_compressed(cls, key, encoding, digest, content):
+        """
+        Cache the compressed body of a cached response.
+        
+        The digest of the uncompressed body is part of the key, so a variant
+        can never outlive the content it was made from.
+        """
+        try:
+            variant_key = cls.COMPRESSED_KEY.format(key, encoding, digest)
+            cache.set(variant_key, content, cls.CACHE_TIMEOUT)
+        except Exception:
+            pass
+    
+    @classmethod
+    def delete(cls, key):
+        """Invalidate a cached response and its validators."""
+        try:
+            cache.delete_many([key, cls.METADATA_KEY.format(key)])
+        except Exception:
+            pass
+    
+    @classmethod
+    def posts_list_key(cls, query=''):
+        """
+        Key of one posts list page (``query`` is its canonical query string).
+        
+        Pages are versioned so a single increment invalidates all of them.
+        """
+        try:
+            version = cache.get(cls.POSTS_LIST_VERSION_KEY)
+            if version is None:
+                # Start from a fresh value so an evicted version never brings
+                # back pages cached under an older one
+                version = time.time_ns()
+                if not cache.add(cls.POSTS_LIST_VERSION_KEY, version, None):
+                    version = cache.get(cls.POSTS_LIST_VERSION_KEY, version)
+        except Exception:
+            version = 0
+        return cls.POSTS_LIST_KEY.format(version, f'?{query}' if query else '')
+    
+    @classmethod
+    def post_detail_key(cls, post_id):
+        """Key of a post detail."""
+        return cls.POST_DETAIL_KEY.format(post_id)
+    
+    @classmethod
+    def get_posts_list(cls, query=''):
+        """Get cached posts list."""
+        return cls.get(cls.posts_list_key(query))
+    
+    @classmethod
+    def set_posts_list(cls, data, query='', metadata=None):
+        """Cache posts list data."""
+        cls.set(cls.posts_list_key(query), data, metadata)
+    
     @classmethod
     def invalidate_posts_list(cls):
-        """Invalidate posts list cache."""
+        """Invalidate every cached posts list page."""
+        mark_recent_write()
         try:
-            cache.delete(cls.POSTS_LIST_KEY)
+            cache.incr(cls.POSTS_LIST_VERSION_KEY)
+        except ValueError:
+            # No version yet, so nothing is cached under one
+            pass
         except Exception:
             pass
     
     @classmethod
     def get_post_detail(cls, post_id):
         """Get cached post detail."""
+        return cls.get(cls.post_detail_key(post_id))
+    
+    @classmethod
+    def set_post_detail(cls, post_id, data, metadata=None):
+        """Cache post detail data."""
+        cls.set(cls.post_detail_key(post_id), data, metadata)
+    
+    @classmethod
+    def get_post_details(cls, post_ids):
+        """
+        Get the cached details of several posts in one round trip, as
+        ``{post_id: (data, metadata)}`` (metadata is None when it was evicted).
+        """
+        keys = {cls.post_detail_key(post_id): post_id for post_id in post_ids}
+        metadata_keys = [cls.METADATA_KEY.format(key) for key in keys]
         try:
-            return cache.get(cls.POST_DETAIL_KEY.format(post_id))
+            cached = cache.get_many([*keys, *metadata_keys])
         except Exception:
-            return None
+            metrics.record_cache_lookup('post_detail', 'error', len(keys))
+            return {}
+        hits = [key for key in keys if key in cached]
+        metrics.record_cache_lookup('post_detail', 'hit', len(hits))
+        metrics.record_cache_lookup('post_detail', 'miss', len(keys) - len(hits))
+        return {
+            keys[key]: (cached[key], cached.get(cls.METADATA_KEY.format(key)))
+            for key in hits
+        }
     
     @classmethod
-    def set_post_detail(cls, post_id, data):
-        """Cache post detail data."""
+    def set_post_details(cls, details):
+        """Cache several post details (``{post_id: (data, metadata)}``) at once."""
+        values = {}
+        for post_id, (data, metadata) in details.items():
+            key = cls.post_detail_key(post_id)
+            values[key] = data
+            values[cls.METADATA_KEY.format(key)] = metadata
         try:
-            cache.set(cls.POST_DETAIL_KEY.format(post_id), data, cls.CACHE_TIMEOUT)
+            cache.set_many(values, cls.CACHE_TIMEOUT)
         except Exception:
             pass
     
     @classmethod
     def invalidate_post_detail(cls, post_id):
         """Invalidate post detail cache."""
+        mark_recent_write()
+        cls.delete(cls.post_detail_key(post_id))
+    
+    @classmethod
+    def invalidate_post_details(cls, post_ids):
+        """Invalidate the detail and comments entries of several posts at once."""
+        keys = []
+        for post_id in post_ids:
+            key = cls.post_detail_key(post_id)
+            keys.extend([
+                key, cls.METADATA_KEY.format(key), cls.POST_COMMENTS_KEY.format(post_id)
+            ])
+        if not keys:
+            return
+        mark_recent_write()
         try:
-            cache.delete(cls.POST_DETAIL_KEY.format(post_id))
+            cache.delete_many(keys)
         except Exception:
             pass
     
     @classmethod
     def get_post_comments(cls, post_id):
         """Get cached post comments."""
-        try:
-            return cache.get(cls.POST_COMMENTS_KEY.format(post_id))
-        except Exception:
-            return None
+        return cls.get(cls.POST_COMMENTS_KEY.format(post_id), kind='post_comments')
     
     @classmethod
     def set_post_comments(cls, post_id, data):
@@ -103,4 +247,4 @@ class BlogCacheHelper:
         try:
             cache.clear()
         except Exception:
-            pass 
\ No newline at end of file
+            pass
@@ -0,0 +1,72 @@
+"""
+Content-encoding negotiation and compression for API responses.
+
+gzip is always available; brotli is used when the ``brotli`` package is
+installed and the client prefers or accepts it.
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+GZIP_LEVEL = 6
+# Brotli's higher qualities are far too slow for responses compressed per request
+BROTLI_QUALITY = 5
+
+
+def available_encodings():
+    """Supported content codings, most preferred first."""
+    if brotli is not None:
+        return ['br', 'gzip']
+    return ['gzip']
+
+
+def parse_accept_encoding(header):
+    """Map each coding of an Accept-Encoding header to its quality value."""
+    qualities = {}
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def negotiate_encoding(header):
+    """
+    Pick the content coding for a response, or None to send it uncompressed.
+
+    Ties in quality are broken by our own preference (brotli before gzip).
+    """
+    if not header:
+        return None
+    qualities = parse_accept_encoding(header)
+    wildcard = qualities.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(content, encoding):
+    """Compress ``content`` (bytes) with the given content coding."""
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        # A fixed mtime keeps the output deterministic, so it can be cached
+        return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f'Unsupported content coding: {encoding}')
@@ -0,0 +1,61 @@
+"""
+HTTP validators (ETag / Last-Modified) for cached blog responses.
+"""
+import hashlib
+import json
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .edge_cache import set_edge_cache_headers
+
+
+def compute_etag(data):
+    """Strong ETag derived from a hash of the response content."""
+    content = json.dumps(
+        data, cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':')
+    )
+    return '"{}"'.format(hashlib.sha256(content.encode()).hexdigest()[:40])
+
+
+def build_metadata(data, last_modified=None, surrogate_keys=()):
+    """
+    Validators (and edge cache tags) stored next to a cached response.
+    
+    ``last_modified`` (a POSIX timestamp) defaults to now, the time the entry
+    is regenerated. Timestamps in the data would miss changes that do not touch
+    them (an author renamed, a comment deleted) although those invalidate the
+    entry too.
+    """
+    if last_modified is None:
+        last_modified = time.time()
+    return {
+        'etag': compute_etag(data),
+        'last_modified': int(last_modified),
+        'surrogate_keys': list(surrogate_keys),
+    }
+
+
+def set_validators(response, metadata):
+    """Add ETag, Last-Modified and edge caching headers to a response."""
+    response['ETag'] = metadata['etag']
+    response['Last-Modified'] = http_date(metadata['last_modified'])
+    return set_edge_cache_headers(response, metadata.get('surrogate_keys', ()))
+
+
+def conditional_response(request, metadata):
+    """
+    Answer If-None-Match / If-Modified-Since from the validators alone.
+
+    Returns a 304 (or 412) response, or None when the full response is needed.
+    """
+    response = get_conditional_response(
+        request,
+        etag=metadata['etag'],
+        last_modified=metadata['last_modified'],
+    )
+    if response is not None and response.status_code == 304:
+        set_validators(response, metadata)
+    return response
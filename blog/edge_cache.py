@@ -0,0 +1,178 @@
+"""
+Cache-Control and Surrogate-Key headers for CDN/edge caching, and purging.
+
+Public read responses are tagged with surrogate keys (the posts list, each
+post, each author) so writes can purge exactly the responses they change. The
+purger is pluggable through ``BLOG_PURGER``:
+
+* ``NullPurger`` does nothing (no CDN in front of the API);
+* ``RecordingPurger`` remembers the purged keys (tests and local development);
+* ``HTTPPurger`` sends the keys to a purge endpoint (e.g. Fastly's
+  ``POST /service/{id}/purge`` with a ``Surrogate-Key`` header) from a
+  background thread.
+"""
+import logging
+import queue
+import threading
+import urllib.request
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+POSTS_LIST_SURROGATE_KEY = 'posts'
+
+# Fastly accepts at most 256 surrogate keys per batch purge
+MAX_KEYS_PER_PURGE = 256
+
+
+def post_surrogate_key(post_id):
+    return f'post-{post_id}'
+
+
+def author_surrogate_key(author_id):
+    return f'author-{author_id}'
+
+
+def post_list_surrogate_keys(data):
+    """Keys of a posts list page: the list itself and the authors shown on it."""
+    results = data.get('results', []) if isinstance(data, dict) else data
+    authors = {post['author']['id'] for post in results}
+    return [POSTS_LIST_SURROGATE_KEY] + [
+        author_surrogate_key(author_id) for author_id in sorted(authors)
+    ]
+
+
+def post_detail_surrogate_keys(data):
+    """Keys of a post detail: the post, its author and its commenters."""
+    authors = {data['author']['id']}
+    authors.update(comment['author']['id'] for comment in data.get('comments', []))
+    return [post_surrogate_key(data['id'])] + [
+        author_surrogate_key(author_id) for author_id in sorted(authors)
+    ]
+
+
+def set_edge_cache_headers(response, surrogate_keys=()):
+    """Make a public read response cacheable by shared caches and tag it."""
+    directives = {'public': True, 'max_age': settings.BLOG_CACHE_CONTROL_MAX_AGE}
+    if settings.BLOG_CACHE_CONTROL_S_MAXAGE:
+        directives['s_maxage'] = settings.BLOG_CACHE_CONTROL_S_MAXAGE
+    stale_while_revalidate = settings.BLOG_CACHE_CONTROL_STALE_WHILE_REVALIDATE
+    if stale_while_revalidate:
+        directives['stale_while_revalidate'] = stale_while_revalidate
+    patch_cache_control(response, **directives)
+    if surrogate_keys:
+        response['Surrogate-Key'] = ' '.join(surrogate_keys)
+    return response
+
+
+class BasePurger:
+    """Interface of the purgers selected with ``BLOG_PURGER``."""
+
+    def purge(self, keys):
+        """Purge every cached response tagged with any of ``keys``."""
+        raise NotImplementedError
+
+
+class NullPurger(BasePurger):
+    """Purger for deployments without an edge cache."""
+
+    def purge(self, keys):
+        pass
+
+
+class RecordingPurger(BasePurger):
+    """Purger that records the keys it was asked to purge."""
+
+    def __init__(self):
+        self.purged = []
+
+    def purge(self, keys):
+        self.purged.append(list(keys))
+
+    def clear(self):
+        self.purged.clear()
+
+
+class HTTPPurger(BasePurger):
+    """
+    Purge by surrogate key through an HTTP API.
+
+    ``purge`` only queues the keys, so writes never wait for the endpoint. A
+    background thread per process POSTs them to ``BLOG_PURGE_URL`` in a
+    ``Surrogate-Key`` header with, when set, ``BLOG_PURGE_TOKEN`` in the
+    ``BLOG_PURGE_TOKEN_HEADER`` header. Keys queued while a call is in flight
+    are merged into the next one. Failures (and purges still queued when the
+    process exits) are logged or lost; the stale responses then expire after
+    s-maxage.
+    """
+
+    def __init__(self):
+        self._pending = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def purge(self, keys):
+        self._pending.put(list(keys))
+        with self._worker_lock:
+            # Also restarts the thread in a worker forked after it started
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._send_pending, name='edge-purger', daemon=True
+                )
+                self._worker.start()
+
+    def flush(self):
+        """Wait until every queued purge has been sent."""
+        self._pending.join()
+
+    def _send_pending(self):
+        while True:
+            batches = [self._pending.get()]
+            while True:
+                try:
+                    batches.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            keys = list(dict.fromkeys(key for batch in batches for key in batch))
+            try:
+                for start in range(0, len(keys), MAX_KEYS_PER_PURGE):
+                    self.send(keys[start:start + MAX_KEYS_PER_PURGE])
+            finally:
+                for _ in batches:
+                    self._pending.task_done()
+
+    def send(self, keys):
+        headers = {'Surrogate-Key': ' '.join(keys)}
+        if settings.BLOG_PURGE_TOKEN:
+            headers[settings.BLOG_PURGE_TOKEN_HEADER] = settings.BLOG_PURGE_TOKEN
+        request = urllib.request.Request(
+            settings.BLOG_PURGE_URL, method='POST', headers=headers
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=settings.BLOG_PURGE_TIMEOUT):
+                pass
+        except Exception:
+            logger.exception('Purging surrogate keys %s failed', ' '.join(keys))
+
+
+_purgers = {}
+
+
+def get_purger():
+    """The configured purger (one instance per ``BLOG_PURGER`` path)."""
+    path = settings.BLOG_PURGER
+    if path not in _purgers:
+        _purgers[path] = import_string(path)()
+    return _purgers[path]
+
+
+def purge_surrogate_keys(*keys):
+    """Purge ``keys`` once the current transaction commits."""
+    keys = list(dict.fromkeys(keys))
+    # Purging before the commit could let the edge refetch the old data
+    transaction.on_commit(lambda: get_purger().purge(keys))
@@ -0,0 +1,107 @@
+"""
+Streaming NDJSON export of every post for GET /api/posts/export.
+
+Posts are read in chunks (through a server-side cursor where the database
+connection allows one) and each chunk's comments are fetched with a single
+query, so memory use does not grow with the size of the blog.
+"""
+import threading
+from itertools import islice
+
+from django.conf import settings
+from django.db import connections, router
+
+from . import fast_serializers
+from .models import BlogPost
+from .renderers import FastJSONRenderer
+from .routers import replica_reads
+
+
+class ConcurrencyLimit:
+    """Per-process cap on concurrent operations, read from a setting at call time."""
+
+    def __init__(self, setting_name):
+        self.setting_name = setting_name
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """Take a slot; return False instead of waiting when none is free."""
+        with self._lock:
+            if self.active >= getattr(settings, self.setting_name):
+                return False
+            self.active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+
+
+export_limit = ConcurrencyLimit('BLOG_EXPORT_MAX_CONCURRENCY')
+
+
+def post_row_chunks(using, chunk_size):
+    """Yield lists of post rows (``POST_DETAIL_FIELDS``) in primary key order."""
+    queryset = (
+        BlogPost.objects.using(using)
+        .order_by('pk')
+        .values(*fast_serializers.POST_DETAIL_FIELDS)
+    )
+    if connections[using].settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+        # Without server-side cursors (PgBouncer transaction pooling) iterator()
+        # would buffer the whole result, so page by primary key instead
+        last_pk = None
+        while True:
+            page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            chunk = list(page[:chunk_size])
+            if not chunk:
+                return
+            yield chunk
+            last_pk = chunk[-1]['id']
+    else:
+        rows = queryset.iterator(chunk_size=chunk_size)
+        while chunk := list(islice(rows, chunk_size)):
+            yield chunk
+
+
+class PostExportStream:
+    """
+    Iterable of NDJSON lines, one post (optionally with its comments) per line.
+
+    ``on_close`` runs exactly once, when the stream is exhausted or the
+    response is closed (e.g. because the client disconnected).
+    """
+
+    def __init__(self, include_comments=False, chunk_size=500, on_close=None):
+        self.include_comments = include_comments
+        self.chunk_size = chunk_size
+        self.on_close = on_close
+        self.renderer = FastJSONRenderer()
+        # Long exports are a good fit for a replica
+        with replica_reads():
+            self.using = router.db_for_read(BlogPost)
+
+    def __iter__(self):
+        try:
+            for rows in post_row_chunks(self.using, self.chunk_size):
+                yield from self.render_chunk(rows)
+        finally:
+            self.close()
+
+    def render_chunk(self, rows):
+        posts = {row['id']: fast_serializers.post_from_row(row) for row in rows}
+        if self.include_comments:
+            for post in posts.values():
+                post['comments'] = []
+            comments = fast_serializers.comments_queryset(list(posts)).using(self.using)
+            for row in comments:
+                comment = fast_serializers.comment_from_row(row)
+                posts[row['post_id']]['comments'].append(comment)
+        for post in posts.values():
+            yield self.renderer.render(post) + b'\n'
+
+    def close(self):
+        on_close, self.on_close = self.on_close, None
+        if on_close is not None:
+            on_close()
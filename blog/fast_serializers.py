@@ -0,0 +1,115 @@
+"""
+Fast read-path serialization built from ``values()`` rows.
+
+These functions produce exactly the same output as the DRF serializers used by
+the read endpoints (``BlogPostDetailSerializer`` and ``PostSummarySerializer``)
+but skip field introspection and per-field ``to_representation`` dispatch.
+Keep them in sync with the serializers; the parity tests in
+``blog/tests/test_fast_serializers.py`` enforce it.
+"""
+import uuid
+
+from django.utils import timezone
+
+from .models import BlogPost, Comment
+
+
+POST_DETAIL_FIELDS = (
+    'id', 'title', 'content', 'created_at', 'updated_at',
+    'author_id', 'author__username', 'author__email',
+)
+COMMENT_FIELDS = (
+    'id', 'post_id', 'content', 'created_at',
+    'author_id', 'author__username', 'author__email',
+)
+POST_SUMMARY_FIELDS = (
+    'post_id', 'title', 'comment_count', 'author_id', 'author_username', 'author_email',
+)
+
+
+def format_datetime(value):
+    """Format like DRF's DateTimeField with the default ISO 8601 output (USE_TZ on)."""
+    if value is None:
+        return None
+    value = value.astimezone(timezone.get_current_timezone()).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def author_from_row(row):
+    """UserSerializer output from a row with ``author__*`` columns."""
+    return {
+        'id': row['author_id'],
+        'username': row['author__username'],
+        'email': row['author__email'],
+    }
+
+
+def comment_from_row(row):
+    """CommentSerializer output."""
+    return {
+        'id': str(row['id']),
+        'author': author_from_row(row),
+        'content': row['content'],
+        'created_at': format_datetime(row['created_at']),
+    }
+
+
+def post_from_row(row):
+    """BlogPostSerializer output."""
+    return {
+        'id': str(row['id']),
+        'title': row['title'],
+        'content': row['content'],
+        'author': author_from_row(row),
+        'created_at': format_datetime(row['created_at']),
+        'updated_at': format_datetime(row['updated_at']),
+    }
+
+
+def post_detail_from_rows(post_row, comment_rows):
+    """BlogPostDetailSerializer output."""
+    data = post_from_row(post_row)
+    data['comments'] = [comment_from_row(row) for row in comment_rows]
+    return data
+
+
+def post_summary_from_row(row):
+    """PostSummarySerializer output."""
+    return {
+        'id': str(row['post_id']),
+        'title': row['title'],
+        'comment_count': row['comment_count'],
+        'author': {
+            'id': row['author_id'],
+            'username': row['author_username'],
+            'email': row['author_email'],
+        },
+    }
+
+
+def comments_queryset(post_ids):
+    """Comments of the given posts, oldest first, as rows."""
+    return (
+        Comment.objects
+        .filter(post_id__in=post_ids)
+        .order_by('created_at', 'id')
+        .values(*COMMENT_FIELDS)
+    )
+
+
+def get_post_details(post_ids):
+    """Return ``{post_id: detail}`` for the existing posts, in two queries."""
+    post_rows = BlogPost.objects.filter(id__in=post_ids).values(*POST_DETAIL_FIELDS)
+    details = {row['id']: post_detail_from_rows(row, []) for row in post_rows}
+    if details:
+        for row in comments_queryset(list(details)):
+            details[row['post_id']]['comments'].append(comment_from_row(row))
+    return details
+
+
+def get_post_detail(post_id):
+    """Return the detail of one post, or None when it does not exist."""
+    post_id = uuid.UUID(str(post_id))
+    return get_post_details([post_id]).get(post_id)
@@ -0,0 +1,128 @@
+"""
+Admission control for password hashing (login and registration).
+
+Checking or setting a password runs the full PBKDF2 work factor, tens of
+milliseconds of CPU that holds a worker thread. ``password_hashing()`` lets at
+most ``BLOG_PASSWORD_HASH_CONCURRENCY`` hashes run per process and at most
+``BLOG_PASSWORD_HASH_QUEUE_DEPTH`` requests wait for a slot (for up to
+``BLOG_PASSWORD_HASH_QUEUE_TIMEOUT`` seconds). Anything beyond that is shed
+at once with a 503 and ``Retry-After``. Together the slots and the queue use
+fewer than ``GUNICORN_THREADS`` threads (checked at start-up), so a login storm
+cannot occupy every thread and the read endpoints keep their latency.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from . import metrics
+
+
+metrics_logger = logging.getLogger('blog.metrics')
+
+
+class PasswordHashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many sign-in requests in progress. Try again shortly.'
+    default_code = 'password_hashing_unavailable'
+    # Sent as Retry-After by DRF's exception handler
+    wait = 1
+
+
+class PasswordHashLimiter:
+    """Per-process slots for password hashing with a bounded wait queue."""
+
+    def __init__(self):
+        self.active = 0
+        self.waiting = 0
+        self.shed = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Take a slot, waiting in the queue if there is room; raise when shed."""
+        concurrency = settings.BLOG_PASSWORD_HASH_CONCURRENCY
+        with self._condition:
+            if self.active >= concurrency:
+                if self.waiting >= settings.BLOG_PASSWORD_HASH_QUEUE_DEPTH:
+                    self.shed += 1
+                    raise PasswordHashingUnavailable()
+                self.waiting += 1
+                try:
+                    acquired = self._condition.wait_for(
+                        lambda: self.active < concurrency,
+                        timeout=settings.BLOG_PASSWORD_HASH_QUEUE_TIMEOUT,
+                    )
+                finally:
+                    self.waiting -= 1
+                if not acquired:
+                    self.shed += 1
+                    raise PasswordHashingUnavailable()
+            self.active += 1
+
+    def release(self):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+
+password_hash_limiter = PasswordHashLimiter()
+
+
+def check_thread_budget():
+    """Refuse limits that let hashing hold every thread of a gthread worker."""
+    threads = settings.GUNICORN_THREADS
+    held = (
+        settings.BLOG_PASSWORD_HASH_CONCURRENCY
+        + settings.BLOG_PASSWORD_HASH_QUEUE_DEPTH
+    )
+    # Sync workers (one thread) only ever run one request anyway
+    if threads > 1 and held >= threads:
+        raise ImproperlyConfigured(
+            'BLOG_PASSWORD_HASH_CONCURRENCY + BLOG_PASSWORD_HASH_QUEUE_DEPTH '
+            f'({held}) must be less than GUNICORN_THREADS ({threads}).'
+        )
+
+
+@contextmanager
+def password_hashing(operation):
+    """
+    Run the block (which hashes a password) in a hashing slot.
+
+    The wait and hashing times are logged to the ``blog.metrics`` logger, and
+    shed requests as warnings; both are also exported on ``/metrics``.
+    """
+    started = time.perf_counter()
+    try:
+        password_hash_limiter.acquire()
+    except PasswordHashingUnavailable:
+        metrics.record_password_hash_shed(operation)
+        metrics_logger.warning(
+            'password_hash operation=%s shed waiting=%d',
+            operation, password_hash_limiter.waiting,
+            extra={'password_hash_operation': operation, 'password_hash_shed': True},
+        )
+        raise
+    admitted = time.perf_counter()
+    try:
+        yield
+    finally:
+        password_hash_limiter.release()
+        wait = admitted - started
+        duration = time.perf_counter() - admitted
+        metrics.observe_password_hash(operation, wait, duration)
+        wait_ms = wait * 1000
+        hash_ms = duration * 1000
+        metrics_logger.info(
+            'password_hash operation=%s wait_ms=%.2f hash_ms=%.2f',
+            operation, wait_ms, hash_ms,
+            extra={
+                'password_hash_operation': operation,
+                'password_hash_wait_ms': round(wait_ms, 2),
+                'password_hash_ms': round(hash_ms, 2),
+            },
+        )
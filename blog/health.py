@@ -0,0 +1,104 @@
+"""
+Liveness and readiness checks for load balancers and orchestrators.
+
+Liveness only says the process can answer. Readiness checks the database and
+the cache, but each process runs the checks at most once every
+``BLOG_READINESS_INTERVAL`` seconds and serves the stored result in between,
+so frequent probes from many load balancers add no load. While one thread
+refreshes the result, the others keep serving the previous one.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CACHE_KEY = 'health_probe'
+
+# Overall readiness: without the database nothing works, without the cache
+# every request still succeeds, only slower
+READY = 'ok'
+DEGRADED = 'degraded'
+UNAVAILABLE = 'unavailable'
+
+
+def check_database():
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+
+
+def check_cache():
+    cache.get(HEALTH_CACHE_KEY)
+
+
+CHECKS = {
+    'database': check_database,
+    'cache': check_cache,
+}
+
+
+def run_check(name, check):
+    # The report is unauthenticated: keep error details in the logs only
+    started = time.perf_counter()
+    try:
+        check()
+    except Exception:
+        logger.exception('Readiness check %s failed', name)
+        result = {'ok': False}
+    else:
+        result = {'ok': True}
+    result['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def run_checks():
+    """Run every dependency check now and return the readiness report."""
+    checks = {name: run_check(name, check) for name, check in CHECKS.items()}
+    if not checks['database']['ok']:
+        status = UNAVAILABLE
+    elif all(check['ok'] for check in checks.values()):
+        status = READY
+    else:
+        status = DEGRADED
+    return {
+        'status': status,
+        'checks': checks,
+        'checked_at': timezone.now().isoformat(),
+    }
+
+
+class ReadinessProbe:
+    """Per-process readiness report, refreshed at most once per interval."""
+
+    def __init__(self):
+        self.report = None
+        self.expires = 0.0
+        self._refresh_lock = threading.Lock()
+
+    def get(self):
+        if self.report is not None and time.monotonic() < self.expires:
+            return self.report
+        # Only one thread refreshes; the others serve the previous report
+        if not self._refresh_lock.acquire(blocking=self.report is None):
+            return self.report
+        try:
+            if self.report is None or time.monotonic() >= self.expires:
+                self.report = run_checks()
+                self.expires = time.monotonic() + settings.BLOG_READINESS_INTERVAL
+            return self.report
+        finally:
+            self._refresh_lock.release()
+
+    def reset(self):
+        self.report = None
+        self.expires = 0.0
+
+
+readiness_probe = ReadinessProbe()
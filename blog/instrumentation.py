@@ -0,0 +1,37 @@
+"""
+SQL query instrumentation for blog app.
+"""
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+
+class QueryCounter:
+    """Database execute wrapper counting queries and the time spent running them."""
+
+    def __init__(self, capture=False):
+        self.count = 0
+        self.duration = 0.0
+        self.capture = capture
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            if self.capture:
+                self.statements.append(sql)
+
+
+@contextmanager
+def count_queries(capture=False):
+    """Count the queries run on every database connection inside the block."""
+    counter = QueryCounter(capture=capture)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        yield counter
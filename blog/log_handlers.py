@@ -0,0 +1,164 @@
+"""
+Non-blocking, structured logging for production.
+
+``QueueLoggingHandler`` puts records on a bounded in-memory queue and returns;
+a ``QueueListener`` thread hands them to the real (file or stream) handler.
+When the queue is full, records are dropped and counted instead of blocking
+the request, and the listener logs how many were lost. ``JSONFormatter``
+writes one JSON object per line and ``RequestIDFilter`` tags every record
+with the ID of the request that logged it (see ``RequestIDMiddleware``).
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import weakref
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from django.utils.module_loading import import_string
+
+
+request_id_var = ContextVar('request_id', default=None)
+
+_queue_handlers = weakref.WeakSet()
+
+
+def dropped_records():
+    """Records dropped by every queue handler of this process."""
+    return sum(handler.dropped for handler in _queue_handlers)
+
+
+class DropReportingListener(QueueListener):
+    """QueueListener that logs how many records its handler had to drop."""
+
+    def __init__(self, queue_handler, *handlers):
+        super().__init__(queue_handler.queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.reported = 0
+
+    def enqueue_sentinel(self):
+        # Wait for room instead of failing when the queue is full at shutdown
+        self.queue.put(self._sentinel)
+
+    def handle(self, record):
+        dropped = self.queue_handler.dropped
+        if dropped > self.reported:
+            notice = logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                'Log queue full: dropped %d records', (dropped - self.reported,), None,
+            )
+            notice.dropped_records = dropped - self.reported
+            self.reported = dropped
+            super().handle(notice)
+        super().handle(record)
+
+
+class QueueLoggingHandler(QueueHandler):
+    """
+    Hand records to ``target`` on a listener thread, through a bounded queue.
+
+    ``target`` is a handler or a dictConfig-style ``{'class': ..., **kwargs}``
+    dict. The formatter set on this handler formats on the listener thread;
+    filters run in the logging thread, so context (the request ID) is kept.
+    """
+
+    def __init__(self, target, queue_size=10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        if isinstance(target, dict):
+            target = dict(target)
+            target = import_string(target.pop('class'))(**target)
+        self.target = target
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self.listener = DropReportingListener(self, target)
+        self.listener.start()
+        _queue_handlers.add(self)
+        atexit.register(self.close)
+
+    def setFormatter(self, formatter):
+        # Formatting happens on the listener thread, not in the request
+        self.target.setFormatter(formatter)
+
+    def prepare(self, record):
+        """Make the record safe to format later on another thread."""
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def restart_after_fork(self):
+        """Give a forked child its own queue and listener thread."""
+        self.queue = queue.Queue(maxsize=self.queue_size)
+        self._dropped_lock = threading.Lock()
+        self.listener = DropReportingListener(self, self.target)
+        self.listener.start()
+
+    def close(self):
+        # Flush what is queued before the target closes
+        if self.listener._thread is not None:
+            self.listener.stop()
+        self.target.close()
+        super().close()
+
+
+def _restart_listeners_after_fork():
+    # The parent's listener threads do not exist in the child
+    for handler in list(_queue_handlers):
+        handler.restart_after_fork()
+
+
+os.register_at_fork(after_in_child=_restart_listeners_after_fork)
+
+
+class RequestIDFilter(logging.Filter):
+    """Set ``record.request_id`` to the current request's ID (or None)."""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+# Attributes every LogRecord has; everything else was passed with ``extra``
+RESERVED_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {
+    'message', 'asctime', 'request_id',
+}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, with ``extra`` fields and the request ID."""
+
+    def format(self, record):
+        created = datetime.fromtimestamp(record.created, timezone.utc)
+        data = {
+            'timestamp': created.isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+            'process': record.process,
+        }
+        data.update(
+            (key, value)
+            for key, value in record.__dict__.items()
+            if key not in RESERVED_ATTRS
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        return json.dumps(data, default=str)
@@ -0,0 +1,62 @@
+"""
+Export users, posts and comments as NDJSON.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.ndjson import RECORD_FIELDS, RECORD_MODELS, RECORD_TYPES, dumps
+
+
+class Command(BaseCommand):
+    help = 'Stream users, posts and comments to NDJSON (one record per line).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', nargs='?', default='-',
+            help='File to write to, or "-" for stdout (default).'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Number of rows fetched from the database at a time.'
+        )
+
+    def handle(self, *args, **options):
+        output = options['output']
+        chunk_size = options['chunk_size']
+
+        if output == '-':
+            stream, write, report = None, self.stdout.write, self.stderr
+        else:
+            stream = open(output, 'w', encoding='utf-8')
+            write, report = stream.write, self.stdout
+
+        started = time.perf_counter()
+        counts = {}
+        try:
+            # Records are written in foreign key order so the file can be
+            # imported with a single pass.
+            for record_type in RECORD_TYPES:
+                model = RECORD_MODELS[record_type]
+                rows = (
+                    model._default_manager
+                    .order_by('pk')
+                    .values(*RECORD_FIELDS[record_type])
+                    .iterator(chunk_size=chunk_size)
+                )
+                count = 0
+                for row in rows:
+                    write(dumps({'type': record_type, **row}) + '\n')
+                    count += 1
+                counts[record_type] = count
+        finally:
+            if stream is not None:
+                stream.close()
+
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        report.write(
+            f"Exported {counts['user']} users, {counts['post']} posts and "
+            f"{counts['comment']} comments in {elapsed:.2f}s "
+            f"({total / elapsed if elapsed else total:.0f} rows/s)."
+        )
@@ -0,0 +1,166 @@
+"""
+Import users, posts and comments from an NDJSON export.
+"""
+import io
+import sys
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from blog.ndjson import RECORD_FIELDS, RECORD_MODELS, RECORD_TYPES, loads
+from blog.read_models import rebuild_post_summaries
+
+
+def _copy_value(value):
+    """Encode a value for PostgreSQL's COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+        .replace('\t', '\\t')
+    )
+
+
+@contextmanager
+def _preserve_timestamps(model):
+    """Keep the exported created_at/updated_at values instead of auto_now(_add)."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    original = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in original:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class CopyLoader:
+    """Load batches into PostgreSQL with COPY FROM STDIN."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def load(self, model, fields, rows):
+        quote_name = self.connection.ops.quote_name
+        columns = ', '.join(
+            quote_name(model._meta.get_field(field).column) for field in fields
+        )
+        sql = f'COPY {quote_name(model._meta.db_table)} ({columns}) FROM STDIN'
+
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write('\t'.join(_copy_value(row.get(field)) for field in fields))
+            buffer.write('\n')
+        buffer.seek(0)
+
+        with self.connection.cursor() as cursor:
+            if hasattr(cursor, 'copy_expert'):
+                # psycopg2
+                cursor.copy_expert(sql, buffer)
+            else:
+                # psycopg 3
+                with cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+
+class BulkCreateLoader:
+    """Load batches with bulk_create on databases without COPY support."""
+
+    def load(self, model, fields, rows):
+        objects = [model(**{field: row.get(field) for field in fields}) for row in rows]
+        with _preserve_timestamps(model):
+            model._default_manager.bulk_create(objects)
+
+
+class Command(BaseCommand):
+    help = 'Import users, posts and comments from NDJSON produced by export_blog.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input', nargs='?', default='-',
+            help='File to read from, or "-" for stdin (default).'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Number of records loaded per COPY/bulk_create batch.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if options['input'] == '-':
+            stream = sys.stdin
+        else:
+            stream = open(options['input'], encoding='utf-8')
+
+        if connection.vendor == 'postgresql':
+            loader = CopyLoader(connection)
+        else:
+            loader = BulkCreateLoader()
+
+        buffers = {record_type: [] for record_type in RECORD_TYPES}
+        counts = dict.fromkeys(RECORD_TYPES, 0)
+
+        def flush(record_type):
+            # Parents are flushed before children so every batch only
+            # references rows that are already loaded.
+            for pending_type in RECORD_TYPES[:RECORD_TYPES.index(record_type) + 1]:
+                rows = buffers[pending_type]
+                if rows:
+                    loader.load(
+                        RECORD_MODELS[pending_type], RECORD_FIELDS[pending_type], rows
+                    )
+                    counts[pending_type] += len(rows)
+                    buffers[pending_type] = []
+
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                for line_number, line in enumerate(stream, start=1):
+                    if not line.strip():
+                        continue
+                    record = loads(line)
+                    record_type = record.get('type')
+                    if record_type not in buffers:
+                        raise CommandError(
+                            f'Line {line_number}: unknown record type {record_type!r}.'
+                        )
+                    buffers[record_type].append(record)
+                    if len(buffers[record_type]) >= batch_size:
+                        flush(record_type)
+                flush(RECORD_TYPES[-1])
+                self.reset_sequences()
+                # COPY and bulk_create bypass the signals maintaining the read model
+                rebuild_post_summaries()
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        self.stdout.write(
+            f"Imported {counts['user']} users, {counts['post']} posts and "
+            f"{counts['comment']} comments in {elapsed:.2f}s "
+            f"({total / elapsed if elapsed else total:.0f} rows/s)."
+        )
+
+    def reset_sequences(self):
+        """Move auto-increment sequences past the explicitly imported ids."""
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), list(RECORD_MODELS.values())
+        )
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
@@ -0,0 +1,98 @@
+"""
+Create future comment partitions and detach or archive old ones.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from blog.partitions import (
+    add_months,
+    detach_partition,
+    ensure_partitions,
+    is_partitioned,
+    monthly_partitions,
+    month_start,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Maintain the monthly partitions of the comments table: create partitions '
+        'ahead of time and detach (archive) or drop the ones past the retention window.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead', type=int, default=3,
+            help='Number of future months that must have a partition (default: 3).'
+        )
+        parser.add_argument(
+            '--retain-months', type=int, default=None,
+            help='Detach partitions older than this many months (default: keep all).'
+        )
+        parser.add_argument(
+            '--drop', action='store_true',
+            help='Drop detached partitions instead of keeping them as archive tables.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report what would be done.'
+        )
+
+    def handle(self, *args, **options):
+        if not is_partitioned(connection):
+            self.stdout.write(
+                'The comments table is not partitioned (partitioning requires '
+                'PostgreSQL); nothing to do.'
+            )
+            return
+
+        months_ahead = options['months_ahead']
+        retain_months = options['retain_months']
+        if months_ahead < 0 or (retain_months is not None and retain_months < 1):
+            raise CommandError('--months-ahead must be >= 0 and --retain-months >= 1.')
+
+        this_month = month_start(timezone.now())
+        last_month = add_months(this_month, months_ahead)
+        existing = monthly_partitions(connection)
+
+        if options['dry_run']:
+            missing = []
+            month = this_month
+            while month <= last_month:
+                if month not in existing:
+                    missing.append(month)
+                month = add_months(month, 1)
+            months = self.format_months(missing)
+            self.stdout.write(f'Would create partitions for: {months}')
+        else:
+            with transaction.atomic():
+                created = ensure_partitions(connection, this_month, last_month)
+            self.stdout.write(f"Created partitions: {', '.join(created) or 'none'}")
+
+        if retain_months is None:
+            return
+
+        cutoff = add_months(this_month, -retain_months)
+        expired = sorted(
+            (month, name) for month, name in existing.items() if month < cutoff
+        )
+        if options['dry_run']:
+            action = 'drop' if options['drop'] else 'archive'
+            self.stdout.write(
+                f'Would {action} partitions: '
+                f"{', '.join(name for _, name in expired) or 'none'}"
+            )
+            return
+
+        for _, name in expired:
+            with transaction.atomic():
+                archive_name = detach_partition(connection, name, drop=options['drop'])
+            if archive_name:
+                self.stdout.write(f'Detached {name} and archived it as {archive_name}')
+            else:
+                self.stdout.write(f'Detached and dropped {name}')
+
+    @staticmethod
+    def format_months(months):
+        return ', '.join(f'{month:%Y-%m}' for month in months) or 'none'
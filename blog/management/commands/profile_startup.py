@@ -0,0 +1,97 @@
+"""
+Profile application start-up: import time breakdown and time to first request.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+import blog
+from blog.startup_profile import parse_importtime, summarize_imports
+
+
+# Directory containing the blog package and the settings modules
+PROJECT_DIR = Path(blog.__file__).resolve().parent.parent
+
+
+class Command(BaseCommand):
+    help = (
+        'Boot the application in a fresh interpreter with -X importtime, serve one '
+        'request and report where the start-up time goes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default='/api/posts/',
+            help='Path of the GET request to time (default: /api/posts/).'
+        )
+        parser.add_argument(
+            '--top', type=int, default=15,
+            help='Number of packages and modules listed in the breakdown.'
+        )
+        parser.add_argument(
+            '--json', action='store_true',
+            help='Print the report as JSON.'
+        )
+
+    def handle(self, *args, **options):
+        report = self.profile(options['path'], options['top'])
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        timings = report['timings']
+        self.stdout.write(f"GET {report['path']} -> {report['status']}")
+        self.stdout.write(
+            f"  process start to first response {report['process_ms']:9.1f} ms"
+        )
+        for name in ['setup', 'wsgi_application', 'first_request', 'second_request']:
+            label = name.replace('_', ' ')
+            self.stdout.write(f"  {label:<32} {timings[f'{name}_ms']:9.1f} ms")
+        imports = report['imports']
+        self.stdout.write(
+            f"\nImports: {imports['modules']} modules, {imports['total_ms']:.1f} ms"
+        )
+        for title, values in [
+            ('By package', imports['packages_ms']),
+            ('Slowest modules', imports['slowest_ms']),
+        ]:
+            self.stdout.write(f'\n{title} (self time):')
+            for name, duration in values.items():
+                self.stdout.write(f'  {name:<48} {duration:8.1f} ms')
+        if report['lazy_modules_loaded']:
+            lazy_modules = ', '.join(report['lazy_modules_loaded'])
+            self.stdout.write(self.style.WARNING(
+                f'\nLoaded although they should be lazy: {lazy_modules}'
+            ))
+
+    def profile(self, path, top):
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE,
+            'PYTHONPATH': os.pathsep.join(
+                filter(None, [str(PROJECT_DIR), os.getenv('PYTHONPATH')])
+            ),
+        }
+        started = time.perf_counter()
+        result = subprocess.run(
+            [
+                sys.executable, '-X', 'importtime',
+                '-m', 'blog.startup_profile', '--path', path,
+            ],
+            capture_output=True, text=True, env=env, cwd=PROJECT_DIR,
+        )
+        process_ms = (time.perf_counter() - started) * 1000
+        if result.returncode != 0:
+            raise CommandError(f'Start-up profiling failed:\n{result.stderr[-2000:]}')
+
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        # The last response is the second request's; subtract it from the total
+        report['process_ms'] = process_ms - report['timings']['second_request_ms']
+        report['imports'] = summarize_imports(parse_importtime(result.stderr), top)
+        return report
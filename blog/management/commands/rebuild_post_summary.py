@@ -0,0 +1,44 @@
+"""
+Rebuild or check the PostSummary read model.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.cache_helpers import BlogCacheHelper
+from blog.read_models import find_post_summary_drift, rebuild_post_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the post_summary read model from posts and comments, or check it.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only compare the read model with the source tables; fail on drift.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of summaries inserted per batch when rebuilding.'
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            drift = find_post_summary_drift()
+            missing, stale = drift['missing'], drift['stale']
+            if missing or stale:
+                raise CommandError(
+                    f'post_summary is inconsistent: {len(missing)} missing and '
+                    f'{len(stale)} stale rows (missing: {self.format_ids(missing)}; '
+                    f'stale: {self.format_ids(stale)}). '
+                    'Run rebuild_post_summary to fix it.'
+                )
+            self.stdout.write('post_summary is consistent.')
+            return
+
+        total = rebuild_post_summaries(batch_size=options['batch_size'])
+        BlogCacheHelper.invalidate_posts_list()
+        self.stdout.write(f'Rebuilt {total} post summaries.')
+
+    @staticmethod
+    def format_ids(ids, limit=10):
+        shown = ', '.join(str(post_id) for post_id in ids[:limit])
+        return f'{shown}, ...' if len(ids) > limit else shown or 'none'
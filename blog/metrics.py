@@ -0,0 +1,171 @@
+"""
+Prometheus metrics, exposed at ``/metrics`` in the text exposition format.
+
+Requires ``prometheus_client`` (the ``metrics`` extra); without it nothing is
+recorded and ``/metrics`` answers 404.
+
+Under gunicorn every worker is a separate process with its own counters. Set
+``PROMETHEUS_MULTIPROC_DIR`` in the environment (before the application is
+imported) to a directory all workers can write to: each process then keeps
+its values in memory-mapped files there, and ``/metrics`` aggregates the files
+of every worker, whichever one answers the scrape. ``gunicorn.conf.py`` empties
+the directory at start-up and cleans up after workers that exit.
+
+The endpoint reveals per-view traffic and database timings, so it only answers
+clients whose address (``REMOTE_ADDR``) is in ``BLOG_METRICS_ALLOWED_IPS``
+(addresses or networks) or that send ``Authorization: Bearer
+<BLOG_METRICS_TOKEN>``; everyone else gets a 404.
+"""
+import hmac
+import ipaddress
+import os
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - depends on the environment
+    prometheus_client = None
+
+
+UNMATCHED_VIEW = 'unmatched'
+
+if prometheus_client is not None:
+    REQUEST_DURATION = prometheus_client.Histogram(
+        'blog_http_request_duration_seconds',
+        'Time to answer a request, through the whole middleware stack.',
+        ['view', 'method'],
+    )
+    REQUESTS = prometheus_client.Counter(
+        'blog_http_requests',
+        'Requests answered, by response status.',
+        ['view', 'method', 'status'],
+    )
+    DB_QUERIES = prometheus_client.Histogram(
+        'blog_db_queries',
+        'SQL queries run per request.',
+        ['view'],
+        buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, float('inf')),
+    )
+    DB_DURATION = prometheus_client.Histogram(
+        'blog_db_duration_seconds',
+        'Time spent running SQL queries per request.',
+        ['view'],
+    )
+    SERIALIZATION_DURATION = prometheus_client.Histogram(
+        'blog_serialization_duration_seconds',
+        'Time spent rendering response data to JSON per request.',
+        ['view'],
+        buckets=(
+            0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1,
+            float('inf'),
+        ),
+    )
+    CACHE_LOOKUPS = prometheus_client.Counter(
+        'blog_cache_lookups',
+        'BlogCacheHelper lookups, by kind of entry and result (hit, miss or error).',
+        ['kind', 'result'],
+    )
+    PASSWORD_HASH_WAIT = prometheus_client.Histogram(
+        'blog_password_hash_wait_seconds',
+        'Time login and registration waited for a password hashing slot.',
+        ['operation'],
+    )
+    PASSWORD_HASH_DURATION = prometheus_client.Histogram(
+        'blog_password_hash_duration_seconds',
+        'Time spent hashing or checking a password.',
+        ['operation'],
+    )
+    PASSWORD_HASH_SHED = prometheus_client.Counter(
+        'blog_password_hash_shed',
+        'Logins and registrations rejected with a 503 for lack of a hashing slot.',
+        ['operation'],
+    )
+
+
+def view_label(request):
+    """The URL name of the view that handled ``request`` (bounded cardinality)."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNMATCHED_VIEW
+    return match.view_name
+
+
+def observe_request(request, response, duration):
+    if prometheus_client is None:
+        return
+    view = view_label(request)
+    REQUEST_DURATION.labels(view, request.method).observe(duration)
+    REQUESTS.labels(view, request.method, response.status_code).inc()
+
+
+def observe_queries(request, count, duration):
+    if prometheus_client is None:
+        return
+    view = view_label(request)
+    DB_QUERIES.labels(view).observe(count)
+    DB_DURATION.labels(view).observe(duration)
+
+
+def observe_serialization(request, duration):
+    if prometheus_client is None:
+        return
+    SERIALIZATION_DURATION.labels(view_label(request)).observe(duration)
+
+
+def record_cache_lookup(kind, result, count=1):
+    if prometheus_client is None or not count:
+        return
+    CACHE_LOOKUPS.labels(kind, result).inc(count)
+
+
+def observe_password_hash(operation, wait, duration):
+    if prometheus_client is None:
+        return
+    PASSWORD_HASH_WAIT.labels(operation).observe(wait)
+    PASSWORD_HASH_DURATION.labels(operation).observe(duration)
+
+
+def record_password_hash_shed(operation):
+    if prometheus_client is None:
+        return
+    PASSWORD_HASH_SHED.labels(operation).inc()
+
+
+def registry():
+    """The registry to expose: every worker's files in multiprocess mode."""
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return prometheus_client.REGISTRY
+    collector_registry = prometheus_client.CollectorRegistry()
+    multiprocess.MultiProcessCollector(collector_registry)
+    return collector_registry
+
+
+def scrape_allowed(request):
+    """Whether ``request`` comes from an allowed address or has the scrape token."""
+    token = settings.BLOG_METRICS_TOKEN
+    authorization = request.META.get('HTTP_AUTHORIZATION', '').encode()
+    if token and hmac.compare_digest(authorization, f'Bearer {token}'.encode()):
+        return True
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in settings.BLOG_METRICS_ALLOWED_IPS
+    )
+
+
+def metrics_view(request):
+    """Serve the metrics in the Prometheus text format."""
+    if prometheus_client is None:
+        raise Http404('prometheus_client is not installed')
+    if not scrape_allowed(request):
+        raise Http404
+    return HttpResponse(
+        prometheus_client.generate_latest(registry()),
+        content_type=prometheus_client.CONTENT_TYPE_LATEST,
+    )
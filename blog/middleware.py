@@ -0,0 +1,443 @@
+"""
+Middleware for blog app.
+"""
+import hashlib
+import logging
+import re
+import time
+import uuid
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.exception import convert_exception_to_response
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.module_loading import import_string
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+from . import metrics
+from .cache_helpers import BlogCacheHelper
+from .compression import compress, negotiate_encoding
+from .health import UNAVAILABLE, readiness_probe
+from .instrumentation import count_queries
+from .log_handlers import request_id_var
+from .routers import request_routing, wrote_to_primary
+
+
+metrics_logger = logging.getLogger('blog.metrics')
+request_logger = logging.getLogger('blog.requests')
+
+
+class AsyncCapableMiddleware:
+    """
+    Base for middleware that runs natively under both WSGI and ASGI.
+
+    Subclasses implement the sync path in ``__call__`` and the async one in
+    ``__acall__``; under ASGI Django then needs no thread hop around them.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        raise NotImplementedError
+
+    async def __acall__(self, request):
+        raise NotImplementedError
+
+
+class HealthCheckMiddleware(AsyncCapableMiddleware):
+    """
+    Answer the liveness (/healthz) and readiness (/readyz) probes.
+
+    Listed first in MIDDLEWARE so probes skip everything else: no host
+    validation (load balancers probe by IP), no HTTPS redirect, no sessions
+    and no access log. Liveness does no I/O; readiness serves the periodically
+    refreshed report of ``blog.health.readiness_probe`` and answers 503 only
+    when the database is unavailable.
+    """
+
+    LIVENESS_PATH = '/healthz'
+    READINESS_PATH = '/readyz'
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        path = request.path_info.rstrip('/')
+        if path == self.LIVENESS_PATH:
+            return self.probe_response({'status': 'ok'})
+        if path == self.READINESS_PATH:
+            return self.probe_response(readiness_probe.get())
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        path = request.path_info.rstrip('/')
+        if path == self.LIVENESS_PATH:
+            return self.probe_response({'status': 'ok'})
+        if path == self.READINESS_PATH:
+            return self.probe_response(await sync_to_async(readiness_probe.get)())
+        return await self.get_response(request)
+
+    @staticmethod
+    def probe_response(report):
+        status = 503 if report['status'] == UNAVAILABLE else 200
+        response = JsonResponse(report, status=status)
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+class RequestIDMiddleware(AsyncCapableMiddleware):
+    """
+    Give each request an ID, log its outcome and latency and record them in
+    the ``/metrics`` histograms.
+
+    The ID comes from the ``X-Request-ID`` header when a proxy set a sane one
+    and is generated otherwise; it is returned in the same header and added to
+    every log record made while handling the request (``RequestIDFilter``).
+    Place it right after ``HealthCheckMiddleware`` (which answers the probes
+    before any other middleware) so the latency covers the rest of the stack.
+    """
+
+    HEADER = 'X-Request-ID'
+    VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,128}$')
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token, started = self.start(request)
+        try:
+            response = self.get_response(request)
+            return self.finish(request, response, started)
+        finally:
+            request_id_var.reset(token)
+
+    async def __acall__(self, request):
+        token, started = self.start(request)
+        try:
+            response = await self.get_response(request)
+            return self.finish(request, response, started)
+        finally:
+            request_id_var.reset(token)
+
+    def start(self, request):
+        request_id = request.headers.get(self.HEADER, '')
+        if not self.VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.request_id = request_id
+        return request_id_var.set(request_id), time.perf_counter()
+
+    def finish(self, request, response, started):
+        duration = time.perf_counter() - started
+        duration_ms = duration * 1000
+        metrics.observe_request(request, response, duration)
+        response[self.HEADER] = request.request_id
+        request_logger.info(
+            '%s %s %d %.2fms',
+            request.method, request.path, response.status_code, duration_ms,
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'duration_ms': round(duration_ms, 2),
+            },
+        )
+        return response
+
+
+class QueryCountMiddleware(AsyncCapableMiddleware):
+    """
+    Count the SQL queries and database time of each request.
+
+    With DEBUG on the numbers are returned as X-DB-Query-Count and
+    X-DB-Query-Time-Ms response headers; otherwise they are logged to the
+    ``blog.metrics`` logger. Both are recorded in the ``/metrics`` histograms.
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with count_queries() as counter:
+            response = self.get_response(request)
+        return self.report(request, response, counter)
+
+    async def __acall__(self, request):
+        # Connections are thread-local: install the wrappers in the thread the
+        # async ORM runs its queries in
+        stack = ExitStack()
+        counter = await sync_to_async(stack.enter_context)(count_queries())
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.report(request, response, counter)
+
+    def report(self, request, response, counter):
+        metrics.observe_queries(request, counter.count, counter.duration)
+        duration_ms = counter.duration * 1000
+        if settings.DEBUG:
+            response['X-DB-Query-Count'] = str(counter.count)
+            response['X-DB-Query-Time-Ms'] = f'{duration_ms:.2f}'
+        else:
+            metrics_logger.info(
+                '%s %s db_queries=%d db_time_ms=%.2f',
+                request.method, request.path, counter.count, duration_ms,
+                extra={
+                    'db_queries': counter.count,
+                    'db_time_ms': round(duration_ms, 2),
+                },
+            )
+        return response
+
+
+class ReplicaPinningMiddleware(AsyncCapableMiddleware):
+    """
+    Pin clients to the primary database for a short window after they write.
+
+    Browsers are pinned with a cookie; token clients, which often do not keep
+    cookies, are pinned through the cache using a hash of their credentials.
+    """
+
+    PIN_CACHE_KEY = 'primary_pin_{}'
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        with request_routing(pinned=self.is_pinned(request)):
+            response = self.get_response(request)
+            if wrote_to_primary():
+                self.pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        with request_routing(pinned=await self.ais_pinned(request)):
+            response = await self.get_response(request)
+            if wrote_to_primary():
+                await self.apin(request, response)
+        return response
+
+    def credentials_key(self, request):
+        authorization = request.META.get('HTTP_AUTHORIZATION')
+        if not authorization:
+            return None
+        digest = hashlib.sha256(authorization.encode()).hexdigest()
+        return self.PIN_CACHE_KEY.format(digest)
+
+    def is_pinned(self, request):
+        if settings.REPLICA_PIN_COOKIE in request.COOKIES:
+            return True
+        key = self.credentials_key(request)
+        if key is None:
+            return False
+        try:
+            return bool(cache.get(key))
+        except Exception:
+            # Without the cache we cannot know, so read from the primary
+            return True
+
+    async def ais_pinned(self, request):
+        if settings.REPLICA_PIN_COOKIE in request.COOKIES:
+            return True
+        key = self.credentials_key(request)
+        if key is None:
+            return False
+        try:
+            return bool(await cache.aget(key))
+        except Exception:
+            return True
+
+    def pin(self, request, response):
+        key = self.set_pin_cookie(request, response)
+        if key is not None:
+            try:
+                cache.set(key, True, settings.REPLICA_PIN_SECONDS)
+            except Exception:
+                pass
+
+    async def apin(self, request, response):
+        key = self.set_pin_cookie(request, response)
+        if key is not None:
+            try:
+                await cache.aset(key, True, settings.REPLICA_PIN_SECONDS)
+            except Exception:
+                pass
+
+    def set_pin_cookie(self, request, response):
+        """Pin the browser; return the cache key pinning token clients, if any."""
+        response.set_cookie(
+            settings.REPLICA_PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+            httponly=True, samesite='Lax'
+        )
+        return self.credentials_key(request)
+
+
+class CompressionMiddleware(AsyncCapableMiddleware):
+    """
+    Compress JSON API responses with gzip or brotli, per Accept-Encoding.
+
+    Bodies smaller than BLOG_COMPRESSION_MIN_SIZE are sent as is. Responses
+    served through BlogCacheHelper (marked with ``blog_cache_key``) have their
+    compressed body cached next to the data, so hot responses are compressed
+    once rather than on every request.
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        encoding = self.negotiate(request, response)
+        if encoding is None:
+            return response
+        content = self.compressed_content(response, encoding)
+        return self.apply(response, encoding, content)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        encoding = self.negotiate(request, response)
+        if encoding is None:
+            return response
+        # Compressing (and the cache lookup) would block the event loop
+        content = await sync_to_async(self.compressed_content, thread_sensitive=False)(
+            response, encoding
+        )
+        return self.apply(response, encoding, content)
+
+    def negotiate(self, request, response):
+        """The content coding to apply to ``response``, or None."""
+        if not self.should_compress(response):
+            return None
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+    def apply(self, response, encoding, content):
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        # The compressed body is a different representation of the same data
+        etag = response.get('ETag')
+        if etag and not etag.startswith('W/'):
+            response['ETag'] = f'W/{etag}'
+        return response
+
+    def should_compress(self, response):
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.has_header('Content-Encoding')
+            and response.get('Content-Type', '').startswith('application/json')
+            and len(response.content) >= settings.BLOG_COMPRESSION_MIN_SIZE
+        )
+
+    def compressed_content(self, response, encoding):
+        cache_key = getattr(response, 'blog_cache_key', None)
+        if cache_key is None:
+            return compress(response.content, encoding)
+
+        digest = hashlib.sha256(response.content).hexdigest()[:40]
+        content = BlogCacheHelper.get_compressed(cache_key, encoding, digest)
+        if content is None:
+            content = compress(response.content, encoding)
+            BlogCacheHelper.set_compressed(cache_key, encoding, digest, content)
+        return content
+
+
+class WhiteNoiseMiddleware(AsyncCapableMiddleware, BaseWhiteNoiseMiddleware):
+    """
+    WhiteNoise that also runs natively under ASGI.
+
+    WhiteNoise's own middleware is sync-only, which makes Django run every ASGI
+    request below it in a thread. Looking up a static file is an in-memory
+    dict access, so only actually serving one is moved to a thread here.
+    """
+
+    def __init__(self, get_response):
+        BaseWhiteNoiseMiddleware.__init__(self, get_response)
+        AsyncCapableMiddleware.__init__(self, get_response)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return BaseWhiteNoiseMiddleware.__call__(self, request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class FullStackMiddleware(AsyncCapableMiddleware):
+    """
+    Run ``BLOG_FULL_STACK_MIDDLEWARE`` only outside the lean API prefixes.
+
+    Requests whose path starts with one of ``BLOG_LEAN_PATH_PREFIXES`` (the
+    token-authenticated API) skip sessions, CSRF, auth, messages and
+    clickjacking protection entirely; everything else (the admin) goes through
+    them as if they were listed in MIDDLEWARE. ``settings.api`` puts it right
+    after ``CommonMiddleware``, behind ``HealthCheckMiddleware``,
+    ``RequestIDMiddleware`` and the rest of the shared stack. The wrapped
+    middleware may use ``process_view`` (CSRF does) but not
+    ``process_exception`` or ``process_template_response``.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.lean_prefixes = tuple(settings.BLOG_LEAN_PATH_PREFIXES)
+        self.view_middleware = []
+        handler = get_response
+        for path in reversed(settings.BLOG_FULL_STACK_MIDDLEWARE):
+            instance = import_string(path)(handler)
+            unsupported = ('process_exception', 'process_template_response')
+            if any(hasattr(instance, name) for name in unsupported):
+                raise ImproperlyConfigured(
+                    f'{path} cannot be wrapped by FullStackMiddleware; '
+                    'list it in MIDDLEWARE.'
+                )
+            if hasattr(instance, 'process_view'):
+                self.view_middleware.insert(0, instance.process_view)
+            handler = convert_exception_to_response(instance)
+        self.full_stack = handler
+
+    def is_lean(self, request):
+        return request.path_info.startswith(self.lean_prefixes)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if self.is_lean(request):
+            return self.get_response(request)
+        return self.full_stack(request)
+
+    async def __acall__(self, request):
+        if self.is_lean(request):
+            return await self.get_response(request)
+        return await self.full_stack(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_lean(request):
+            return None
+        for process_view in self.view_middleware:
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
@@ -0,0 +1,107 @@
+"""
+Partition blog_comment by created_at on PostgreSQL.
+
+The comments table is rebuilt as a range-partitioned table with one partition per
+month plus a default partition. PostgreSQL requires the partition key in every
+unique constraint, so the primary key becomes (id, created_at); the model keeps
+``id`` as its primary key, which stays unique because ids are UUIDs. Other
+databases keep the regular table.
+"""
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+from blog.partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    create_partition_sql,
+    month_start,
+)
+
+
+# Monthly partitions created ahead of the current month; manage_comment_partitions
+# keeps extending them.
+MONTHS_AHEAD = 3
+
+
+def _constraint_sql(apps, quote_name, primary_key):
+    post_table = apps.get_model('blog', 'BlogPost')._meta.db_table
+    user_table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    return [
+        'ALTER TABLE blog_comment ADD CONSTRAINT blog_comment_pkey '
+        f'PRIMARY KEY ({primary_key})',
+        'ALTER TABLE blog_comment ADD CONSTRAINT blog_comment_post_id_fk '
+        f'FOREIGN KEY (post_id) REFERENCES {quote_name(post_table)} (id) '
+        'DEFERRABLE INITIALLY DEFERRED',
+        'ALTER TABLE blog_comment ADD CONSTRAINT blog_comment_author_id_fk '
+        f'FOREIGN KEY (author_id) REFERENCES {quote_name(user_table)} (id) '
+        'DEFERRABLE INITIALLY DEFERRED',
+        'CREATE INDEX blog_comment_post_id_created_at_idx '
+        'ON blog_comment (post_id, created_at)',
+        'CREATE INDEX blog_comment_author_id_idx ON blog_comment (author_id)',
+    ]
+
+
+def partition_comments(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    quote_name = connection.ops.quote_name
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT MIN(created_at) FROM blog_comment')
+        oldest = cursor.fetchone()[0]
+    this_month = month_start(timezone.now())
+    month = month_start(oldest) if oldest else this_month
+
+    schema_editor.execute(
+        'ALTER TABLE blog_comment RENAME TO blog_comment_unpartitioned'
+    )
+    schema_editor.execute(
+        'CREATE TABLE blog_comment '
+        '(LIKE blog_comment_unpartitioned INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE (created_at)'
+    )
+    schema_editor.execute(
+        f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF blog_comment DEFAULT'
+    )
+    while month <= add_months(this_month, MONTHS_AHEAD):
+        schema_editor.execute(create_partition_sql(month, quote_name))
+        month = add_months(month, 1)
+
+    # Copy before adding keys and indexes so they are built once per partition
+    schema_editor.execute(
+        'INSERT INTO blog_comment SELECT * FROM blog_comment_unpartitioned'
+    )
+    schema_editor.execute('DROP TABLE blog_comment_unpartitioned')
+    for sql in _constraint_sql(apps, quote_name, 'id, created_at'):
+        schema_editor.execute(sql)
+
+
+def unpartition_comments(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('ALTER TABLE blog_comment RENAME TO blog_comment_partitioned')
+    schema_editor.execute(
+        'CREATE TABLE blog_comment (LIKE blog_comment_partitioned INCLUDING DEFAULTS)'
+    )
+    schema_editor.execute(
+        'INSERT INTO blog_comment SELECT * FROM blog_comment_partitioned'
+    )
+    schema_editor.execute('DROP TABLE blog_comment_partitioned')
+    for sql in _constraint_sql(apps, connection.ops.quote_name, 'id'):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("blog", "0002_remove_comment_author_name_blogpost_author_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_comments, unpartition_comments),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_post_summaries(apps, schema_editor):
+    BlogPost = apps.get_model("blog", "BlogPost")
+    PostSummary = apps.get_model("blog", "PostSummary")
+    posts = (
+        BlogPost.objects.select_related("author")
+        .annotate(comment_count=models.Count("comments"))
+        .iterator(chunk_size=1000)
+    )
+    batch = []
+    for post in posts:
+        batch.append(
+            PostSummary(
+                post_id=post.id,
+                title=post.title,
+                author_id=post.author_id,
+                author_username=post.author.username,
+                author_email=post.author.email,
+                comment_count=post.comment_count,
+                created_at=post.created_at,
+            )
+        )
+        if len(batch) >= 1000:
+            PostSummary.objects.bulk_create(batch)
+            batch = []
+    PostSummary.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("blog", "0003_partition_comments"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostSummary",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="blog.blogpost",
+                    ),
+                ),
+                ("title", models.CharField(max_length=255)),
+                ("author_username", models.CharField(max_length=150)),
+                ("author_email", models.EmailField(blank=True, max_length=254)),
+                ("comment_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField()),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "post_summary",
+                "indexes": [
+                    models.Index(
+                        fields=["-created_at"], name="post_summary_created_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_post_summaries, migrations.RunPython.noop),
+    ]
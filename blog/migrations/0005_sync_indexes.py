@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0004_post_summary"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                fields=["updated_at", "id"], name="blog_post_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["updated_at", "id"], name="blog_comment_updated_idx"
+            ),
+        ),
+    ]
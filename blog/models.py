@@ -15,6 +15,12 @@ class BlogPost(TimeStampedModel):
     content = models.TextField()
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
 
+    class Meta:
+        indexes = [
+            # Keyset scans of GET /api/sync
+            models.Index(fields=['updated_at', 'id'], name='blog_post_updated_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -24,5 +30,37 @@ class Comment(TimeStampedModel):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments')
     content = models.TextField()
 
+    class Meta:
+        indexes = [
+            # Keyset scans of GET /api/sync
+            models.Index(fields=['updated_at', 'id'], name='blog_comment_updated_idx'),
+        ]
+
     def __str__(self):
         return f"Comment by {self.author.username} on {self.post.title}"
+
+class PostSummary(models.Model):
+    """
+    Denormalized read model behind the posts list.
+
+    Kept up to date incrementally by the signal handlers in ``blog.signals``;
+    ``manage.py rebuild_post_summary`` rebuilds or checks it.
+    """
+    post = models.OneToOneField(
+        BlogPost, primary_key=True, on_delete=models.CASCADE, related_name='summary'
+    )
+    title = models.CharField(max_length=255)
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    author_username = models.CharField(max_length=150)
+    author_email = models.EmailField(blank=True)
+    comment_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'post_summary'
+        indexes = [
+            models.Index(fields=['-created_at'], name='post_summary_created_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
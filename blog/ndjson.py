@@ -0,0 +1,48 @@
+"""
+NDJSON helpers shared by the blog import/export commands.
+"""
+import json
+
+from django.contrib.auth.models import User
+
+from .models import BlogPost, Comment
+
+
+# Record types in foreign key order: a record only references records of the
+# types listed before it.
+RECORD_TYPES = ['user', 'post', 'comment']
+
+RECORD_MODELS = {
+    'user': User,
+    'post': BlogPost,
+    'comment': Comment,
+}
+
+# Exported fields per record type (attribute names, so foreign keys are ids)
+RECORD_FIELDS = {
+    'user': [
+        'id', 'username', 'email', 'first_name', 'last_name', 'password',
+        'is_active', 'is_staff', 'is_superuser', 'date_joined', 'last_login',
+    ],
+    'post': ['id', 'title', 'content', 'author_id', 'created_at', 'updated_at'],
+    'comment': ['id', 'post_id', 'author_id', 'content', 'created_at', 'updated_at'],
+}
+
+
+def _encode_value(value):
+    """Encode datetimes and UUIDs without losing precision."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(record):
+    """Serialize a record as a single NDJSON line (without the newline)."""
+    return json.dumps(
+        record, default=_encode_value, ensure_ascii=False, separators=(',', ':')
+    )
+
+
+def loads(line):
+    """Parse a single NDJSON line."""
+    return json.loads(line)
@@ -0,0 +1,44 @@
+"""
+Pagination for the cached posts list.
+"""
+from django.utils.http import urlencode
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PostListPagination(PageNumberPagination):
+    """
+    PageNumberPagination whose responses depend on the page number only.
+
+    The next/previous links drop every other query parameter, so one cached
+    page serves every query string that names it, and ``cache_query`` gives the
+    query string a page is cached under.
+    """
+
+    def cache_query(self, query_params):
+        """Canonical query string of the page requested by ``query_params``."""
+        page = query_params.get(self.page_query_param, '1')
+        try:
+            page = int(page)
+        except ValueError:
+            # Answered with 404 (or 'last'), never cached under a number
+            pass
+        return urlencode({self.page_query_param: page})
+
+    def page_url(self):
+        return self.request.build_absolute_uri(self.request.path)
+
+    def get_next_link(self):
+        if not self.page.has_next():
+            return None
+        return replace_query_param(
+            self.page_url(), self.page_query_param, self.page.next_page_number()
+        )
+
+    def get_previous_link(self):
+        if not self.page.has_previous():
+            return None
+        page_number = self.page.previous_page_number()
+        if page_number == 1:
+            return remove_query_param(self.page_url(), self.page_query_param)
+        return replace_query_param(self.page_url(), self.page_query_param, page_number)
@@ -0,0 +1,172 @@
+"""
+Monthly range partitions for the comments table (PostgreSQL only).
+
+On PostgreSQL ``blog_comment`` is partitioned by ``created_at`` (see migration
+0003). Each month lives in ``blog_comment_pYYYY_MM``; rows outside every
+monthly range land in ``blog_comment_default``. Other databases keep a single
+regular table and every helper here is a no-op for them.
+
+PostgreSQL refuses to create a partition for a month that already has rows in
+the default partition, so ``ensure_partitions`` moves those rows into the new
+partition while the default partition is detached.
+"""
+import datetime
+import re
+
+from django.db import transaction
+
+
+COMMENT_TABLE = 'blog_comment'
+DEFAULT_PARTITION = 'blog_comment_default'
+PARTITION_PREFIX = 'blog_comment_p'
+ARCHIVE_PREFIX = 'blog_comment_archive_'
+
+_PARTITION_NAME_RE = re.compile(r'^blog_comment_p(\d{4})_(\d{2})$')
+
+
+def add_months(month, months):
+    """Return the first day of the month ``months`` after ``month``."""
+    years, month_index = divmod(month.month - 1 + months, 12)
+    return datetime.date(month.year + years, month_index + 1, 1)
+
+
+def month_start(value):
+    """Return the first day of the month containing ``value``."""
+    return datetime.date(value.year, value.month, 1)
+
+
+def partition_name(month):
+    """Name of the partition holding ``month``."""
+    return f'{PARTITION_PREFIX}{month:%Y_%m}'
+
+
+def partition_month(name):
+    """Month held by a partition, or None if ``name`` is not a monthly partition."""
+    match = _PARTITION_NAME_RE.match(name)
+    if match is None:
+        return None
+    return datetime.date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def partition_bounds(month):
+    """``created_at`` range of the partition for ``month`` (UTC, end excluded)."""
+    end = add_months(month, 1)
+    return f'{month.isoformat()} 00:00:00+00', f'{end.isoformat()} 00:00:00+00'
+
+
+def create_partition_sql(month, quote_name):
+    """SQL creating the partition for ``month`` (bounds are in UTC)."""
+    start, end = partition_bounds(month)
+    return (
+        f'CREATE TABLE IF NOT EXISTS {quote_name(partition_name(month))} '
+        f'PARTITION OF {quote_name(COMMENT_TABLE)} '
+        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+
+
+def is_partitioned(connection):
+    """Return whether the comments table is a partitioned table."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE relname = %s AND relkind = 'p'",
+            [COMMENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def monthly_partitions(connection):
+    """Return ``{month: name}`` for every monthly partition currently attached."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [COMMENT_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    return {partition_month(name): name for name in names if partition_month(name)}
+
+
+def default_partition_has_rows(connection, month):
+    """Return whether comments of ``month`` have landed in the default partition."""
+    start, end = partition_bounds(month)
+    default = connection.ops.quote_name(DEFAULT_PARTITION)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT EXISTS (SELECT 1 FROM {default} '
+            'WHERE created_at >= %s AND created_at < %s)',
+            [start, end],
+        )
+        return cursor.fetchone()[0]
+
+
+def create_partition_from_default(connection, month):
+    """
+    Create the partition for ``month`` and move its rows out of the default partition.
+
+    The default partition is detached meanwhile (it may not hold rows of an
+    attached monthly range), which locks the comments table until the
+    transaction ends; run it inside one. Returns the number of rows moved.
+    """
+    quote_name = connection.ops.quote_name
+    table, default = quote_name(COMMENT_TABLE), quote_name(DEFAULT_PARTITION)
+    start, end = partition_bounds(month)
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {default}')
+        cursor.execute(create_partition_sql(month, quote_name))
+        # Through the parent, which routes every row to the new partition
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {default} '
+            'WHERE created_at >= %s AND created_at < %s RETURNING *) '
+            f'INSERT INTO {table} SELECT * FROM moved',
+            [start, end],
+        )
+        moved = cursor.rowcount
+        cursor.execute(f'ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT')
+    return moved
+
+
+def ensure_partitions(connection, first_month, last_month):
+    """Create the missing monthly partitions from ``first_month`` to ``last_month``."""
+    existing = monthly_partitions(connection)
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        if month not in existing:
+            with transaction.atomic(using=connection.alias):
+                if default_partition_has_rows(connection, month):
+                    create_partition_from_default(connection, month)
+                else:
+                    sql = create_partition_sql(month, connection.ops.quote_name)
+                    with connection.cursor() as cursor:
+                        cursor.execute(sql)
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def detach_partition(connection, name, drop=False):
+    """
+    Detach a monthly partition from the comments table.
+
+    The detached table is renamed to ``blog_comment_archive_YYYY_MM`` so it can
+    be dumped or moved to cheaper storage, or dropped when ``drop`` is set.
+    """
+    quote_name = connection.ops.quote_name
+    table, partition = quote_name(COMMENT_TABLE), quote_name(name)
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {partition}')
+        if drop:
+            cursor.execute(f'DROP TABLE {partition}')
+            return None
+        archive_name = ARCHIVE_PREFIX + name[len(PARTITION_PREFIX):]
+        cursor.execute(
+            f'ALTER TABLE {partition} RENAME TO {quote_name(archive_name)}'
+        )
+        return archive_name
@@ -0,0 +1,116 @@
+"""
+Maintenance helpers for the PostSummary read model.
+"""
+from django.db import connections, router, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import BlogPost, Comment, PostSummary
+
+
+def summary_for_post(post, comment_count=0):
+    """Build (without saving) the summary row of a post."""
+    return PostSummary(
+        post_id=post.pk,
+        title=post.title,
+        author_id=post.author_id,
+        author_username=post.author.username,
+        author_email=post.author.email,
+        comment_count=comment_count,
+        created_at=post.created_at,
+    )
+
+
+SUMMARY_FIELDS = [
+    'title', 'author', 'author_username', 'author_email', 'comment_count', 'created_at'
+]
+
+
+def lock_post_summaries(using):
+    """
+    Make the signal handlers' summary writes wait until the transaction ends.
+
+    PostgreSQL only; SQLite already serializes writers.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'LOCK TABLE {connection.ops.quote_name(PostSummary._meta.db_table)} '
+            'IN SHARE ROW EXCLUSIVE MODE'
+        )
+
+
+def upsert_post_summaries(summaries):
+    PostSummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=['post'],
+        update_fields=SUMMARY_FIELDS,
+    )
+
+
+def rebuild_post_summaries(batch_size=1000):
+    """
+    Bring every summary row in line with the posts and comments tables.
+
+    Rows are upserted in place (readers never see a missing row) from counts
+    taken after locking the table, so a comment counted meanwhile waits for the
+    rebuild and then increments the rebuilt count instead of being lost.
+    """
+    using = router.db_for_write(PostSummary)
+    total = 0
+    with transaction.atomic(using=using):
+        lock_post_summaries(using)
+        posts = (
+            BlogPost.objects
+            .select_related('author')
+            .annotate(comment_count=Count('comments'))
+            .iterator(chunk_size=batch_size)
+        )
+        batch = []
+        for post in posts:
+            batch.append(summary_for_post(post, post.comment_count))
+            if len(batch) >= batch_size:
+                upsert_post_summaries(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            upsert_post_summaries(batch)
+            total += len(batch)
+    return total
+
+
+def find_post_summary_drift():
+    """
+    Compare the read model with the source tables.
+
+    Returns the ids of posts without a summary (``missing``) and of summaries
+    whose title, author or comment count disagree with the source (``stale``).
+    """
+    missing = list(
+        BlogPost.objects.filter(summary__isnull=True).values_list('id', flat=True)
+    )
+    actual_count = Subquery(
+        Comment.objects
+        .filter(post_id=OuterRef('post_id'))
+        .order_by()
+        .values('post_id')
+        .annotate(count=Count('id'))
+        .values('count'),
+        output_field=IntegerField(),
+    )
+    stale = list(
+        PostSummary.objects
+        .annotate(actual_count=Coalesce(actual_count, Value(0)))
+        .filter(
+            ~Q(comment_count=F('actual_count'))
+            | ~Q(title=F('post__title'))
+            | ~Q(author_id=F('post__author_id'))
+            | ~Q(author_username=F('author__username'))
+            | ~Q(author_email=F('author__email'))
+        )
+        .values_list('post_id', flat=True)
+    )
+    return {'missing': missing, 'stale': stale}
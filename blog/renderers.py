@@ -0,0 +1,128 @@
+"""
+JSON renderer and parser backed by orjson, with a stdlib fallback.
+
+Output matches ``rest_framework.renderers.JSONRenderer`` with the default
+settings (compact separators, UTF-8, U+2028/U+2029 escaped). Anything orjson
+cannot encode identically is handed to DRF's encoder: integers wider than 64
+bits, non-string dict keys, datetimes whose UTC offset has seconds, and any
+float or Decimal, since orjson writes exponents differently (``1e16`` rather
+than ``1e+16``) and turns NaN and Infinity into ``null`` where DRF raises
+``ValueError``. When orjson is not installed both classes behave exactly like
+their DRF parents. The time spent rendering is recorded per view in
+``blog_serialization_duration_seconds``.
+"""
+import datetime
+import decimal
+import time
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from . import metrics
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised by patching in the tests
+    orjson = None
+
+
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+# Exact types the scan below skips without further checks
+SCALAR_TYPES = frozenset({str, int, bool, type(None)})
+
+
+def needs_drf_encoder(data):
+    """
+    Whether ``data`` holds, at any depth, a value orjson would encode unlike DRF.
+
+    That is a float or Decimal, or a datetime whose UTC offset has seconds
+    (orjson writes whole minutes). Keys are not scanned: orjson rejects
+    non-string keys on its own.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if type(value) in SCALAR_TYPES:
+            continue
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, (float, decimal.Decimal)):
+            return True
+        elif isinstance(value, datetime.datetime) and value.tzinfo is not None:
+            offset = value.utcoffset()
+            if offset is not None and offset.seconds % 60:
+                return True
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that serializes with orjson when it can."""
+
+    def orjson_compatible(self, indent):
+        """orjson only produces DRF's compact, non-ASCII, strict output."""
+        return (
+            orjson is not None
+            and indent is None
+            and self.compact
+            and not self.ensure_ascii
+            and self.strict
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        started = time.perf_counter()
+        try:
+            return self.encode(data, accepted_media_type, renderer_context)
+        finally:
+            metrics.observe_serialization(
+                (renderer_context or {}).get('request'), time.perf_counter() - started
+            )
+
+    def encode(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if not self.orjson_compatible(indent) or needs_drf_encoder(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            # OPT_UTC_Z writes UTC as "Z", like DRF's encoder
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=orjson.OPT_UTC_Z
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits or non-string keys
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict JavaScript subset, like JSONRenderer
+        if LINE_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b'\\u2028')
+        if PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser that decodes with orjson when it can."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        # orjson rejects NaN/Infinity, so it can only stand in for strict parsing
+        utf8 = encoding.lower().replace('-', '') == 'utf8'
+        if orjson is None or not self.strict or not utf8:
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
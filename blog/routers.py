@@ -0,0 +1,145 @@
+"""
+Database routing for read replicas.
+
+Reads are only sent to a replica inside a ``replica_reads()`` block (the GET paths
+of the post list and detail views). Everything else, and every read made by a
+client that has written recently, goes to the primary so authors always see
+their own changes.
+
+Responses read from a replica are shared with every client through the response
+cache, so ``CacheFill`` keeps replicas out of cache fills for
+``REPLICA_PIN_SECONDS`` after a write invalidated cached data: until then a
+replica may still return the old rows and put them back in the cache.
+"""
+import random
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+PRIMARY_DATABASE = 'default'
+RECENT_WRITE_CACHE_KEY = 'replica_recent_write'
+
+_replica_reads_allowed = ContextVar('replica_reads_allowed', default=False)
+_pinned_to_primary = ContextVar('pinned_to_primary', default=False)
+_wrote_to_primary = ContextVar('wrote_to_primary', default=False)
+
+
+@contextmanager
+def replica_reads():
+    """Allow the reads made inside the block to be served by a replica."""
+    token = _replica_reads_allowed.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads_allowed.reset(token)
+
+
+@contextmanager
+def request_routing(pinned=False):
+    """Track the routing state of a single request."""
+    pinned_token = _pinned_to_primary.set(pinned)
+    wrote_token = _wrote_to_primary.set(False)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(pinned_token)
+        _wrote_to_primary.reset(wrote_token)
+
+
+def wrote_to_primary():
+    """Return whether the current request has written to the primary."""
+    return _wrote_to_primary.get()
+
+
+def replicas_usable():
+    """Whether this request may read from a replica at all."""
+    return bool(settings.DATABASE_REPLICAS) and not (
+        _pinned_to_primary.get() or _wrote_to_primary.get()
+    )
+
+
+def mark_recent_write():
+    """Record that cached data was invalidated by a write replicas may not have yet."""
+    if not settings.DATABASE_REPLICAS:
+        return
+    try:
+        cache.set(RECENT_WRITE_CACHE_KEY, True, settings.REPLICA_PIN_SECONDS)
+    except Exception:
+        pass
+
+
+def replicas_may_lag():
+    try:
+        return bool(cache.get(RECENT_WRITE_CACHE_KEY))
+    except Exception:
+        # Without the cache we cannot know
+        return True
+
+
+async def areplicas_may_lag():
+    try:
+        return bool(await cache.aget(RECENT_WRITE_CACHE_KEY))
+    except Exception:
+        return True
+
+
+class CacheFill:
+    """
+    Database reads made to fill the shared response cache.
+
+    They use a replica only when no write invalidated cached data in the last
+    ``REPLICA_PIN_SECONDS``, and ``cacheable()`` refuses replica results when
+    such a write happened while they were being read::
+
+        fill = CacheFill.start()
+        with fill.reads():
+            data = ...
+        if fill.cacheable():
+            BlogCacheHelper.set(key, data)
+    """
+
+    def __init__(self, from_replica):
+        self.from_replica = from_replica
+
+    @classmethod
+    def start(cls):
+        return cls(replicas_usable() and not replicas_may_lag())
+
+    @classmethod
+    async def astart(cls):
+        return cls(replicas_usable() and not await areplicas_may_lag())
+
+    def reads(self):
+        return replica_reads() if self.from_replica else nullcontext()
+
+    def cacheable(self):
+        return not (self.from_replica and replicas_may_lag())
+
+    async def acacheable(self):
+        return not (self.from_replica and await areplicas_may_lag())
+
+
+class PrimaryReplicaRouter:
+    """Send eligible reads to a random replica and all writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            replicas
+            and _replica_reads_allowed.get()
+            and not _pinned_to_primary.get()
+            and not _wrote_to_primary.get()
+        ):
+            return random.choice(replicas)
+        return PRIMARY_DATABASE
+
+    def db_for_write(self, model, **hints):
+        _wrote_to_primary.set(True)
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
@@ -1,7 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
-from .models import BlogPost, Comment
+from django.db import transaction
+from .hashing import password_hashing
+from .models import BlogPost, Comment, PostSummary
+from .read_models import summary_for_post
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -20,7 +23,8 @@ class LoginSerializer(serializers.Serializer):
         password = attrs.get('password')
 
         if username and password:
-            user = authenticate(username=username, password=password)
+            with password_hashing('login'):
+                user = authenticate(username=username, password=password)
             if not user:
                 raise serializers.ValidationError('Credenciais inválidas.')
             if not user.is_active:
@@ -47,10 +51,23 @@ class RegisterSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop('password_confirm')
-        user = User.objects.create_user(**validated_data)
+        with password_hashing('register'):
+            user = User.objects.create_user(**validated_data)
         return user
 
 
+class BlogPostBulkCreateSerializer(serializers.ListSerializer):
+    """List serializer that inserts all validated posts with one bulk_create."""
+
+    def create(self, validated_data):
+        posts = [BlogPost(**attrs) for attrs in validated_data]
+        with transaction.atomic():
+            posts = BlogPost.objects.bulk_create(posts)
+            # bulk_create sends no post_save signals, so fill the read model here
+            PostSummary.objects.bulk_create([summary_for_post(post) for post in posts])
+        return posts
+
+
 class BlogPostSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     
@@ -58,6 +75,7 @@ class BlogPostSerializer(serializers.ModelSerializer):
         model = BlogPost
         fields = ['id', 'title', 'content', 'author', 'created_at', 'updated_at']
         read_only_fields = ['id', 'author', 'created_at', 'updated_at']
+        list_serializer_class = BlogPostBulkCreateSerializer
 
     def validate_title(self, value):
         if not value or not value.strip():
@@ -103,4 +121,25 @@ class BlogPostListSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'comment_count', 'author']
 
     def get_comment_count(self, obj):
-        return obj.comments.count() 
\ No newline at end of file
+        # The list view annotates the count; single objects fall back to a query
+        comment_count = getattr(obj, 'comment_count', None)
+        if comment_count is not None:
+            return comment_count
+        return obj.comments.count()
+
+
+class PostSummarySerializer(serializers.ModelSerializer):
+    """Posts list representation read from the PostSummary read model."""
+    id = serializers.UUIDField(source='post_id', read_only=True)
+    author = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PostSummary
+        fields = ['id', 'title', 'comment_count', 'author']
+
+    def get_author(self, obj):
+        return {
+            'id': obj.author_id,
+            'username': obj.author_username,
+            'email': obj.author_email,
+        }
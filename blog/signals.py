@@ -0,0 +1,89 @@
+"""
+Signal handlers keeping the PostSummary read model (and edge and token caches)
+in sync with their sources.
+"""
+from django.contrib.auth.models import User
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_tokens
+from .cache_helpers import BlogCacheHelper
+from .edge_cache import author_surrogate_key, purge_surrogate_keys
+from .models import BlogPost, Comment, PostSummary
+from .read_models import summary_for_post
+
+
+@receiver(post_save, sender=BlogPost)
+def sync_post_summary(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        summary_for_post(instance).save(force_insert=True)
+    else:
+        PostSummary.objects.filter(post_id=instance.pk).update(
+            title=instance.title,
+            author_id=instance.author_id,
+            author_username=instance.author.username,
+            author_email=instance.author.email,
+        )
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        PostSummary.objects.filter(post_id=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    PostSummary.objects.filter(post_id=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+@receiver(post_save, sender=User)
+def sync_author_fields(
+    sender, instance, created, raw=False, update_fields=None, **kwargs
+):
+    if created or raw:
+        return
+    if update_fields is not None and not {'username', 'email'} & set(update_fields):
+        # e.g. the last_login update on every login
+        return
+    PostSummary.objects.filter(author_id=instance.pk).update(
+        author_username=instance.username,
+        author_email=instance.email,
+    )
+    # Author details are embedded in cached list and detail responses (posts
+    # they wrote or commented on): drop them here before purging the edge copies
+    BlogCacheHelper.invalidate_posts_list()
+    BlogCacheHelper.invalidate_post_details(
+        BlogPost.objects
+        .filter(Q(author_id=instance.pk) | Q(comments__author_id=instance.pk))
+        .values_list('id', flat=True)
+        .distinct()
+    )
+    purge_surrogate_keys(author_surrogate_key(instance.pk))
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    # Also covers regenerated tokens (delete + create) and deleted users (cascade)
+    invalidate_tokens([instance.key])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(
+    sender, instance, created, raw=False, update_fields=None, **kwargs
+):
+    if created or raw:
+        return
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    # The cached entries hold the user's fields, is_active included
+    keys = Token.objects.filter(user_id=instance.pk).values_list('key', flat=True)
+    invalidate_tokens(keys)
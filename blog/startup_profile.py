@@ -0,0 +1,142 @@
+"""
+Cold start profiling used by ``manage.py profile_startup``.
+
+``python -X importtime -m blog.startup_profile --path /api/posts/`` boots the
+application the way a WSGI worker does, serves one request (and a second one
+for comparison) through the full handler and prints the phase timings as JSON
+on stdout. ``parse_importtime`` and ``summarize_imports`` turn the
+interpreter's ``-X importtime`` report (stderr) into a breakdown.
+"""
+import argparse
+import io
+import json
+import re
+import sys
+import time
+from collections import defaultdict
+
+
+# Modules the API hot path must not import; they are loaded lazily on first use
+LAZY_MODULES = [
+    'dotenv',
+    'django.contrib.auth.admin',
+    'rest_framework.authtoken.admin',
+    'blog.async_views',
+]
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(report):
+    """Return ``(module, self_us, cumulative_us, depth)`` for each line of a report."""
+    imports = []
+    for line in report.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            depth = (len(indent) - 1) // 2
+            imports.append((module, int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def summarize_imports(imports, top=20):
+    """Total import time, the time per top-level package and the slowest modules."""
+    packages = defaultdict(int)
+    for module, self_us, _, _ in imports:
+        packages[module.split('.')[0]] += self_us
+    slowest_packages = sorted(packages.items(), key=lambda item: -item[1])[:top]
+    slowest_modules = sorted(imports, key=lambda item: -item[1])[:top]
+    return {
+        'total_ms': sum(self_us for _, self_us, _, _ in imports) / 1000,
+        'modules': len(imports),
+        'packages_ms': {
+            package: self_us / 1000 for package, self_us in slowest_packages
+        },
+        'slowest_ms': {
+            module: self_us / 1000 for module, self_us, _, _ in slowest_modules
+        },
+    }
+
+
+def wsgi_environ(path, host):
+    path, _, query = path.partition('?')
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SCRIPT_NAME': '',
+        'SERVER_NAME': host,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': host,
+        'HTTP_ACCEPT': 'application/json',
+        'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+
+
+def serve(application, path, host):
+    """Serve one GET request; return its status code and duration in ms."""
+    status = []
+    started = time.perf_counter()
+    result = application(
+        wsgi_environ(path, host), lambda code, headers, *args: status.append(code)
+    )
+    try:
+        for _ in result:
+            pass
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return int(status[0].split()[0]), (time.perf_counter() - started) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Boot the app and time its first request.'
+    )
+    parser.add_argument('--path', default='/api/posts/')
+    args = parser.parse_args(argv)
+
+    timings = {}
+    started = time.perf_counter()
+    import django
+    from django.conf import settings
+    django.setup()
+    timings['setup_ms'] = (time.perf_counter() - started) * 1000
+
+    phase_started = time.perf_counter()
+    from django.core.wsgi import get_wsgi_application
+    application = get_wsgi_application()
+    timings['wsgi_application_ms'] = (time.perf_counter() - phase_started) * 1000
+
+    host = next(
+        (
+            host
+            for host in settings.ALLOWED_HOSTS
+            if host != '*' and not host.startswith('.')
+        ),
+        'localhost',
+    )
+    status, timings['first_request_ms'] = serve(application, args.path, host)
+    timings['time_to_first_request_ms'] = (time.perf_counter() - started) * 1000
+    _, timings['second_request_ms'] = serve(application, args.path, host)
+
+    print(json.dumps({
+        'path': args.path,
+        'status': status,
+        'timings': timings,
+        'lazy_modules_loaded': [
+            module for module in LAZY_MODULES if module in sys.modules
+        ],
+    }))
+
+
+if __name__ == '__main__':
+    main()
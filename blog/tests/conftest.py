@@ -2,13 +2,24 @@
 Shared fixtures for blog API tests.
 """
 import pytest
+from contextlib import contextmanager
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APIClient
 from django.contrib.auth.models import User
+from blog.instrumentation import count_queries
 from blog.models import BlogPost, Comment
 import uuid
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start and end every test with an empty cache."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     """API client for testing."""
@@ -68,4 +79,36 @@ def multiple_posts(sample_user):
 @pytest.fixture
 def non_existent_uuid():
     """Non-existent UUID for testing."""
-    return str(uuid.uuid4()) 
\ No newline at end of file
+    return str(uuid.uuid4())
+
+
+@pytest.fixture
+def query_budget(request):
+    """
+    Context manager failing the test when its block runs too many SQL queries.
+
+    The budget is passed as an argument or declared on the test with
+    ``@pytest.mark.query_budget(n)``.
+    """
+    marker = request.node.get_closest_marker('query_budget')
+
+    @contextmanager
+    def _query_budget(max_queries=None):
+        if max_queries is None:
+            if marker is None:
+                pytest.fail(
+                    'No query budget: pass one or use @pytest.mark.query_budget(n).'
+                )
+            max_queries = marker.args[0]
+
+        with count_queries(capture=True) as counter:
+            yield counter
+
+        if counter.count > max_queries:
+            statements = '\n'.join(f'  {sql}' for sql in counter.statements)
+            pytest.fail(
+                f'{counter.count} queries exceeded the budget of {max_queries}:\n'
+                f'{statements}'
+            )
+
+    return _query_budget
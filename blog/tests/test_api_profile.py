@@ -0,0 +1,95 @@
+"""
+Tests for the API-only settings profile (settings/api.py).
+"""
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import Client
+from rest_framework.authtoken.models import Token
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from blog.middleware import FullStackMiddleware
+import settings.api as api_profile
+
+
+class ExceptionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        return self.get_response(request)
+    
+    def process_exception(self, request, exception):
+        return None
+
+
+@pytest.fixture
+def api_profile_settings(settings, monkeypatch):
+    settings.MIDDLEWARE = api_profile.MIDDLEWARE
+    settings.BLOG_FULL_STACK_MIDDLEWARE = api_profile.BLOG_FULL_STACK_MIDDLEWARE
+    settings.BLOG_LEAN_PATH_PREFIXES = api_profile.BLOG_LEAN_PATH_PREFIXES
+    settings.REST_FRAMEWORK = api_profile.REST_FRAMEWORK
+    # Views read their authentication classes when they are first imported
+    monkeypatch.setattr(
+        APIView, 'authentication_classes', api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    )
+    return settings
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('api_profile_settings')
+class TestApiProfile:
+    """Tests for the lean /api/ middleware chain and token-only authentication."""
+    
+    def test_api_skips_full_stack(self, sample_post):
+        """Test that API responses skip the session and clickjacking middleware."""
+        response = Client().get(f'/api/posts/{sample_post.id}/')
+        
+        assert response.status_code == 200
+        assert not hasattr(response.wsgi_request, 'session')
+        assert 'X-Frame-Options' not in response
+    
+    def test_admin_keeps_full_stack(self):
+        """Test that the admin still runs the full middleware stack."""
+        response = Client().get('/admin/')
+        
+        assert response.status_code == 302
+        assert hasattr(response.wsgi_request, 'session')
+        assert response['X-Frame-Options'] == 'DENY'
+    
+    def test_admin_enforces_csrf(self):
+        """Test that CSRF protection still applies outside the API."""
+        response = Client(enforce_csrf_checks=True).post(
+            '/admin/login/', {'username': 'admin', 'password': 'secret'}
+        )
+        
+        assert response.status_code == 403
+    
+    def test_token_authentication(self, sample_user):
+        """Test that token clients can write without CSRF tokens."""
+        token = Token.objects.create(user=sample_user)
+        
+        response = Client(enforce_csrf_checks=True).post(
+            '/api/posts/',
+            {'title': 'Lean post', 'content': 'Body.'},
+            HTTP_AUTHORIZATION=f'Token {token.key}',
+        )
+        
+        assert response.status_code == 201
+    
+    def test_session_authentication_disabled(self, sample_user):
+        """Test that session logins are not accepted by the API."""
+        client = Client()
+        client.force_login(sample_user)
+        
+        data = {'title': 'Session post', 'content': 'Body.'}
+        response = client.post('/api/posts/', data)
+        
+        assert response.status_code == 401
+    
+    def test_rejects_exception_middleware(self, settings):
+        """Test that middleware relying on process_exception cannot be wrapped."""
+        settings.BLOG_FULL_STACK_MIDDLEWARE = [f'{__name__}.ExceptionMiddleware']
+        
+        with pytest.raises(ImproperlyConfigured):
+            FullStackMiddleware(lambda request: HttpResponse())
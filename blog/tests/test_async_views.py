@@ -0,0 +1,115 @@
+"""
+Tests for the async (ASGI) read path.
+"""
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient, Client, override_settings
+from django.urls import include, path
+from rest_framework.authtoken.models import Token
+from blog.async_views import AsyncBlogPostDetailView, AsyncBlogPostListView
+from blog.models import BlogPost
+
+
+urlpatterns = [
+    path('api/posts/', AsyncBlogPostListView.as_view()),
+    path('api/posts/<uuid:id>/', AsyncBlogPostDetailView.as_view()),
+    path('', include('blog.urls')),
+]
+
+
+def sync_get(url, **extra):
+    response = Client().get(url, **extra)
+    cache.clear()
+    return response
+
+
+def async_get(url, headers=None):
+    async def get():
+        return await AsyncClient().get(url, headers=headers)
+    
+    with override_settings(ROOT_URLCONF=__name__):
+        return async_to_sync(get)()
+
+
+@pytest.mark.django_db
+class TestAsyncReadViews:
+    """The async views must answer exactly like the DRF views."""
+    
+    def test_detail_parity(self, sample_post_with_comments):
+        """Test that the async detail has the same body and ETag."""
+        url = f'/api/posts/{sample_post_with_comments.id}/'
+        
+        expected = sync_get(url)
+        response = async_get(url)
+        
+        assert response.status_code == 200
+        assert response.content == expected.content
+        assert response['ETag'] == expected['ETag']
+    
+    def test_list_parity_across_pages(self, sample_user):
+        """Test that the async list paginates like PageNumberPagination."""
+        for i in range(12):
+            BlogPost.objects.create(
+                title=f'Post {i}', content='Body.', author=sample_user
+            )
+        
+        for query in ['', '?page=2', '?page=last']:
+            expected = sync_get(f'/api/posts/{query}')
+            response = async_get(f'/api/posts/{query}')
+            
+            assert response.status_code == 200
+            assert response.content == expected.content
+    
+    def test_invalid_page(self, sample_post):
+        """Test that an out of range page is a JSON 404 like DRF's."""
+        expected = sync_get('/api/posts/?page=9')
+        response = async_get('/api/posts/?page=9')
+        
+        assert response.status_code == 404
+        assert response.json() == expected.json()
+    
+    def test_missing_post(self, non_existent_uuid):
+        """Test that an unknown post is a JSON 404 like DRF's."""
+        expected = sync_get(f'/api/posts/{non_existent_uuid}/')
+        response = async_get(f'/api/posts/{non_existent_uuid}/')
+        
+        assert response.status_code == 404
+        assert response.json() == expected.json()
+    
+    def test_shares_cache_and_validators(self, sample_post):
+        """Test that the async view serves what it cached and answers 304."""
+        url = f'/api/posts/{sample_post.id}/'
+        first = async_get(url)
+        
+        not_modified = async_get(url, headers={'If-None-Match': first['ETag']})
+        
+        assert not_modified.status_code == 304
+    
+    def test_writes_are_delegated(self, sample_user):
+        """Test that POST goes to the DRF view (with authentication and validation)."""
+        token = Token.objects.create(user=sample_user)
+        
+        async def post(headers=None):
+            return await AsyncClient().post(
+                '/api/posts/',
+                {'title': 'Async post', 'content': 'Body.'},
+                content_type='application/json',
+                headers=headers,
+            )
+        
+        with override_settings(ROOT_URLCONF=__name__):
+            response = async_to_sync(post)({'Authorization': f'Token {token.key}'})
+            anonymous = async_to_sync(post)()
+        
+        assert response.status_code == 201
+        assert response.json()['title'] == 'Async post'
+        assert anonymous.status_code == 403
+    
+    def test_queries_are_counted(self, sample_post_with_comments, settings):
+        """Test that QueryCountMiddleware sees the async ORM's queries."""
+        settings.DEBUG = True
+        
+        response = async_get(f'/api/posts/{sample_post_with_comments.id}/')
+        
+        assert response['X-DB-Query-Count'] == '2'
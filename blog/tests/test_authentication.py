@@ -0,0 +1,135 @@
+"""
+Tests for the cached token authentication backend.
+"""
+import pytest
+from django.core.cache import cache
+from rest_framework.authtoken.models import Token
+from blog.authentication import (
+    cache_token,
+    get_cached_token,
+    local_token_cache,
+    token_cache_key,
+)
+
+
+PROFILE_URL = '/api/auth/profile/'
+
+
+@pytest.fixture(autouse=True)
+def clear_local_token_cache():
+    local_token_cache.clear()
+    yield
+    local_token_cache.clear()
+
+
+@pytest.fixture
+def token(sample_user):
+    return Token.objects.create(user=sample_user)
+
+
+@pytest.fixture
+def token_client(api_client, token):
+    api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return api_client
+
+
+@pytest.mark.django_db
+class TestCachedTokenAuthentication:
+    """Tests for CachedTokenAuthentication."""
+    
+    def test_cached_requests_cost_no_queries(
+        self, token_client, sample_user, django_assert_num_queries
+    ):
+        """Test that only the first request looks the token up."""
+        with django_assert_num_queries(1):
+            token_client.get(PROFILE_URL)
+        
+        with django_assert_num_queries(0):
+            response = token_client.get(PROFILE_URL)
+        
+        assert response.status_code == 200
+        assert response.data['username'] == sample_user.username
+    
+    def test_cache_key_hides_token(self, token_client, token):
+        """Test that entries are keyed by a hash of the token."""
+        token_client.get(PROFILE_URL)
+        
+        assert cache.get(token_cache_key(token.key)) is not None
+        assert token.key not in token_cache_key(token.key)
+    
+    def test_cached_entry_has_no_password(
+        self, token_client, token, sample_user, settings
+    ):
+        """Test that password hashes never reach the shared or the local cache."""
+        settings.BLOG_AUTH_L1_TIMEOUT = 30
+        token_client.get(PROFILE_URL)
+        
+        key = token_cache_key(token.key)
+        for entry in [cache.get(key), local_token_cache.get(key)]:
+            assert entry['user']['id'] == sample_user.pk
+            assert 'password' not in entry['user']
+            assert 'last_login' not in entry['user']
+    
+    def test_cached_user_loads_password_on_demand(self, token, sample_user):
+        """Test that a user rebuilt from the cache still checks passwords."""
+        cache_token(token)
+        
+        user = get_cached_token(token.key).user
+        
+        assert user.get_deferred_fields() == {'password', 'last_login'}
+        assert user.check_password('testpass123')
+    
+    def test_invalid_token(self, api_client):
+        """Test that unknown tokens are rejected as before."""
+        api_client.credentials(HTTP_AUTHORIZATION='Token not-a-token')
+        
+        response = api_client.get(PROFILE_URL)
+        
+        assert response.status_code == 403
+        assert response.data['detail'] == 'Invalid token.'
+    
+    def test_deleted_token_is_rejected(self, token_client, token):
+        """Test that deleting (or regenerating) a token invalidates the cache."""
+        token_client.get(PROFILE_URL)
+        
+        token.delete()
+        
+        assert token_client.get(PROFILE_URL).status_code == 403
+    
+    def test_deactivated_user_is_rejected(self, token_client, sample_user):
+        """Test that deactivating a user invalidates their cached token."""
+        token_client.get(PROFILE_URL)
+        
+        sample_user.is_active = False
+        sample_user.save()
+        
+        response = token_client.get(PROFILE_URL)
+        assert response.status_code == 403
+        assert response.data['detail'] == 'User inactive or deleted.'
+    
+    def test_user_changes_are_visible(self, token_client, sample_user):
+        """Test that the cached user is refreshed when the user is saved."""
+        token_client.get(PROFILE_URL)
+        
+        sample_user.email = 'changed@example.com'
+        sample_user.save()
+        
+        assert token_client.get(PROFILE_URL).data['email'] == 'changed@example.com'
+    
+    def test_local_cache(self, token_client, settings, django_assert_num_queries):
+        """Test that the per-process cache serves tokens without the cache tier."""
+        settings.BLOG_AUTH_L1_TIMEOUT = 30
+        token_client.get(PROFILE_URL)
+        cache.clear()
+        
+        with django_assert_num_queries(0):
+            assert token_client.get(PROFILE_URL).status_code == 200
+    
+    def test_local_cache_invalidation(self, token_client, token, settings):
+        """Test that the signal handlers clear the per-process cache too."""
+        settings.BLOG_AUTH_L1_TIMEOUT = 30
+        token_client.get(PROFILE_URL)
+        
+        token.delete()
+        
+        assert token_client.get(PROFILE_URL).status_code == 403
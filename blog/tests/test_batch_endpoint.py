@@ -0,0 +1,165 @@
+"""
+Tests for the batch post detail endpoint.
+"""
+import time
+
+import pytest
+from rest_framework.test import APIClient
+from blog import fast_serializers
+from blog.cache_helpers import BlogCacheHelper
+
+
+URL = '/api/posts/batch/'
+
+
+def ids_param(*ids):
+    return {'ids': ','.join(str(post_id) for post_id in ids)}
+
+
+@pytest.mark.django_db
+class TestPostBatchEndpoint:
+    """Tests for GET /api/posts/batch/."""
+    
+    def test_returns_details_keyed_by_id(
+        self, api_client, sample_post_with_comments, multiple_posts
+    ):
+        """Test that each requested post is returned in the detail format."""
+        ids = [sample_post_with_comments.id, multiple_posts[0].id]
+        
+        response = api_client.get(URL, ids_param(*ids))
+        
+        assert response.status_code == 200
+        assert list(response.data['results']) == [str(post_id) for post_id in ids]
+        for post_id in ids:
+            expected = fast_serializers.get_post_detail(post_id)
+            assert response.data['results'][str(post_id)] == expected
+        assert response.data['not_found'] == []
+    
+    def test_reports_unknown_ids(self, api_client, sample_post, non_existent_uuid):
+        """Test that unknown ids are listed as not found."""
+        response = api_client.get(URL, ids_param(sample_post.id, non_existent_uuid))
+        
+        assert list(response.data['results']) == [str(sample_post.id)]
+        assert response.data['not_found'] == [non_existent_uuid]
+    
+    def test_misses_are_loaded_together_and_backfilled(
+        self, api_client, multiple_posts, django_assert_num_queries
+    ):
+        """Test that misses cost one post and one comments query, then are cached."""
+        ids = [post.id for post in multiple_posts]
+        
+        with django_assert_num_queries(2):
+            api_client.get(URL, ids_param(*ids))
+        
+        assert set(BlogCacheHelper.get_post_details(ids)) == set(ids)
+        with django_assert_num_queries(0):
+            response = api_client.get(URL, ids_param(*ids))
+        assert len(response.data['results']) == len(ids)
+    
+    def test_uses_details_cached_by_detail_endpoint(
+        self, api_client, sample_post, multiple_posts, django_assert_num_queries
+    ):
+        """Test that the batch and detail endpoints share cached details."""
+        api_client.get(f'/api/posts/{sample_post.id}/')
+        
+        with django_assert_num_queries(2):
+            api_client.get(URL, ids_param(sample_post.id, multiple_posts[0].id))
+        with django_assert_num_queries(0):
+            detail = api_client.get(f'/api/posts/{multiple_posts[0].id}/')
+        assert detail.status_code == 200
+    
+    def test_last_modified_is_when_details_were_cached(
+        self, api_client, sample_post, sample_user, monkeypatch
+    ):
+        """Test that If-Modified-Since sees changes missing from the timestamps."""
+        last_modified = api_client.get(URL, ids_param(sample_post.id))['Last-Modified']
+        unchanged = api_client.get(
+            URL, ids_param(sample_post.id), HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        
+        sample_user.username = 'renamed'
+        sample_user.save()
+        now = time.time()
+        monkeypatch.setattr(time, 'time', lambda: now + 10)
+        response = api_client.get(
+            URL, ids_param(sample_post.id), HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        
+        assert unchanged.status_code == 304
+        assert response.status_code == 200
+        detail = response.data['results'][str(sample_post.id)]
+        assert detail['author']['username'] == 'renamed'
+    
+    def test_invalid_and_missing_ids(self, api_client):
+        """Test that malformed ids are rejected."""
+        invalid = api_client.get(URL, {'ids': 'not-a-uuid'})
+        missing = api_client.get(URL)
+        
+        assert invalid.status_code == 400
+        assert 'ids' in invalid.data
+        assert missing.status_code == 400
+    
+    def test_max_batch_size(self, api_client, multiple_posts, settings):
+        """Test that batches over BLOG_BATCH_MAX_SIZE are rejected."""
+        settings.BLOG_BATCH_MAX_SIZE = 2
+        
+        response = api_client.get(URL, ids_param(*[post.id for post in multiple_posts]))
+        
+        assert response.status_code == 400
+    
+    def test_duplicate_ids_count_once(self, api_client, sample_post):
+        """Test that repeated ids are returned once."""
+        response = api_client.get(URL, ids_param(sample_post.id, sample_post.id))
+        
+        assert list(response.data['results']) == [str(sample_post.id)]
+    
+    def test_edge_cache_headers(self, api_client, sample_post, sample_user):
+        """Test that batch responses are tagged with every post and author."""
+        response = api_client.get(URL, ids_param(sample_post.id))
+        
+        assert response['Surrogate-Key'].split() == [
+            f'post-{sample_post.id}', f'author-{sample_user.id}'
+        ]
+        assert 'ETag' in response
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+class TestPostBatchReplicaFreshness:
+    """Tests for backfilling the detail cache while a replica lags."""
+    
+    def test_backfill_after_write_reads_primary(
+        self, api_client, sample_post, sample_user, settings
+    ):
+        """Test that misses right after a write are not backfilled from the replica."""
+        settings.DATABASE_REPLICAS = ['replica']
+        author = APIClient()
+        author.force_authenticate(user=sample_user)
+        url = f'/api/posts/{sample_post.id}/comments/'
+        response = author.post(url, {'content': 'Fresh comment.'}, format='json')
+        assert response.status_code == 201
+        
+        response = api_client.get(URL, ids_param(sample_post.id))
+        
+        assert response.data['not_found'] == []
+        cached = BlogCacheHelper.get_post_detail(sample_post.id)
+        comments = [comment['content'] for comment in cached['comments']]
+        assert comments == ['Fresh comment.']
+    
+    def test_replica_read_is_not_backfilled_after_invalidation(
+        self, api_client, sample_post, settings, monkeypatch
+    ):
+        """Test that a replica read overtaken by an invalidation is not cached."""
+        stale = fast_serializers.get_post_detail(sample_post.id)
+        settings.DATABASE_REPLICAS = ['replica']
+        
+        def read_then_invalidate(post_ids):
+            # The replica returns its rows, then a write lands on the primary
+            BlogCacheHelper.invalidate_post_detail(sample_post.id)
+            return {sample_post.id: stale}
+        
+        monkeypatch.setattr(fast_serializers, 'get_post_details', read_then_invalidate)
+        
+        response = api_client.get(URL, ids_param(sample_post.id))
+        
+        assert list(response.data['results']) == [str(sample_post.id)]
+        assert BlogCacheHelper.get_post_detail(sample_post.id) is None
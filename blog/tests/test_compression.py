@@ -0,0 +1,151 @@
+"""
+Tests for response compression.
+"""
+import gzip
+
+import pytest
+from django.http import HttpResponse
+from blog import compression, middleware
+from blog.compression import negotiate_encoding
+from blog.models import Comment
+
+
+@pytest.fixture
+def large_post(sample_post, sample_user):
+    Comment.objects.bulk_create(
+        Comment(
+            post=sample_post,
+            author=sample_user,
+            content=f'A fairly long comment number {i}.',
+        )
+        for i in range(50)
+    )
+    return sample_post
+
+
+@pytest.fixture
+def compress_calls(monkeypatch):
+    calls = []
+    
+    def counting_compress(content, encoding):
+        calls.append(encoding)
+        return compression.compress(content, encoding)
+    
+    monkeypatch.setattr(middleware, 'compress', counting_compress)
+    return calls
+
+
+class TestNegotiateEncoding:
+    """Tests for Accept-Encoding negotiation."""
+    
+    def test_gzip(self):
+        """Test that gzip is chosen when accepted."""
+        assert negotiate_encoding('gzip, deflate') == 'gzip'
+    
+    def test_missing_or_unsupported(self):
+        """Test that nothing is chosen without a supported coding."""
+        assert negotiate_encoding('') is None
+        assert negotiate_encoding('deflate, identity') is None
+    
+    def test_zero_quality_is_refused(self):
+        """Test that q=0 excludes a coding, also through the wildcard."""
+        assert negotiate_encoding('gzip;q=0, *') is None
+        assert negotiate_encoding('*;q=0') is None
+    
+    def test_brotli_preferred_when_available(self, monkeypatch):
+        """Test that brotli wins ties but respects lower quality values."""
+        monkeypatch.setattr(compression, 'available_encodings', lambda: ['br', 'gzip'])
+        
+        assert negotiate_encoding('gzip, br') == 'br'
+        assert negotiate_encoding('gzip, br;q=0.5') == 'gzip'
+    
+    def test_brotli_roundtrip(self):
+        """Test brotli compression when the package is installed."""
+        brotli = pytest.importorskip('brotli')
+        
+        body = b'{"a": 1}' * 100
+        assert brotli.decompress(compression.compress(body, 'br')) == body
+
+
+@pytest.mark.django_db
+class TestCompressionMiddleware:
+    """Tests for CompressionMiddleware."""
+    
+    def test_large_json_is_gzipped(self, api_client, large_post):
+        """Test that a large detail response is gzipped and decodes to the same JSON."""
+        url = f'/api/posts/{large_post.id}/'
+        plain = api_client.get(url)
+        response = api_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        assert int(response['Content-Length']) == len(response.content)
+        assert gzip.decompress(response.content) == plain.content
+    
+    def test_not_compressed_without_accept_encoding(self, api_client, large_post):
+        """Test that clients that do not ask for compression get plain JSON."""
+        response = api_client.get(f'/api/posts/{large_post.id}/')
+        
+        assert not response.has_header('Content-Encoding')
+        assert 'Accept-Encoding' in response['Vary']
+    
+    def test_small_responses_are_not_compressed(
+        self, api_client, sample_post, settings
+    ):
+        """Test that bodies under the minimum size are sent as is."""
+        settings.BLOG_COMPRESSION_MIN_SIZE = 100_000
+        
+        response = api_client.get(
+            f'/api/posts/{sample_post.id}/', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        
+        assert not response.has_header('Content-Encoding')
+    
+    def test_etag_is_weakened_and_still_validates(self, api_client, large_post):
+        """Test that the compressed response has a weak ETag usable for revalidation."""
+        url = f'/api/posts/{large_post.id}/'
+        response = api_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        
+        assert response['ETag'].startswith('W/"')
+        
+        not_modified = api_client.get(
+            url,
+            HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        assert not_modified.status_code == 304
+    
+    def test_cached_responses_are_compressed_once(
+        self, api_client, large_post, compress_calls
+    ):
+        """Test that the compressed variant of a cached response is reused."""
+        url = f'/api/posts/{large_post.id}/'
+        
+        first = api_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        second = api_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        
+        assert compress_calls == ['gzip']
+        assert second.content == first.content
+    
+    def test_cached_variant_follows_content_changes(
+        self, api_client, large_post, sample_user, compress_calls
+    ):
+        """Test that a new comment produces a freshly compressed body."""
+        url = f'/api/posts/{large_post.id}/'
+        api_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        api_client.force_authenticate(user=sample_user)
+        api_client.post(url + 'comments/', {'content': 'One more comment.'})
+        
+        response = api_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        
+        assert compress_calls == ['gzip', 'gzip']
+        assert b'One more comment.' in gzip.decompress(response.content)
+    
+    def test_non_json_responses_are_not_compressed(self, rf):
+        """Test that only JSON API responses are compressed."""
+        html = HttpResponse('<p>Hello</p>' * 1000, content_type='text/html')
+        compress_html = middleware.CompressionMiddleware(lambda request: html)
+        
+        response = compress_html(rf.get('/', HTTP_ACCEPT_ENCODING='gzip'))
+        
+        assert not response.has_header('Content-Encoding')
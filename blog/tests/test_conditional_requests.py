@@ -0,0 +1,134 @@
+"""
+Tests for ETag / Last-Modified conditional GETs.
+"""
+import time
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from blog.models import BlogPost
+
+
+@pytest.mark.django_db
+class TestPostDetailConditionalGet:
+    """Tests for validators on GET /api/posts/{id}."""
+    
+    def test_detail_has_validators(self, api_client, sample_post):
+        """Test that the detail response carries ETag and Last-Modified."""
+        url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        response = api_client.get(url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'].startswith('"')
+        assert 'Last-Modified' in response
+    
+    def test_cached_and_fresh_etags_match(self, api_client, sample_post):
+        """Test that the ETag is stable between a miss and a cache hit."""
+        url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        
+        first = api_client.get(url)
+        second = api_client.get(url)
+        
+        assert first['ETag'] == second['ETag']
+    
+    @pytest.mark.query_budget(0)
+    def test_if_none_match_returns_304_without_queries(
+        self, api_client, sample_post, query_budget
+    ):
+        """Test that a matching If-None-Match is answered from cache metadata."""
+        url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        etag = api_client.get(url)['ETag']
+        
+        with query_budget():
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert not response.content
+    
+    def test_if_modified_since_returns_304(self, api_client, sample_post):
+        """Test that an up to date If-Modified-Since returns 304."""
+        url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        last_modified = api_client.get(url)['Last-Modified']
+        
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    
+    def test_author_rename_moves_last_modified(
+        self, api_client, sample_post, sample_user, monkeypatch
+    ):
+        """Test that If-Modified-Since is not answered with a stale body."""
+        url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        last_modified = api_client.get(url)['Last-Modified']
+        
+        sample_user.username = 'renamed'
+        sample_user.save()
+        # Regenerated later than the first response (HTTP dates are in seconds)
+        now = time.time()
+        monkeypatch.setattr(time, 'time', lambda: now + 10)
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['author']['username'] == 'renamed'
+        assert response['Last-Modified'] != last_modified
+    
+    def test_new_comment_changes_etag(self, api_client, sample_post, sample_user):
+        """Test that a stale ETag gets the full, updated response."""
+        url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        etag = api_client.get(url)['ETag']
+        
+        api_client.force_authenticate(user=sample_user)
+        api_client.post(
+            reverse('blog:comment-create', kwargs={'post_id': sample_post.id}),
+            {'content': 'A new comment.'},
+            format='json'
+        )
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+        assert len(response.data['comments']) == 1
+
+
+@pytest.mark.django_db
+class TestPostsListConditionalGet:
+    """Tests for validators and caching on GET /api/posts."""
+    
+    def test_list_if_none_match_returns_304(self, api_client, multiple_posts):
+        """Test that the list honours If-None-Match."""
+        url = reverse('blog:post-list-create')
+        etag = api_client.get(url)['ETag']
+        
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    
+    def test_list_pages_are_cached_separately(self, api_client, sample_user):
+        """Test that each page has its own cache entry and ETag."""
+        for i in range(12):
+            BlogPost.objects.create(
+                title=f'Post {i}', content='Content.', author=sample_user
+            )
+        url = reverse('blog:post-list-create')
+        
+        first_page = api_client.get(url)
+        second_page = api_client.get(url, {'page': 2})
+        
+        assert len(first_page.data['results']) == 10
+        assert len(second_page.data['results']) == 2
+        assert first_page['ETag'] != second_page['ETag']
+    
+    def test_new_post_invalidates_every_page(
+        self, api_client, sample_user, multiple_posts
+    ):
+        """Test that creating a post invalidates cached list pages."""
+        url = reverse('blog:post-list-create')
+        etag = api_client.get(url)['ETag']
+        
+        api_client.force_authenticate(user=sample_user)
+        api_client.post(url, {'title': 'Newest', 'content': 'Content.'}, format='json')
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 4
@@ -0,0 +1,207 @@
+"""
+Tests for Cache-Control / Surrogate-Key headers and edge cache purging.
+"""
+import threading
+from unittest import mock
+
+import pytest
+from blog import edge_cache
+from blog.edge_cache import HTTPPurger, get_purger
+
+
+@pytest.fixture(autouse=True)
+def clear_purger():
+    get_purger().clear()
+
+
+@pytest.fixture
+def purged():
+    return get_purger().purged
+
+
+@pytest.mark.django_db
+class TestEdgeCacheHeaders:
+    """Tests for the headers on public read responses."""
+    
+    def test_detail_headers(self, api_client, sample_post_with_comments, sample_user):
+        """Test Cache-Control and the post/author surrogate keys on a post detail."""
+        response = api_client.get(f'/api/posts/{sample_post_with_comments.id}/')
+        
+        assert response['Cache-Control'] == (
+            'public, max-age=0, s-maxage=60, stale-while-revalidate=30'
+        )
+        assert response['Surrogate-Key'].split() == [
+            f'post-{sample_post_with_comments.id}', f'author-{sample_user.id}'
+        ]
+    
+    def test_list_headers(self, api_client, sample_post, sample_user):
+        """Test the list and author surrogate keys on the posts list."""
+        response = api_client.get('/api/posts/')
+        
+        assert 'public' in response['Cache-Control']
+        keys = response['Surrogate-Key'].split()
+        assert keys == ['posts', f'author-{sample_user.id}']
+    
+    def test_headers_on_cached_and_not_modified_responses(
+        self, api_client, sample_post
+    ):
+        """Test that cache hits and 304s carry the same headers."""
+        url = f'/api/posts/{sample_post.id}/'
+        first = api_client.get(url)
+        cached = api_client.get(url)
+        not_modified = api_client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        
+        assert not_modified.status_code == 304
+        for response in (cached, not_modified):
+            assert response['Cache-Control'] == first['Cache-Control']
+            assert response['Surrogate-Key'] == first['Surrogate-Key']
+    
+    def test_configurable_directives(self, api_client, sample_post, settings):
+        """Test that s-maxage and stale-while-revalidate can be turned off."""
+        settings.BLOG_CACHE_CONTROL_MAX_AGE = 10
+        settings.BLOG_CACHE_CONTROL_S_MAXAGE = 0
+        settings.BLOG_CACHE_CONTROL_STALE_WHILE_REVALIDATE = 0
+        
+        response = api_client.get(f'/api/posts/{sample_post.id}/')
+        
+        assert response['Cache-Control'] == 'public, max-age=10'
+
+
+@pytest.mark.django_db
+class TestPurgeOnWrite:
+    """Tests that writes purge the affected surrogate keys after commit."""
+    
+    def test_create_post_purges_list(
+        self, api_client, sample_user, purged, django_capture_on_commit_callbacks
+    ):
+        """Test that creating a post purges the posts list."""
+        api_client.force_authenticate(user=sample_user)
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post('/api/posts/', {'title': 'New', 'content': 'Body.'})
+        
+        assert purged == [['posts']]
+    
+    def test_bulk_create_purges_list_once(
+        self, api_client, sample_user, purged, django_capture_on_commit_callbacks
+    ):
+        """Test that a bulk create purges the posts list once."""
+        api_client.force_authenticate(user=sample_user)
+        payload = [{'title': f'Post {i}', 'content': 'Body.'} for i in range(3)]
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post('/api/posts/bulk/', payload, format='json')
+        
+        assert purged == [['posts']]
+    
+    def test_create_comment_purges_post_and_list(
+        self,
+        api_client,
+        sample_post,
+        sample_user,
+        purged,
+        django_capture_on_commit_callbacks,
+    ):
+        """Test that a new comment purges its post and the posts list."""
+        api_client.force_authenticate(user=sample_user)
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(
+                f'/api/posts/{sample_post.id}/comments/', {'content': 'Nice post!'}
+            )
+        
+        assert purged == [[f'post-{sample_post.id}', 'posts']]
+    
+    def test_author_rename_purges_author(
+        self, sample_user, purged, django_capture_on_commit_callbacks
+    ):
+        """Test that renaming a user purges every response showing them."""
+        sample_user.username = 'renamed'
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            sample_user.save()
+        
+        assert purged == [[f'author-{sample_user.id}']]
+    
+    def test_no_purge_before_commit(
+        self, api_client, sample_user, purged, django_capture_on_commit_callbacks
+    ):
+        """Test that nothing is purged until the transaction commits."""
+        api_client.force_authenticate(user=sample_user)
+        
+        with django_capture_on_commit_callbacks() as callbacks:
+            api_client.post('/api/posts/', {'title': 'New', 'content': 'Body.'})
+        
+        assert purged == []
+        assert len(callbacks) == 1
+
+
+class TestHTTPPurger:
+    """Tests for HTTPPurger."""
+    
+    def test_sends_surrogate_keys(self, settings):
+        """Test the purge request sent to the configured endpoint."""
+        settings.BLOG_PURGE_URL = 'https://api.fastly.com/service/abc/purge'
+        settings.BLOG_PURGE_TOKEN = 'secret'
+        purger = HTTPPurger()
+        
+        with mock.patch('urllib.request.urlopen') as urlopen:
+            purger.purge(['posts', 'post-1'])
+            purger.flush()
+        
+        request = urlopen.call_args.args[0]
+        assert request.full_url == settings.BLOG_PURGE_URL
+        assert request.get_method() == 'POST'
+        assert request.get_header('Surrogate-key') == 'posts post-1'
+        assert request.get_header('Fastly-key') == 'secret'
+    
+    def test_failures_are_logged_not_raised(self, settings, caplog):
+        """Test that an unreachable purge endpoint does not fail the write."""
+        settings.BLOG_PURGE_URL = 'http://127.0.0.1:9/purge'
+        purger = HTTPPurger()
+        
+        with mock.patch('urllib.request.urlopen', side_effect=OSError('refused')):
+            purger.purge(['posts'])
+            purger.flush()
+        
+        assert 'Purging surrogate keys posts failed' in caplog.text
+    
+    def test_purge_does_not_wait_for_the_endpoint(self, settings):
+        """Test that purges queue while a call is in flight and go out merged."""
+        settings.BLOG_PURGE_URL = 'https://api.fastly.com/service/abc/purge'
+        purger = HTTPPurger()
+        sending = threading.Event()
+        release = threading.Event()
+        sent = []
+        
+        def slow_urlopen(request, timeout):
+            sent.append(request.get_header('Surrogate-key'))
+            sending.set()
+            assert release.wait(5)
+            return mock.MagicMock()
+        
+        with mock.patch('urllib.request.urlopen', side_effect=slow_urlopen):
+            purger.purge(['post-1'])
+            assert sending.wait(5)
+            purger.purge(['posts', 'post-2'])
+            purger.purge(['posts', 'author-3'])
+            assert sent == ['post-1']
+            release.set()
+            purger.flush()
+        
+        assert sent == ['post-1', 'posts post-2 author-3']
+    
+    def test_large_purges_are_split(self, settings, monkeypatch):
+        """Test that no call carries more keys than the endpoint accepts."""
+        settings.BLOG_PURGE_URL = 'https://api.fastly.com/service/abc/purge'
+        monkeypatch.setattr(edge_cache, 'MAX_KEYS_PER_PURGE', 2)
+        purger = HTTPPurger()
+        
+        with mock.patch('urllib.request.urlopen') as urlopen:
+            purger.purge(['posts', 'post-1', 'post-2'])
+            purger.flush()
+        
+        keys = [
+            call.args[0].get_header('Surrogate-key') for call in urlopen.call_args_list
+        ]
+        assert keys == ['posts post-1', 'post-2']
@@ -0,0 +1,109 @@
+"""
+Tests for the streaming NDJSON export endpoint.
+"""
+import json
+
+import pytest
+from django.db import connections
+from blog import fast_serializers
+from blog.exports import export_limit
+
+
+URL = '/api/posts/export/'
+
+
+def read_lines(response):
+    content = b''.join(response.streaming_content)
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+@pytest.fixture
+def authenticated_client(api_client, sample_user):
+    api_client.force_authenticate(user=sample_user)
+    return api_client
+
+
+@pytest.mark.django_db
+class TestPostExportEndpoint:
+    """Tests for GET /api/posts/export/."""
+    
+    def test_requires_authentication(self, api_client):
+        """Test that anonymous clients cannot export."""
+        response = api_client.get(URL)
+        
+        assert response.status_code == 403
+    
+    def test_streams_every_post_as_ndjson(
+        self, authenticated_client, multiple_posts, settings
+    ):
+        """Test that all posts are streamed, one JSON object per line, across chunks."""
+        settings.BLOG_EXPORT_CHUNK_SIZE = 2
+        
+        response = authenticated_client.get(URL)
+        
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = read_lines(response)
+        expected = sorted(str(post.id) for post in multiple_posts)
+        assert sorted(line['id'] for line in lines) == expected
+        assert all('comments' not in line for line in lines)
+    
+    def test_with_comments(self, authenticated_client, sample_post_with_comments):
+        """Test that ?comments=true embeds comments like the detail endpoint."""
+        response = authenticated_client.get(URL, {'comments': 'true'})
+        
+        [line] = read_lines(response)
+        expected = fast_serializers.get_post_detail(sample_post_with_comments.id)
+        assert line == expected
+        assert len(line['comments']) == 2
+    
+    def test_one_comments_query_per_chunk(
+        self, authenticated_client, multiple_posts, settings, django_assert_num_queries
+    ):
+        """Test that comments are fetched once per chunk of posts, not per post."""
+        settings.BLOG_EXPORT_CHUNK_SIZE = 2
+        response = authenticated_client.get(URL, {'comments': 'true'})
+        
+        # 3 posts in chunks of 2: one cursor over the posts and one comments
+        # query for each of the two chunks
+        with django_assert_num_queries(3):
+            assert len(read_lines(response)) == len(multiple_posts)
+    
+    def test_keyset_pagination_without_server_side_cursors(
+        self, authenticated_client, multiple_posts, settings, monkeypatch
+    ):
+        """Test the primary key pagination used behind transaction pooling."""
+        settings.BLOG_EXPORT_CHUNK_SIZE = 2
+        monkeypatch.setitem(
+            connections['default'].settings_dict, 'DISABLE_SERVER_SIDE_CURSORS', True
+        )
+        
+        lines = read_lines(authenticated_client.get(URL))
+        
+        expected = sorted(str(post.id) for post in multiple_posts)
+        assert [line['id'] for line in lines] == expected
+    
+    def test_concurrency_limit(self, authenticated_client, sample_post, settings):
+        """Test that exports beyond the limit get 429 until a slot is released."""
+        settings.BLOG_EXPORT_MAX_CONCURRENCY = 1
+        
+        first = authenticated_client.get(URL)
+        second = authenticated_client.get(URL)
+        
+        assert second.status_code == 429
+        
+        read_lines(first)
+        first.close()
+        third = authenticated_client.get(URL)
+        assert third.status_code == 200
+        read_lines(third)
+        assert export_limit.active == 0
+    
+    def test_slot_released_when_closed_early(self, authenticated_client, sample_post):
+        """Test that a client disconnecting mid-stream frees its slot."""
+        response = authenticated_client.get(URL)
+        
+        response.close()
+        
+        assert export_limit.active == 0
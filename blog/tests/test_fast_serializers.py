@@ -0,0 +1,83 @@
+"""
+Parity tests for the fast read-path serializers.
+"""
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from blog import fast_serializers
+from blog.models import Comment, PostSummary
+from blog.serializers import BlogPostDetailSerializer, PostSummarySerializer
+from blog.views import BlogPostDetailView
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+def drf_post_detail(post):
+    post = BlogPostDetailView.queryset.get(id=post.id)
+    return BlogPostDetailSerializer(post).data
+
+
+@pytest.mark.django_db
+class TestFastSerializerParity:
+    """Fast serializers must render byte for byte like the DRF serializers."""
+    
+    def test_post_detail_with_comments(self, sample_post_with_comments):
+        """Test parity for a post with comments."""
+        fast = fast_serializers.get_post_detail(sample_post_with_comments.id)
+        
+        assert render(fast) == render(drf_post_detail(sample_post_with_comments))
+    
+    def test_post_detail_without_comments(self, sample_post):
+        """Test parity for a post without comments."""
+        fast = fast_serializers.get_post_detail(sample_post.id)
+        
+        assert render(fast) == render(drf_post_detail(sample_post))
+    
+    def test_post_detail_unicode_and_microseconds(self, sample_post, sample_user):
+        """Test parity with non-ASCII content and sub-second timestamps."""
+        comment = Comment.objects.create(
+            post=sample_post, author=sample_user, content='Olá, ação ✓'
+        )
+        Comment.objects.filter(id=comment.id).update(
+            created_at=timezone.now().replace(microsecond=0)
+        )
+        
+        fast = fast_serializers.get_post_detail(sample_post.id)
+        
+        assert render(fast) == render(drf_post_detail(sample_post))
+    
+    @override_settings(TIME_ZONE='America/Sao_Paulo')
+    def test_post_detail_non_utc_time_zone(self, sample_post_with_comments):
+        """Test parity when timestamps are rendered with an offset."""
+        fast = fast_serializers.get_post_detail(sample_post_with_comments.id)
+        
+        assert fast['created_at'].endswith('-03:00')
+        assert render(fast) == render(drf_post_detail(sample_post_with_comments))
+    
+    def test_post_summary(self, sample_post_with_comments):
+        """Test parity for the posts list representation."""
+        summary = PostSummary.objects.get(post=sample_post_with_comments)
+        row = PostSummary.objects.filter(pk=summary.pk).values(
+            *fast_serializers.POST_SUMMARY_FIELDS
+        ).get()
+        
+        fast = fast_serializers.post_summary_from_row(row)
+        
+        assert render(fast) == render(PostSummarySerializer(summary).data)
+    
+    def test_missing_post_returns_none(self, non_existent_uuid):
+        """Test that unknown posts are reported as None."""
+        assert fast_serializers.get_post_detail(non_existent_uuid) is None
+    
+    def test_get_post_details_many(self, sample_post_with_comments, multiple_posts):
+        """Test fetching several details keyed by post id."""
+        ids = [sample_post_with_comments.id, multiple_posts[0].id]
+        
+        details = fast_serializers.get_post_details(ids)
+        
+        assert set(details) == set(ids)
+        assert len(details[sample_post_with_comments.id]['comments']) == 2
+        assert details[multiple_posts[0].id]['comments'] == []
@@ -0,0 +1,88 @@
+"""
+Tests for the gunicorn configuration and the worker warm-up it runs.
+"""
+import gc
+import runpy
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from blog import warmup
+
+
+CONF_PATH = Path(__file__).resolve().parents[2] / 'gunicorn.conf.py'
+
+
+def load_conf(monkeypatch, **env):
+    for name in [
+        'GUNICORN_WORKERS',
+        'WEB_CONCURRENCY',
+        'GUNICORN_THREADS',
+        'GUNICORN_MAX_REQUESTS',
+    ]:
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(str(CONF_PATH))
+
+
+class TestGunicornConf:
+    """Tests for gunicorn.conf.py."""
+    
+    def test_auto_sizing(self, monkeypatch):
+        """Test that workers follow the CPU count and threads select gthread."""
+        conf = load_conf(monkeypatch)
+        
+        assert conf['workers'] == conf['available_cpus']() + 1
+        assert conf['threads'] == 4
+        assert conf['worker_class'] == 'gthread'
+        assert conf['preload_app'] is True
+        assert conf['max_requests_jitter'] == conf['max_requests'] // 10
+    
+    def test_environment_overrides(self, monkeypatch):
+        """Test that the environment overrides the computed values."""
+        conf = load_conf(
+            monkeypatch, WEB_CONCURRENCY='3', GUNICORN_THREADS='1',
+            GUNICORN_MAX_REQUESTS='500', GUNICORN_PRELOAD='False',
+        )
+        
+        assert conf['workers'] == 3
+        assert conf['worker_class'] == 'sync'
+        assert conf['max_requests_jitter'] == 50
+        assert conf['preload_app'] is False
+    
+    def test_pre_fork_freezes_objects(self, monkeypatch):
+        """Test that objects created before the fork go to the permanent generation."""
+        conf = load_conf(monkeypatch)
+        try:
+            conf['pre_fork'](None, None)
+            assert gc.get_freeze_count() > 0
+        finally:
+            gc.unfreeze()
+    
+    def test_on_starting_clears_metrics_files(self, monkeypatch, tmp_path):
+        """Test that metrics files left by a previous run are removed at start-up."""
+        (tmp_path / 'counter_1234.db').write_bytes(b'stale')
+        conf = load_conf(monkeypatch, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+        
+        conf['on_starting'](None)
+        
+        assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.django_db
+class TestWarmup:
+    """Tests for blog.warmup."""
+    
+    @pytest.mark.parametrize('conn_max_age, opened', [(60, True), (0, False)])
+    def test_warm_connections(self, monkeypatch, conn_max_age, opened):
+        """Test that only persistent database connections are opened in advance."""
+        calls = []
+        monkeypatch.setitem(connection.settings_dict, 'CONN_MAX_AGE', conn_max_age)
+        monkeypatch.setattr(
+            connection, 'ensure_connection', lambda: calls.append(connection.alias)
+        )
+        
+        warmup.warm_connections()
+        
+        assert (connection.alias in calls) is opened
@@ -0,0 +1,101 @@
+"""
+Tests for the liveness and readiness probes.
+"""
+import pytest
+from blog import health
+from blog.health import readiness_probe
+
+
+@pytest.fixture(autouse=True)
+def fresh_probe():
+    readiness_probe.reset()
+    yield
+    readiness_probe.reset()
+
+
+def failing_check():
+    raise ConnectionError('connection refused')
+
+
+@pytest.mark.django_db
+class TestLiveness:
+    """Test cases for /healthz"""
+    
+    def test_healthz_does_no_io(self, api_client, django_assert_num_queries):
+        """Test that liveness answers without touching the database"""
+        with django_assert_num_queries(0):
+            response = api_client.get('/healthz')
+        
+        assert response.status_code == 200
+        assert response.json() == {'status': 'ok'}
+        assert response['Cache-Control'] == 'no-store'
+    
+    def test_healthz_ignores_host_validation(self, api_client, settings):
+        """Test that probes by IP are answered even when the host is not allowed"""
+        settings.ALLOWED_HOSTS = ['blog.example.com']
+        
+        response = api_client.get('/healthz', HTTP_HOST='10.0.0.7')
+        
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestReadiness:
+    """Test cases for /readyz"""
+    
+    def test_readyz_reports_ok(self, api_client):
+        """Test that readiness reports every dependency check"""
+        response = api_client.get('/readyz')
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data['status'] == health.READY
+        assert set(data['checks']) == {'database', 'cache'}
+        assert all(check['ok'] for check in data['checks'].values())
+    
+    def test_readyz_reuses_result_within_interval(
+        self, api_client, django_assert_num_queries
+    ):
+        """Test that repeated probes do not re-run the checks"""
+        api_client.get('/readyz')
+        
+        with django_assert_num_queries(0):
+            response = api_client.get('/readyz/')
+        
+        assert response.status_code == 200
+    
+    def test_readyz_refreshes_after_interval(
+        self, api_client, settings, django_assert_num_queries
+    ):
+        """Test that the checks run again once the interval has passed"""
+        settings.BLOG_READINESS_INTERVAL = 0
+        api_client.get('/readyz')
+        
+        with django_assert_num_queries(1):
+            api_client.get('/readyz')
+    
+    def test_cache_failure_is_degraded(self, api_client, monkeypatch, caplog):
+        """Test that a broken cache keeps the instance in rotation"""
+        monkeypatch.setitem(health.CHECKS, 'cache', failing_check)
+        
+        with caplog.at_level('ERROR', logger='blog.health'):
+            response = api_client.get('/readyz')
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data['status'] == health.DEGRADED
+        assert data['checks']['cache'] == {
+            'ok': False,
+            'duration_ms': data['checks']['cache']['duration_ms'],
+        }
+        assert 'connection refused' not in response.content.decode()
+        assert 'connection refused' in caplog.text
+    
+    def test_database_failure_is_unavailable(self, api_client, monkeypatch):
+        """Test that a broken database takes the instance out of rotation"""
+        monkeypatch.setitem(health.CHECKS, 'database', failing_check)
+        
+        response = api_client.get('/readyz')
+        
+        assert response.status_code == 503
+        assert response.json()['status'] == health.UNAVAILABLE
@@ -0,0 +1,138 @@
+"""
+Tests for queue-based JSON logging and request IDs.
+"""
+import json
+import logging
+
+import pytest
+from blog.log_handlers import (
+    JSONFormatter, QueueLoggingHandler, RequestIDFilter, dropped_records
+)
+
+
+class CapturingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+    
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+@pytest.fixture
+def queue_logger():
+    created = []
+    
+    def make(queue_size=100):
+        target = CapturingHandler()
+        handler = QueueLoggingHandler(target, queue_size=queue_size)
+        handler.setFormatter(JSONFormatter())
+        handler.addFilter(RequestIDFilter())
+        logger = logging.getLogger(f'blog.tests.queue{len(created)}')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(handler)
+        created.append((logger, handler))
+        return logger, handler, target
+    
+    yield make
+    for logger, handler in created:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def records(target):
+    return [json.loads(line) for line in target.lines]
+
+
+class TestQueueLoggingHandler:
+    """Tests for QueueLoggingHandler and JSONFormatter."""
+    
+    def test_records_are_written_as_json(self, queue_logger):
+        """Test that records reach the target as JSON with their extra fields."""
+        logger, handler, target = queue_logger()
+        
+        logger.info('served %s', 'request', extra={'duration_ms': 1.5})
+        try:
+            raise ValueError('broken')
+        except ValueError:
+            logger.exception('failed')
+        handler.listener.stop()
+        
+        served, failed = records(target)
+        assert served['message'] == 'served request'
+        assert served['level'] == 'INFO'
+        assert served['duration_ms'] == 1.5
+        assert served['request_id'] is None
+        assert 'ValueError: broken' in failed['exception']
+    
+    def test_full_queue_drops_and_reports(self, queue_logger):
+        """Test that a full queue drops and reports records instead of blocking."""
+        logger, handler, target = queue_logger(queue_size=2)
+        handler.listener.stop()
+        
+        for i in range(5):
+            logger.info('message %d', i)
+        
+        assert handler.dropped == 3
+        assert dropped_records() >= 3
+        handler.listener.start()
+        logger.info('after')
+        handler.listener.stop()
+        assert [record['message'] for record in records(target)] == [
+            'Log queue full: dropped 3 records', 'message 0', 'message 1', 'after',
+        ]
+    
+    def test_restart_after_fork(self, queue_logger):
+        """Test that a forked child gets a running listener of its own."""
+        logger, handler, target = queue_logger()
+        
+        handler.restart_after_fork()
+        logger.info('in child')
+        handler.listener.stop()
+        
+        assert [record['message'] for record in records(target)] == ['in child']
+
+
+@pytest.mark.django_db
+class TestRequestIDMiddleware:
+    """Tests for RequestIDMiddleware."""
+    
+    def test_generates_request_id(self, api_client, caplog):
+        """Test that requests get an ID, sent in a header and logged with latency."""
+        caplog.set_level(logging.INFO, logger='blog.requests')
+        
+        response = api_client.get('/api/posts/')
+        
+        request_id = response['X-Request-ID']
+        assert len(request_id) == 32
+        record = next(
+            record for record in caplog.records if record.name == 'blog.requests'
+        )
+        assert record.status == 200
+        assert record.duration_ms > 0
+        assert record.path == '/api/posts/'
+    
+    def test_keeps_valid_incoming_id(self, api_client):
+        """Test that a proxy's request ID is kept and unsafe ones are replaced."""
+        response = api_client.get('/api/posts/', HTTP_X_REQUEST_ID='edge-123.abc')
+        assert response['X-Request-ID'] == 'edge-123.abc'
+        
+        response = api_client.get('/api/posts/', HTTP_X_REQUEST_ID='bad id\nvalue')
+        assert response['X-Request-ID'] != 'bad id\nvalue'
+    
+    def test_records_carry_request_id(self, api_client, caplog):
+        """Test that records logged during the request carry its ID."""
+        handler = logging.Handler()
+        handler.addFilter(RequestIDFilter())
+        seen = []
+        handler.emit = lambda record: seen.append(record.request_id)
+        logger = logging.getLogger('blog.requests')
+        logger.addHandler(handler)
+        caplog.set_level(logging.INFO, logger='blog.requests')
+        try:
+            response = api_client.get('/api/posts/')
+        finally:
+            logger.removeHandler(handler)
+        
+        assert seen == [response['X-Request-ID']]
@@ -0,0 +1,64 @@
+"""
+Tests for blog management commands.
+"""
+import json
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from blog.models import BlogPost, Comment
+
+
+@pytest.mark.django_db
+class TestExportImportCommands:
+    """Tests for the export_blog and import_blog commands."""
+    
+    def test_export_writes_records_in_foreign_key_order(
+        self, sample_post_with_comments, tmp_path
+    ):
+        """Test that users are exported before posts and posts before comments."""
+        output = tmp_path / 'blog.ndjson'
+        call_command('export_blog', str(output), stdout=StringIO())
+        
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        
+        types = [record['type'] for record in records]
+        assert types == ['user', 'post', 'comment', 'comment']
+        assert records[1]['id'] == str(sample_post_with_comments.id)
+        assert records[1]['author_id'] == sample_post_with_comments.author_id
+    
+    def test_export_import_round_trip(self, sample_post_with_comments, tmp_path):
+        """Test that an export can be restored into an empty database."""
+        output = tmp_path / 'blog.ndjson'
+        call_command('export_blog', str(output), stdout=StringIO())
+        
+        post = BlogPost.objects.get()
+        comments = {comment.id: comment for comment in Comment.objects.all()}
+        User.objects.all().delete()
+        assert BlogPost.objects.count() == 0
+        
+        call_command('import_blog', str(output), batch_size=1, stdout=StringIO())
+        
+        restored = BlogPost.objects.get()
+        assert restored.id == post.id
+        assert restored.author.username == 'testuser'
+        assert restored.created_at == post.created_at
+        assert restored.updated_at == post.updated_at
+        
+        assert Comment.objects.count() == 2
+        for comment in Comment.objects.all():
+            assert comment.created_at == comments[comment.id].created_at
+            assert comment.post_id == post.id
+        
+        # Password hashes are exported verbatim, so credentials keep working
+        assert User.objects.get(username='testuser').check_password('testpass123')
+    
+    def test_import_rejects_unknown_record_type(self, tmp_path):
+        """Test that unknown record types abort the import."""
+        source = tmp_path / 'blog.ndjson'
+        source.write_text('{"type": "tag", "id": 1}\n')
+        
+        with pytest.raises(CommandError):
+            call_command('import_blog', str(source))
@@ -0,0 +1,169 @@
+"""
+Tests for the Prometheus metrics and the /metrics endpoint.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+from blog import metrics
+from blog.cache_helpers import BlogCacheHelper
+
+prometheus_client = pytest.importorskip('prometheus_client')
+
+
+POST_LIST_VIEW = 'blog:post-list-create'
+
+
+def sample(name, **labels):
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0
+
+
+def requests_total(view, status):
+    return sample('blog_http_requests_total', view=view, method='GET', status=status)
+
+
+def cache_lookups(kind, result):
+    return sample('blog_cache_lookups_total', kind=kind, result=result)
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    """Test cases for /metrics"""
+    
+    def test_exposition_format(self, api_client, sample_post):
+        """Test that /metrics serves every blog metric in the Prometheus text format"""
+        api_client.get('/api/posts/')
+        
+        response = api_client.get('/metrics')
+        
+        assert response.status_code == 200
+        assert response['Content-Type'] == prometheus_client.CONTENT_TYPE_LATEST
+        body = response.content.decode()
+        for name in [
+            'blog_http_request_duration_seconds_bucket',
+            'blog_http_requests_total',
+            'blog_db_queries_bucket',
+            'blog_db_duration_seconds_sum',
+            'blog_serialization_duration_seconds_count',
+            'blog_cache_lookups_total',
+        ]:
+            assert name in body
+        assert f'view="{POST_LIST_VIEW}"' in body
+    
+    def test_request_metrics_per_view(self, api_client, sample_post):
+        """Test that latency, DB and serialization histograms are labelled by view"""
+        def current():
+            return {
+                'requests': requests_total(POST_LIST_VIEW, '200'),
+                'latency': sample(
+                    'blog_http_request_duration_seconds_count',
+                    view=POST_LIST_VIEW,
+                    method='GET',
+                ),
+                'queries': sample('blog_db_queries_sum', view=POST_LIST_VIEW),
+                'serialization': sample(
+                    'blog_serialization_duration_seconds_count', view=POST_LIST_VIEW
+                ),
+            }
+        before = current()
+        
+        api_client.get('/api/posts/')
+        
+        after = current()
+        assert after['requests'] == before['requests'] + 1
+        assert after['latency'] == before['latency'] + 1
+        assert after['queries'] > before['queries']
+        assert after['serialization'] == before['serialization'] + 1
+    
+    def test_unmatched_requests_share_a_label(self, api_client):
+        """Test that unknown URLs do not create a label per path"""
+        before = requests_total(metrics.UNMATCHED_VIEW, '404')
+        
+        api_client.get('/no/such/page/')
+        
+        assert requests_total(metrics.UNMATCHED_VIEW, '404') == before + 1
+    
+    def test_hidden_from_other_addresses(self, api_client):
+        """Test that clients outside the allowlist cannot scrape"""
+        response = api_client.get('/metrics', REMOTE_ADDR='203.0.113.9')
+        
+        assert response.status_code == 404
+    
+    def test_allowed_networks(self, api_client, settings):
+        """Test that the allowlist accepts networks"""
+        settings.BLOG_METRICS_ALLOWED_IPS = ['10.0.0.0/8']
+        
+        assert api_client.get('/metrics', REMOTE_ADDR='10.1.2.3').status_code == 200
+        assert api_client.get('/metrics').status_code == 404
+    
+    def test_bearer_token(self, api_client, settings):
+        """Test that the scrape token works from any address"""
+        settings.BLOG_METRICS_TOKEN = 'scrape-secret'
+        
+        allowed = api_client.get(
+            '/metrics',
+            REMOTE_ADDR='203.0.113.9',
+            HTTP_AUTHORIZATION='Bearer scrape-secret',
+        )
+        refused = api_client.get(
+            '/metrics', REMOTE_ADDR='203.0.113.9', HTTP_AUTHORIZATION='Bearer wrong'
+        )
+        
+        assert allowed.status_code == 200
+        assert refused.status_code == 404
+    
+    def test_unavailable_without_prometheus_client(self, api_client, monkeypatch):
+        """Test that /metrics is a 404 when prometheus_client is not installed"""
+        monkeypatch.setattr(metrics, 'prometheus_client', None)
+        
+        response = api_client.get('/metrics')
+        
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestCacheMetrics:
+    """Test cases for the BlogCacheHelper hit/miss counters"""
+    
+    def test_posts_list_miss_then_hit(self, api_client, sample_post):
+        """Test that a cold and a warm posts list request count a miss and a hit"""
+        misses = cache_lookups('posts_list', 'miss')
+        hits = cache_lookups('posts_list', 'hit')
+        
+        api_client.get('/api/posts/')
+        api_client.get('/api/posts/')
+        
+        assert cache_lookups('posts_list', 'miss') == misses + 1
+        assert cache_lookups('posts_list', 'hit') == hits + 1
+    
+    def test_batch_lookup_counts_each_key(self, sample_post):
+        """Test that a multi-key lookup counts one result per post"""
+        misses = cache_lookups('post_detail', 'miss')
+        
+        BlogCacheHelper.get_post_details([sample_post.id, 'missing'])
+        
+        assert cache_lookups('post_detail', 'miss') == misses + 2
+
+
+class TestMultiprocessMode:
+    """Test cases for aggregating the metrics of several worker processes"""
+    
+    def test_aggregates_every_process(self, tmp_path, monkeypatch):
+        """Test that /metrics sums the counters written by every worker process"""
+        worker = (
+            'import prometheus_client; '
+            "prometheus_client.Counter('blog_test_worker_requests', 'test', ['view'])"
+            ".labels('blog:post-list-create').inc(2)"
+        )
+        env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': str(tmp_path)}
+        for _ in range(2):
+            subprocess.run([sys.executable, '-c', worker], env=env, check=True)
+        monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+        
+        registry = metrics.registry()
+        
+        assert registry is not prometheus_client.REGISTRY
+        assert registry.get_sample_value(
+            'blog_test_worker_requests_total', {'view': POST_LIST_VIEW}
+        ) == 4
@@ -0,0 +1,108 @@
+"""
+Tests for comment table partitioning helpers.
+"""
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from blog.models import Comment
+from blog.partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    create_partition_sql,
+    ensure_partitions,
+    is_partitioned,
+    month_start,
+    monthly_partitions,
+    partition_month,
+    partition_name,
+)
+
+
+requires_postgres = pytest.mark.skipif(
+    connection.vendor != 'postgresql', reason='comment partitioning requires PostgreSQL'
+)
+
+
+def partition_of(comment):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT tableoid::regclass::text FROM blog_comment WHERE id = %s',
+            [comment.pk],
+        )
+        return cursor.fetchone()[0]
+
+
+class TestPartitionHelpers:
+    """Tests for the monthly partition helpers."""
+    
+    def test_add_months_wraps_years(self):
+        """Test month arithmetic across year boundaries."""
+        assert add_months(datetime.date(2025, 11, 1), 3) == datetime.date(2026, 2, 1)
+        assert add_months(datetime.date(2025, 1, 1), -1) == datetime.date(2024, 12, 1)
+    
+    def test_month_start(self):
+        """Test truncating datetimes to the first day of the month."""
+        value = datetime.datetime(2025, 7, 19, 12, 30, tzinfo=datetime.timezone.utc)
+        assert month_start(value) == datetime.date(2025, 7, 1)
+    
+    def test_partition_name_round_trip(self):
+        """Test that partition names encode their month."""
+        month = datetime.date(2025, 7, 1)
+        assert partition_name(month) == 'blog_comment_p2025_07'
+        assert partition_month(partition_name(month)) == month
+        assert partition_month('blog_comment_default') is None
+    
+    def test_create_partition_sql_bounds(self):
+        """Test that a partition covers exactly one month in UTC."""
+        sql = create_partition_sql(datetime.date(2025, 12, 1), lambda name: f'"{name}"')
+        
+        assert '"blog_comment_p2025_12" PARTITION OF "blog_comment"' in sql
+        assert "FROM ('2025-12-01 00:00:00+00') TO ('2026-01-01 00:00:00+00')" in sql
+
+
+@pytest.mark.django_db
+class TestManageCommentPartitionsCommand:
+    """Tests for the manage_comment_partitions command."""
+    
+    def test_command_is_noop_without_partitioning(self):
+        """Test that the command degrades gracefully on SQLite."""
+        out = StringIO()
+        call_command('manage_comment_partitions', retain_months=12, stdout=out)
+        
+        assert 'not partitioned' in out.getvalue()
+
+
+@pytest.mark.postgres
+@requires_postgres
+@pytest.mark.django_db
+class TestEnsurePartitionsPostgres:
+    """Tests for creating partitions on a partitioned PostgreSQL comments table."""
+    
+    def test_moves_rows_out_of_default_partition(self, sample_post, sample_user):
+        """Test that a month with comments in the default partition gets its own."""
+        assert is_partitioned(connection)
+        month = datetime.date(2001, 3, 1)
+        comment = Comment.objects.create(
+            post=sample_post, author=sample_user, content='Early.'
+        )
+        Comment.objects.filter(pk=comment.pk).update(
+            created_at=datetime.datetime(2001, 3, 15, tzinfo=datetime.timezone.utc)
+        )
+        assert partition_of(comment) == DEFAULT_PARTITION
+        
+        created = ensure_partitions(connection, month, month)
+        
+        assert created == [partition_name(month)]
+        assert month in monthly_partitions(connection)
+        assert partition_of(comment) == partition_name(month)
+        assert Comment.objects.filter(pk=comment.pk).exists()
+    
+    def test_creates_empty_months_directly(self):
+        """Test that months without stray rows are created as plain partitions."""
+        month = datetime.date(2001, 4, 1)
+        
+        assert ensure_partitions(connection, month, month) == [partition_name(month)]
+        assert ensure_partitions(connection, month, month) == []
@@ -0,0 +1,156 @@
+"""
+Tests for password hashing admission control.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import Client
+from blog.hashing import (
+    PasswordHashingUnavailable,
+    check_thread_budget,
+    password_hash_limiter,
+    password_hashing,
+)
+
+
+LOGIN_URL = '/api/auth/login/'
+CREDENTIALS = {'username': 'testuser', 'password': 'testpass123'}
+REGISTER_URL = '/api/auth/register/'
+
+
+@pytest.fixture
+def hashing_settings(settings):
+    settings.BLOG_PASSWORD_HASH_CONCURRENCY = 1
+    settings.BLOG_PASSWORD_HASH_QUEUE_DEPTH = 0
+    settings.BLOG_PASSWORD_HASH_QUEUE_TIMEOUT = 0.05
+    return settings
+
+
+@pytest.mark.django_db
+class TestPasswordHashing:
+    """Tests for the hashing limiter used by login and registration."""
+    
+    def test_login_logs_hash_time(self, api_client, sample_user, caplog):
+        """Test that logins report their wait and hashing time."""
+        with caplog.at_level(logging.INFO, logger='blog.metrics'):
+            response = api_client.post(LOGIN_URL, CREDENTIALS)
+        
+        assert response.status_code == 200
+        record = next(
+            record for record in caplog.records if hasattr(record, 'password_hash_ms')
+        )
+        assert record.password_hash_operation == 'login'
+        assert record.password_hash_ms > 0
+        assert password_hash_limiter.active == 0
+    
+    def test_login_is_shed_when_full(self, api_client, sample_user, hashing_settings):
+        """Test that logins get a fast 503 with Retry-After when no slot is free."""
+        with password_hashing('test'):
+            response = api_client.post(LOGIN_URL, CREDENTIALS)
+        
+        assert response.status_code == 503
+        assert response['Retry-After'] == '1'
+    
+    def test_register_is_shed_after_queue_timeout(self, api_client, hashing_settings):
+        """Test that queued registrations give up after the queue timeout."""
+        hashing_settings.BLOG_PASSWORD_HASH_QUEUE_DEPTH = 1
+        data = {
+            'username': 'newuser', 'email': 'new@example.com',
+            'password': 'securepass123', 'password_confirm': 'securepass123',
+        }
+        
+        started = time.perf_counter()
+        with password_hashing('test'):
+            response = api_client.post(REGISTER_URL, data)
+        
+        assert response.status_code == 503
+        assert time.perf_counter() - started < 1
+        assert password_hash_limiter.waiting == 0
+    
+    def test_queued_request_gets_released_slot(self, hashing_settings):
+        """Test that a waiting request runs as soon as a slot is released."""
+        hashing_settings.BLOG_PASSWORD_HASH_QUEUE_DEPTH = 1
+        hashing_settings.BLOG_PASSWORD_HASH_QUEUE_TIMEOUT = 5
+        admitted = threading.Event()
+        
+        def waiter():
+            with password_hashing('test'):
+                admitted.set()
+        
+        with password_hashing('test'):
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            while password_hash_limiter.waiting < 1:
+                time.sleep(0.001)
+            assert not admitted.is_set()
+            # The queue is full now
+            with pytest.raises(PasswordHashingUnavailable):
+                with password_hashing('test'):
+                    pass
+        thread.join(timeout=5)
+        
+        assert admitted.is_set()
+        assert password_hash_limiter.active == 0
+    
+    def test_read_gets_thread_while_queue_full(self, settings):
+        """Test that a worker's last thread is left for reads by default."""
+        settings.BLOG_PASSWORD_HASH_QUEUE_TIMEOUT = 5
+        depth = settings.BLOG_PASSWORD_HASH_QUEUE_DEPTH
+        held = settings.BLOG_PASSWORD_HASH_CONCURRENCY + depth
+        release = threading.Event()
+        
+        def hash_request():
+            with password_hashing('test'):
+                release.wait(timeout=5)
+        
+        with ThreadPoolExecutor(max_workers=settings.GUNICORN_THREADS) as pool:
+            hashes = [pool.submit(hash_request) for _ in range(held)]
+            deadline = time.monotonic() + 2
+            while password_hash_limiter.waiting < depth:
+                assert time.monotonic() < deadline, 'the hashing queue never filled'
+                time.sleep(0.001)
+            read = pool.submit(Client().get, '/healthz')
+            try:
+                assert read.result(timeout=2).status_code == 200
+            finally:
+                release.set()
+            for future in hashes:
+                future.result(timeout=5)
+        
+        assert password_hash_limiter.active == 0
+    
+    def test_thread_budget_is_checked(self, settings):
+        """Test that hashing slots plus queue must leave a thread free."""
+        settings.GUNICORN_THREADS = 4
+        settings.BLOG_PASSWORD_HASH_CONCURRENCY = 2
+        settings.BLOG_PASSWORD_HASH_QUEUE_DEPTH = 2
+        
+        with pytest.raises(ImproperlyConfigured):
+            check_thread_budget()
+        settings.BLOG_PASSWORD_HASH_QUEUE_DEPTH = 1
+        check_thread_budget()
+    
+    def test_metrics_exported(self, api_client, sample_user, hashing_settings):
+        """Test that hashing times and shed requests appear on /metrics."""
+        prometheus_client = pytest.importorskip('prometheus_client')
+        
+        def sample(name, operation):
+            value = prometheus_client.REGISTRY.get_sample_value(
+                name, {'operation': operation}
+            )
+            return value or 0
+        
+        hashed = sample('blog_password_hash_duration_seconds_count', 'login')
+        shed = sample('blog_password_hash_shed_total', 'login')
+        
+        api_client.post(LOGIN_URL, CREDENTIALS)
+        with password_hashing('test'):
+            api_client.post(LOGIN_URL, CREDENTIALS)
+        
+        hashed_after = sample('blog_password_hash_duration_seconds_count', 'login')
+        assert hashed_after == hashed + 1
+        assert sample('blog_password_hash_shed_total', 'login') == shed + 1
@@ -6,6 +6,7 @@ from django.urls import reverse
 from rest_framework import status
 from blog.models import BlogPost
 from blog.cache_helpers import BlogCacheHelper
+from blog.pagination import PostListPagination
 
 
 @pytest.mark.django_db
@@ -57,6 +58,33 @@ class TestPostsListEndpoint:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['count'] == 1
         assert response.data['results'][0]['comment_count'] == 2
+    
+    def test_query_parameters_share_cached_page(
+        self, api_client, multiple_posts, django_assert_num_queries
+    ):
+        """Test that unknown or reordered parameters share the page's cache entry."""
+        BlogCacheHelper.invalidate_all_cache()
+        url = reverse('blog:post-list-create')
+        first = api_client.get(url, {'page': '1', 'x': 'a'})
+        
+        with django_assert_num_queries(0):
+            for query in [{'x': 'b', 'page': '1'}, {}, {'page': '01', 'y': 'c'}]:
+                response = api_client.get(url, query)
+                assert response.status_code == status.HTTP_200_OK
+                assert response.data == first.data
+    
+    def test_page_links_carry_only_the_page(
+        self, api_client, multiple_posts, monkeypatch
+    ):
+        """Test that cached page links do not repeat another client's parameters."""
+        BlogCacheHelper.invalidate_all_cache()
+        monkeypatch.setattr(PostListPagination, 'page_size', 1)
+        url = reverse('blog:post-list-create')
+        
+        response = api_client.get(url, {'page': '2', 'x': 'a'})
+        
+        assert response.data['next'] == 'http://testserver/api/posts/?page=3'
+        assert response.data['previous'] == 'http://testserver/api/posts/'
 
 
 @pytest.mark.django_db
@@ -192,4 +220,98 @@ class TestPostDetailEndpoint:
         url = reverse('blog:post-detail', kwargs={'id': non_existent_uuid})
         response = api_client.get(url)
         
-        assert response.status_code == status.HTTP_404_NOT_FOUND 
\ No newline at end of file
+        assert response.status_code == status.HTTP_404_NOT_FOUND 
+
+
+@pytest.mark.django_db
+class TestPostsBulkCreateEndpoint:
+    """Tests for POST /api/posts/bulk endpoint."""
+    
+    def test_bulk_create_posts_success(self, api_client, sample_user):
+        """Test creating several posts in one request."""
+        api_client.force_authenticate(user=sample_user)
+        
+        url = reverse('blog:post-bulk-create')
+        data = [
+            {'title': f'Bulk Post {i}', 'content': f'Bulk post content {i}.'}
+            for i in range(3)
+        ]
+        response = api_client.post(url, data, format='json')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data) == 3
+        titles = [post['title'] for post in response.data]
+        assert titles == [item['title'] for item in data]
+        for post_data in response.data:
+            assert 'id' in post_data
+            assert post_data['author']['username'] == sample_user.username
+            assert post_data['created_at'] is not None
+        
+        assert BlogPost.objects.filter(author=sample_user).count() == 3
+    
+    def test_bulk_create_invalidates_posts_list_cache(self, api_client, sample_user):
+        """Test that the posts list cache is invalidated after a bulk create."""
+        BlogCacheHelper.set_posts_list({'count': 0, 'results': []})
+        api_client.force_authenticate(user=sample_user)
+        
+        url = reverse('blog:post-bulk-create')
+        data = [{'title': 'Bulk Post', 'content': 'Bulk post content.'}]
+        response = api_client.post(url, data, format='json')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert BlogCacheHelper.get_posts_list() is None
+    
+    def test_bulk_create_reports_per_item_errors(self, api_client, sample_user):
+        """Test that invalid items are reported by index and nothing is created."""
+        api_client.force_authenticate(user=sample_user)
+        
+        url = reverse('blog:post-bulk-create')
+        data = [
+            {'title': 'Valid Post', 'content': 'Valid content.'},
+            {'title': '   ', 'content': 'Blank title.'},
+            {'title': 'Missing content'},
+        ]
+        response = api_client.post(url, data, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        errors = response.data['errors']
+        assert [error['index'] for error in errors] == [1, 2]
+        assert 'title' in errors[0]['errors']
+        assert 'content' in errors[1]['errors']
+        assert BlogPost.objects.count() == 0
+    
+    def test_bulk_create_rejects_oversized_batch(
+        self, api_client, sample_user, settings
+    ):
+        """Test that batches larger than the configured maximum are rejected."""
+        settings.BLOG_BULK_CREATE_MAX_BATCH_SIZE = 2
+        api_client.force_authenticate(user=sample_user)
+        
+        url = reverse('blog:post-bulk-create')
+        data = [
+            {'title': f'Bulk Post {i}', 'content': 'Bulk post content.'}
+            for i in range(3)
+        ]
+        response = api_client.post(url, data, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert BlogPost.objects.count() == 0
+    
+    def test_bulk_create_rejects_non_list_payload(self, api_client, sample_user):
+        """Test that a single object payload is rejected."""
+        api_client.force_authenticate(user=sample_user)
+        
+        url = reverse('blog:post-bulk-create')
+        data = {'title': 'Not a list', 'content': 'Bulk post content.'}
+        response = api_client.post(url, data, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'non_field_errors' in response.data['errors']
+    
+    def test_bulk_create_requires_authentication(self, api_client):
+        """Test that bulk create requires authentication."""
+        url = reverse('blog:post-bulk-create')
+        data = [{'title': 'Bulk Post', 'content': 'Bulk post content.'}]
+        response = api_client.post(url, data, format='json')
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,112 @@
+"""
+Query budget regression tests for blog endpoints.
+"""
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from blog.cache_helpers import BlogCacheHelper
+from blog.models import BlogPost, Comment
+
+
+@pytest.fixture
+def posts_with_comments(sample_user):
+    """Create several posts with several comments each."""
+    posts = []
+    for i in range(5):
+        post = BlogPost.objects.create(
+            title=f"Budget Post {i}",
+            content="Budget post content.",
+            author=sample_user
+        )
+        for j in range(3):
+            Comment.objects.create(
+                post=post, author=sample_user, content=f"Comment {j} here."
+            )
+        posts.append(post)
+    return posts
+
+
+@pytest.mark.django_db
+class TestEndpointQueryBudgets:
+    """Endpoints must not run more queries as the data grows."""
+    
+    @pytest.mark.query_budget(2)
+    def test_posts_list_budget(self, api_client, posts_with_comments, query_budget):
+        """Test that the posts list runs a count and a single select."""
+        BlogCacheHelper.invalidate_all_cache()
+        
+        with query_budget():
+            response = api_client.get(reverse('blog:post-list-create'))
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert [post['comment_count'] for post in response.data['results']] == [3] * 5
+    
+    @pytest.mark.query_budget(2)
+    def test_post_detail_budget(self, api_client, posts_with_comments, query_budget):
+        """Test that the post detail loads the post and its comments in two queries."""
+        BlogCacheHelper.invalidate_all_cache()
+        post = posts_with_comments[0]
+        
+        url = reverse('blog:post-detail', kwargs={'id': post.id})
+        with query_budget():
+            response = api_client.get(url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['comments']) == 3
+    
+    @pytest.mark.query_budget(0)
+    def test_cached_post_detail_budget(self, api_client, sample_post, query_budget):
+        """Test that a cached post detail does not touch the database."""
+        BlogCacheHelper.invalidate_all_cache()
+        url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        api_client.get(url)
+        
+        with query_budget():
+            response = api_client.get(url)
+        
+        assert response.status_code == status.HTTP_200_OK
+    
+    @pytest.mark.query_budget(3)
+    def test_comment_create_budget(
+        self, api_client, sample_post, sample_user, query_budget
+    ):
+        """Test that a comment create loads the post, inserts and bumps the summary."""
+        api_client.force_authenticate(user=sample_user)
+        url = reverse('blog:comment-create', kwargs={'post_id': sample_post.id})
+        
+        with query_budget():
+            response = api_client.post(
+                url, {'content': 'Budget comment.'}, format='json'
+            )
+        
+        assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+class TestQueryCountMiddleware:
+    """Tests for QueryCountMiddleware."""
+    
+    def test_query_headers_in_debug(self, api_client, sample_post, settings):
+        """Test that query count and time are returned as headers in debug."""
+        settings.DEBUG = True
+        BlogCacheHelper.invalidate_all_cache()
+        url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        
+        response = api_client.get(url)
+        
+        assert response['X-DB-Query-Count'] == '2'
+        assert float(response['X-DB-Query-Time-Ms']) >= 0
+    
+    def test_query_metrics_logged_without_debug(
+        self, api_client, sample_post, settings, caplog
+    ):
+        """Test that query metrics are logged instead of exposed outside debug."""
+        settings.DEBUG = False
+        BlogCacheHelper.invalidate_all_cache()
+        url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        
+        with caplog.at_level('INFO', logger='blog.metrics'):
+            response = api_client.get(url)
+        
+        assert 'X-DB-Query-Count' not in response
+        assert any(record.db_queries == 2 for record in caplog.records)
@@ -0,0 +1,155 @@
+"""
+Tests for the PostSummary read model.
+"""
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from blog.cache_helpers import BlogCacheHelper
+from blog.models import BlogPost, Comment, PostSummary
+from blog.read_models import find_post_summary_drift
+
+
+def summary_comment_count(post):
+    return PostSummary.objects.get(post=post).comment_count
+
+
+@pytest.mark.django_db
+class TestPostSummarySync:
+    """Tests for the incremental updates of PostSummary."""
+    
+    def test_summary_created_with_post(self, sample_post):
+        """Test that creating a post creates its summary."""
+        summary = PostSummary.objects.get(post=sample_post)
+        
+        assert summary.title == sample_post.title
+        assert summary.author_username == sample_post.author.username
+        assert summary.author_email == sample_post.author.email
+        assert summary.comment_count == 0
+        assert summary.created_at == sample_post.created_at
+    
+    def test_comment_count_follows_comments(self, sample_post_with_comments):
+        """Test that adding and deleting comments updates the count."""
+        assert summary_comment_count(sample_post_with_comments) == 2
+        
+        Comment.objects.filter(post=sample_post_with_comments).first().delete()
+        
+        assert summary_comment_count(sample_post_with_comments) == 1
+    
+    def test_post_and_author_updates(self, sample_post, sample_user):
+        """Test that title and author changes reach the summary."""
+        sample_post.title = 'Renamed Post'
+        sample_post.save()
+        sample_user.username = 'renamed'
+        sample_user.save()
+        
+        summary = PostSummary.objects.get(post=sample_post)
+        assert summary.title == 'Renamed Post'
+        assert summary.author_username == 'renamed'
+    
+    def test_author_rename_invalidates_cached_responses(self, api_client, sample_post):
+        """Test that cached list and detail responses show a renamed author at once."""
+        BlogCacheHelper.invalidate_all_cache()
+        commenter = User.objects.create_user(username='commenter', password='pass12345')
+        Comment.objects.create(post=sample_post, author=commenter, content='Hi.')
+        list_url = reverse('blog:post-list-create')
+        detail_url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        api_client.get(list_url)
+        api_client.get(detail_url)
+        
+        sample_post.author.username = 'renamed'
+        sample_post.author.save()
+        commenter.username = 'renamed-commenter'
+        commenter.save(update_fields=['username'])
+        
+        first_post = api_client.get(list_url).data['results'][0]
+        assert first_post['author']['username'] == 'renamed'
+        detail = api_client.get(detail_url).data
+        assert detail['author']['username'] == 'renamed'
+        assert detail['comments'][0]['author']['username'] == 'renamed-commenter'
+    
+    def test_summary_deleted_with_post(self, sample_post_with_comments):
+        """Test that deleting a post deletes its summary."""
+        sample_post_with_comments.delete()
+        
+        assert PostSummary.objects.count() == 0
+    
+    def test_bulk_created_posts_have_summaries(self, api_client, sample_user):
+        """Test that the bulk endpoint fills the read model."""
+        api_client.force_authenticate(user=sample_user)
+        data = [{'title': f'Bulk {i}', 'content': 'Bulk content.'} for i in range(3)]
+        
+        url = reverse('blog:post-bulk-create')
+        response = api_client.post(url, data, format='json')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert PostSummary.objects.count() == 3
+        assert find_post_summary_drift() == {'missing': [], 'stale': []}
+    
+    def test_posts_list_reads_summaries(self, api_client, sample_post_with_comments):
+        """Test that the list endpoint is served from the read model."""
+        BlogCacheHelper.invalidate_all_cache()
+        PostSummary.objects.update(title='From the read model')
+        
+        response = api_client.get(reverse('blog:post-list-create'))
+        
+        assert response.status_code == status.HTTP_200_OK
+        result = response.data['results'][0]
+        assert result['id'] == str(sample_post_with_comments.id)
+        assert result['title'] == 'From the read model'
+        assert result['comment_count'] == 2
+        assert result['author']['username'] == sample_post_with_comments.author.username
+
+
+@pytest.mark.django_db
+class TestRebuildPostSummaryCommand:
+    """Tests for the rebuild_post_summary command."""
+    
+    def test_check_passes_when_consistent(self, sample_post_with_comments):
+        """Test that the consistency check passes on a synced read model."""
+        out = StringIO()
+        call_command('rebuild_post_summary', check=True, stdout=out)
+        
+        assert 'consistent' in out.getvalue()
+    
+    def test_check_reports_drift(self, sample_post_with_comments, multiple_posts):
+        """Test that the consistency check fails on missing and stale rows."""
+        stale = PostSummary.objects.filter(post=sample_post_with_comments)
+        stale.update(comment_count=7)
+        PostSummary.objects.filter(post=multiple_posts[0]).delete()
+        
+        drift = find_post_summary_drift()
+        assert drift['stale'] == [sample_post_with_comments.id]
+        assert drift['missing'] == [multiple_posts[0].id]
+        
+        with pytest.raises(CommandError):
+            call_command('rebuild_post_summary', check=True)
+    
+    def test_rebuild_fixes_drift(self, sample_post_with_comments, multiple_posts):
+        """Test that a rebuild restores the read model."""
+        PostSummary.objects.all().update(comment_count=7)
+        PostSummary.objects.filter(post=multiple_posts[0]).delete()
+        
+        call_command('rebuild_post_summary', stdout=StringIO())
+        
+        assert PostSummary.objects.count() == BlogPost.objects.count()
+        assert find_post_summary_drift() == {'missing': [], 'stale': []}
+    
+    def test_rebuild_updates_rows_in_place(
+        self, sample_post_with_comments, multiple_posts
+    ):
+        """Test that a rebuild upserts summaries instead of deleting and recreating."""
+        PostSummary.objects.all().update(comment_count=7)
+        
+        with CaptureQueriesContext(connection) as queries:
+            call_command('rebuild_post_summary', stdout=StringIO())
+        
+        assert not [query for query in queries if query['sql'].startswith('DELETE')]
+        assert summary_comment_count(sample_post_with_comments) == 2
+        assert find_post_summary_drift() == {'missing': [], 'stale': []}
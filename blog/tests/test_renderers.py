@@ -0,0 +1,163 @@
+"""
+Tests for the orjson-backed JSON renderer and parser.
+"""
+import datetime
+import decimal
+import io
+import uuid
+import zoneinfo
+
+import pytest
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from blog import fast_serializers, renderers
+from blog.renderers import FastJSONParser, FastJSONRenderer
+
+
+def assert_renders_like_drf(data, accepted_media_type=None):
+    try:
+        expected = JSONRenderer().render(data, accepted_media_type)
+    except ValueError:
+        # e.g. NaN: invalid JSON must be rejected just the same
+        with pytest.raises(ValueError):
+            FastJSONRenderer().render(data, accepted_media_type)
+        return
+    assert FastJSONRenderer().render(data, accepted_media_type) == expected
+
+
+class TestFastJSONRenderer:
+    """FastJSONRenderer must produce the same bytes as DRF's JSONRenderer."""
+    
+    def test_native_types(self):
+        """Test parity for UUIDs, datetimes, dates, times and decimals."""
+        assert_renders_like_drf({
+            'id': uuid.uuid4(),
+            'aware': timezone.now(),
+            'naive': datetime.datetime(2024, 1, 2, 3, 4, 5, 678901),
+            'date': datetime.date(2024, 1, 2),
+            'time': datetime.time(3, 4, 5, 678901),
+            'duration': datetime.timedelta(seconds=90),
+            'price': decimal.Decimal('12.50'),
+            'nested': [{'n': 1, 'f': 1.5, 'b': True, 'none': None}],
+        })
+    
+    def test_datetimes(self):
+        """Test datetime parity without floats in the payload, UTC written as "Z"."""
+        utc = datetime.datetime(
+            2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+        )
+        minus_three = datetime.timezone(datetime.timedelta(hours=-3))
+        assert_renders_like_drf({
+            'utc': utc,
+            'whole_seconds': utc.replace(microsecond=0),
+            'offset': utc.astimezone(minus_three),
+            'zone': utc.astimezone(zoneinfo.ZoneInfo('Europe/London')),
+            'naive': utc.replace(tzinfo=None),
+        })
+        # Local mean time offsets have seconds, which orjson cannot write
+        lmt = datetime.timezone(datetime.timedelta(minutes=19, seconds=32))
+        assert_renders_like_drf({'lmt': utc.astimezone(lmt)})
+    
+    def test_non_string_keys(self):
+        """Test that non-string keys are converted like the stdlib does."""
+        assert_renders_like_drf({1: 'one', 2.5: 'float', None: 'none'})
+    
+    def test_unicode_and_line_separators(self):
+        """Test that non-ASCII stays UTF-8 and U+2028/U+2029 are escaped."""
+        data = {'content': 'Olá, ação ✓ \u2028 \u2029'}
+        
+        assert b'\\u2028' in FastJSONRenderer().render(data)
+        assert_renders_like_drf(data)
+    
+    def test_indent_falls_back_to_stdlib(self):
+        """Test that indented output is delegated to JSONRenderer."""
+        assert_renders_like_drf({'a': [1, 2]}, 'application/json; indent=4')
+    
+    def test_big_integers_fall_back_to_stdlib(self):
+        """Test that values orjson cannot encode are rendered by JSONRenderer."""
+        assert_renders_like_drf({'big': 2 ** 70})
+    
+    def test_float_exponents(self):
+        """Test that floats and decimals keep Python's exponent format."""
+        assert_renders_like_drf({'big': 1e16, 'small': 1e-7, 'plain': 0.5})
+        assert_renders_like_drf([{'price': decimal.Decimal('1E+16')}])
+        assert b'1e+16' in FastJSONRenderer().render({'big': 1e16})
+    
+    @pytest.mark.parametrize(
+        'value', [float('nan'), float('inf'), -float('inf'), decimal.Decimal('NaN')]
+    )
+    def test_non_finite_numbers_are_rejected(self, value):
+        """Test that NaN and Infinity raise like DRF's strict encoder (no null)."""
+        assert_renders_like_drf({'value': value})
+        with pytest.raises(ValueError):
+            FastJSONRenderer().render({'nested': [{'value': value}]})
+    
+    def test_none_renders_empty(self):
+        """Test that None renders an empty body."""
+        assert FastJSONRenderer().render(None) == b''
+    
+    def test_without_orjson(self, monkeypatch):
+        """Test that the renderer works when orjson is not installed."""
+        monkeypatch.setattr(renderers, 'orjson', None)
+        
+        assert_renders_like_drf({'id': uuid.uuid4(), 'at': timezone.now()})
+    
+    @pytest.mark.django_db
+    def test_post_detail_parity(self, sample_post_with_comments):
+        """Test parity on a real post detail payload."""
+        data = fast_serializers.get_post_detail(sample_post_with_comments.id)
+        assert_renders_like_drf(data)
+    
+    @pytest.mark.django_db
+    def test_post_detail_is_encoded_by_orjson(
+        self, sample_post_with_comments, monkeypatch
+    ):
+        """Test that a payload without floats never falls back to DRF's encoder."""
+        if renderers.orjson is None:
+            pytest.skip('orjson is not installed')
+        data = fast_serializers.get_post_detail(sample_post_with_comments.id)
+        expected = JSONRenderer().render(data)
+        
+        def fallback(*args, **kwargs):
+            raise AssertionError('rendered by JSONRenderer')
+        
+        monkeypatch.setattr(JSONRenderer, 'render', fallback)
+        
+        assert FastJSONRenderer().render(data) == expected
+
+
+class TestFastJSONParser:
+    """Tests for FastJSONParser."""
+    
+    def test_parses_like_json_parser(self):
+        """Test that the parsed data matches JSONParser."""
+        body = '{"title": "Olá", "tags": ["a", "b"], "n": 1.5}'.encode()
+        
+        parsed = FastJSONParser().parse(io.BytesIO(body))
+        
+        assert parsed == JSONParser().parse(io.BytesIO(body))
+    
+    def test_invalid_json_raises_parse_error(self):
+        """Test that malformed bodies raise ParseError."""
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"title": '))
+    
+    def test_without_orjson(self, monkeypatch):
+        """Test that the parser works when orjson is not installed."""
+        monkeypatch.setattr(renderers, 'orjson', None)
+        
+        assert FastJSONParser().parse(io.BytesIO(b'{"a": 1}')) == {'a': 1}
+    
+    @pytest.mark.django_db
+    def test_json_request_body(self, api_client, sample_user):
+        """Test that the API accepts JSON bodies through the configured parser."""
+        api_client.force_authenticate(user=sample_user)
+        
+        response = api_client.post(
+            '/api/posts/', {'title': 'JSON post', 'content': 'Body.'}, format='json'
+        )
+        
+        assert response.status_code == 201
+        assert response.json()['title'] == 'JSON post'
@@ -0,0 +1,174 @@
+"""
+Tests for read-replica routing.
+"""
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework.authtoken.models import Token
+from blog.cache_helpers import BlogCacheHelper
+from blog.models import BlogPost
+from blog.routers import (
+    RECENT_WRITE_CACHE_KEY,
+    CacheFill,
+    PrimaryReplicaRouter,
+    mark_recent_write,
+    replica_reads,
+    request_routing,
+)
+
+
+@pytest.fixture
+def replica_settings(settings):
+    """Enable routing to the test replica database."""
+    settings.DATABASE_REPLICAS = ['replica']
+    BlogCacheHelper.invalidate_all_cache()
+    return settings
+
+
+class TestPrimaryReplicaRouter:
+    """Tests for PrimaryReplicaRouter."""
+    
+    def test_reads_use_primary_by_default(self, replica_settings):
+        """Test that reads outside replica_reads() go to the primary."""
+        router = PrimaryReplicaRouter()
+        with request_routing():
+            assert router.db_for_read(BlogPost) == 'default'
+    
+    def test_replica_reads_use_replica(self, replica_settings):
+        """Test that reads inside replica_reads() go to a replica."""
+        router = PrimaryReplicaRouter()
+        with request_routing(), replica_reads():
+            assert router.db_for_read(BlogPost) == 'replica'
+    
+    def test_reads_after_write_use_primary(self, replica_settings):
+        """Test that a write pins the rest of the request to the primary."""
+        router = PrimaryReplicaRouter()
+        with request_routing(), replica_reads():
+            assert router.db_for_write(BlogPost) == 'default'
+            assert router.db_for_read(BlogPost) == 'default'
+    
+    def test_pinned_requests_use_primary(self, replica_settings):
+        """Test that pinned requests never read from a replica."""
+        router = PrimaryReplicaRouter()
+        with request_routing(pinned=True), replica_reads():
+            assert router.db_for_read(BlogPost) == 'default'
+    
+    def test_no_replicas_configured(self, settings):
+        """Test that everything goes to the primary without replicas."""
+        settings.DATABASE_REPLICAS = []
+        router = PrimaryReplicaRouter()
+        with request_routing(), replica_reads():
+            assert router.db_for_read(BlogPost) == 'default'
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+class TestReplicaRoutingEndpoints:
+    """Tests for replica routing through the post endpoints."""
+    
+    def test_post_detail_reads_from_replica(
+        self, api_client, sample_post, replica_settings
+    ):
+        """Test that the detail GET is served by the replica, which lacks the post."""
+        url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        response = api_client.get(url)
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_posts_list_reads_from_replica(
+        self, api_client, multiple_posts, replica_settings
+    ):
+        """Test that the list GET is served by the replica."""
+        url = reverse('blog:post-list-create')
+        response = api_client.get(url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 0
+    
+    def test_author_reads_own_comment_after_write(
+        self, api_client, sample_post, sample_user, replica_settings
+    ):
+        """Test that a client is pinned to the primary after writing a comment."""
+        api_client.force_authenticate(user=sample_user)
+        
+        url = reverse('blog:comment-create', kwargs={'post_id': sample_post.id})
+        response = api_client.post(url, {'content': 'Fresh comment.'}, format='json')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert replica_settings.REPLICA_PIN_COOKIE in response.cookies
+        
+        url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        response = api_client.get(url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        comments = [comment['content'] for comment in response.data['comments']]
+        assert comments == ['Fresh comment.']
+    
+    def test_token_client_is_pinned_without_cookie(
+        self, api_client, sample_post, sample_user, replica_settings
+    ):
+        """Test that token clients are pinned through the cache."""
+        token = Token.objects.create(user=sample_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        
+        url = reverse('blog:comment-create', kwargs={'post_id': sample_post.id})
+        response = api_client.post(url, {'content': 'Fresh comment.'}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        
+        api_client.cookies.clear()
+        url = reverse('blog:post-detail', kwargs={'id': sample_post.id})
+        response = api_client.get(url)
+        
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+class TestReplicaCacheFill:
+    """Tests for keeping lagging replica reads out of the shared response cache."""
+    
+    def test_author_reads_own_post_after_other_client_fills_cache(
+        self, api_client, sample_user, replica_settings
+    ):
+        """Test that another client's read right after a write caches primary data."""
+        api_client.force_authenticate(user=sample_user)
+        url = reverse('blog:post-list-create')
+        data = {'title': 'Fresh', 'content': 'Body.'}
+        response = api_client.post(url, data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        
+        # Not pinned: without the freshness rule this read hits the lagging replica
+        assert APIClient().get(url).data['count'] == 1
+        
+        assert api_client.get(url).data['count'] == 1
+    
+    def test_replica_reads_resume_after_pin_window(
+        self, api_client, multiple_posts, replica_settings
+    ):
+        """Test that replicas serve cache fills again once the write window passed."""
+        mark_recent_write()
+        url = reverse('blog:post-list-create')
+        assert api_client.get(url).data['count'] == 3
+        
+        BlogCacheHelper.invalidate_all_cache()
+        
+        assert api_client.get(url).data['count'] == 0
+    
+    def test_replica_read_overtaken_by_write_is_not_cached(self, replica_settings):
+        """Test that a replica read is not cached after a write invalidated it."""
+        with request_routing():
+            fill = CacheFill.start()
+            assert fill.from_replica
+            mark_recent_write()
+            
+            assert not fill.cacheable()
+    
+    def test_primary_reads_are_cacheable(self, replica_settings):
+        """Test that reads from the primary may always be cached."""
+        mark_recent_write()
+        assert cache.get(RECENT_WRITE_CACHE_KEY)
+        with request_routing():
+            fill = CacheFill.start()
+            
+            assert not fill.from_replica
+            assert fill.cacheable()
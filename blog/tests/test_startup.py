@@ -0,0 +1,61 @@
+"""
+Start-up regression tests (manage.py profile_startup).
+"""
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from blog.startup_profile import parse_importtime, summarize_imports
+
+
+# Import time of a worker up to its first API response. Generous, to absorb slow
+# CI machines; what it catches is a heavy dependency creeping into the hot path.
+IMPORT_BUDGET_MS = 2000
+
+
+@pytest.fixture(scope='module')
+def startup_report():
+    out = StringIO()
+    # Batch without ids answers 400 before touching the (empty) database
+    call_command('profile_startup', '--json', path='/api/posts/batch/', stdout=out)
+    return json.loads(out.getvalue())
+
+
+class TestStartup:
+    """Tests for the start-up cost of a worker."""
+    
+    def test_first_request_is_served(self, startup_report):
+        """Test that the profiled worker answered the request."""
+        assert startup_report['status'] == 400
+        assert startup_report['timings']['time_to_first_request_ms'] > 0
+    
+    def test_lazy_modules_stay_unloaded(self, startup_report):
+        """Test that API requests import neither the admin, async views nor dotenv."""
+        assert startup_report['lazy_modules_loaded'] == []
+    
+    def test_import_time_budget(self, startup_report):
+        """Test that imports up to the first response stay within the budget."""
+        assert startup_report['imports']['total_ms'] < IMPORT_BUDGET_MS
+
+
+class TestImportTimeReport:
+    """Tests for the -X importtime parsing."""
+    
+    def test_parse_and_summarize(self):
+        """Test that self times are totalled per package and ranked per module."""
+        report = '\n'.join([
+            'import time: self [us] | cumulative | imported package',
+            'import time:       300 |        300 |   django.utils',
+            'import time:      1200 |       1500 | django',
+            'import time:       500 |        500 | blog.views',
+            'unrelated warning line',
+        ])
+        
+        imports = parse_importtime(report)
+        summary = summarize_imports(imports, top=2)
+        
+        assert imports[0] == ('django.utils', 300, 300, 1)
+        assert summary['total_ms'] == 2.0
+        assert summary['packages_ms'] == {'django': 1.5, 'blog': 0.5}
+        assert list(summary['slowest_ms']) == ['django', 'blog.views']
@@ -0,0 +1,110 @@
+"""
+Tests for the incremental sync endpoint.
+"""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from blog import fast_serializers
+from blog.models import BlogPost, Comment
+from blog.sync import decode_cursor, encode_cursor
+
+
+URL = '/api/sync/'
+
+
+def sync(api_client, cursor=None):
+    response = api_client.get(URL, {'since': cursor} if cursor else {})
+    assert response.status_code == 200
+    return response.data
+
+
+@pytest.mark.django_db
+class TestSyncEndpoint:
+    """Tests for GET /api/sync/."""
+    
+    def test_first_sync_returns_everything(self, api_client, sample_post_with_comments):
+        """Test that a sync without a cursor returns every post and comment."""
+        data = sync(api_client)
+        
+        post = fast_serializers.get_post_detail(sample_post_with_comments.id)
+        comments = post.pop('comments')
+        assert data['posts'] == [post]
+        synced_ids = {comment['id'] for comment in data['comments']}
+        assert synced_ids == {comment['id'] for comment in comments}
+        assert {comment['post'] for comment in data['comments']} == {post['id']}
+        assert data['has_more'] is False
+    
+    def test_returns_only_changes_after_cursor(
+        self, api_client, sample_post, sample_user
+    ):
+        """Test that the next cursor only returns rows created or updated since."""
+        cursor = sync(api_client)['next_cursor']
+        assert sync(api_client, cursor)['posts'] == []
+        
+        comment = Comment.objects.create(
+            post=sample_post, author=sample_user, content='New.'
+        )
+        sample_post.title = 'Edited'
+        sample_post.save()
+        
+        data = sync(api_client, cursor)
+        assert [post['title'] for post in data['posts']] == ['Edited']
+        assert [item['id'] for item in data['comments']] == [str(comment.id)]
+        
+        data = sync(api_client, data['next_cursor'])
+        assert data['posts'] == [] and data['comments'] == []
+    
+    def test_paginates_deltas(self, api_client, settings, sample_user):
+        """Test that pages follow each other without gaps or repeats."""
+        settings.BLOG_SYNC_PAGE_SIZE = 2
+        posts = [
+            BlogPost.objects.create(
+                title=f'Post {i}', content='Body.', author=sample_user
+            )
+            for i in range(5)
+        ]
+        # Equal timestamps are ordered by id
+        BlogPost.objects.filter(id__in=[post.id for post in posts[:3]]).update(
+            updated_at=timezone.now() - timedelta(minutes=1)
+        )
+        
+        seen, cursor, pages = [], None, 0
+        while True:
+            data = sync(api_client, cursor)
+            pages += 1
+            seen.extend(post['id'] for post in data['posts'])
+            cursor = data['next_cursor']
+            if not data['has_more']:
+                break
+        
+        assert pages == 3
+        assert sorted(seen) == sorted(str(post.id) for post in posts)
+        assert len(seen) == len(set(seen))
+    
+    def test_settle_window_hides_recent_changes(
+        self, api_client, settings, sample_post
+    ):
+        """Test that changes younger than the settle window are held back."""
+        settings.BLOG_SYNC_SETTLE_SECONDS = 60
+        
+        data = sync(api_client)
+        
+        assert data['posts'] == []
+        assert decode_cursor(data['next_cursor']) == {'posts': None, 'comments': None}
+    
+    def test_rejects_invalid_cursor(self, api_client):
+        """Test that tampered or malformed cursors return 400."""
+        cursor = encode_cursor({'posts': (timezone.now(), 'abc'), 'comments': None})
+        
+        for since in ['garbage', cursor[:-2] + 'xx']:
+            response = api_client.get(URL, {'since': since})
+            assert response.status_code == 400
+            assert 'since' in response.data
+    
+    def test_query_count(
+        self, api_client, sample_post_with_comments, django_assert_num_queries
+    ):
+        """Test that a page costs one posts and one comments query."""
+        with django_assert_num_queries(2):
+            sync(api_client)
@@ -0,0 +1,217 @@
+"""
+Tests for the token bucket throttle.
+"""
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.authtoken.models import Token
+from blog import throttling
+from blog.models import BlogPost
+
+
+LOGIN_URL = '/api/auth/login/'
+
+
+@pytest.fixture
+def rates(settings):
+    def set_rates(num_proxies=0, **scope_rates):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': scope_rates,
+            'NUM_PROXIES': num_proxies,
+        }
+    return set_rates
+
+
+@pytest.fixture
+def redis_cache(settings, monkeypatch):
+    """
+    Django's Redis cache backend and the throttle's own Redis client, both on
+    one in-memory fakeredis server (with Lua).
+    """
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    server = fakeredis.FakeServer()
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': settings.REDIS_URL,
+            'OPTIONS': {'connection_class': fakeredis.FakeConnection, 'server': server},
+        },
+    }
+    monkeypatch.setattr(
+        throttling.redis.Redis,
+        'from_url',
+        lambda url: fakeredis.FakeStrictRedis.from_url(url, server=server),
+    )
+    monkeypatch.setattr(throttling, '_script', None)
+    return fakeredis.FakeStrictRedis(server=server)
+
+
+@pytest.mark.django_db
+class TestScopedTokenBucketThrottle:
+    """Tests for ScopedTokenBucketThrottle on the write and auth endpoints."""
+    
+    def test_login_is_limited_per_ip(self, api_client, sample_user, rates):
+        """Test that logins beyond the burst get 429 with Retry-After."""
+        rates(login='2/min')
+        data = {'username': 'testuser', 'password': 'wrong'}
+        
+        statuses = [api_client.post(LOGIN_URL, data).status_code for _ in range(3)]
+        
+        assert statuses == [400, 400, 429]
+        other = {'username': 'someoneelse', 'password': 'wrong'}
+        response = api_client.post(LOGIN_URL, other, REMOTE_ADDR='10.0.0.2')
+        assert response.status_code == 400
+    
+    def test_forwarded_for_does_not_reset_bucket(self, api_client, sample_user, rates):
+        """Test that clients cannot get a new bucket with their own X-Forwarded-For."""
+        rates(login='2/min')
+        data = {'username': 'testuser', 'password': 'wrong'}
+        
+        statuses = [
+            api_client.post(
+                LOGIN_URL, data, HTTP_X_FORWARDED_FOR=f'203.0.113.{i}'
+            ).status_code
+            for i in range(4)
+        ]
+        
+        assert statuses == [400, 400, 429, 429]
+    
+    def test_trusted_proxy_forwarded_for(self, api_client, sample_user, rates):
+        """Test that behind NUM_PROXIES trusted proxies the forwarded IP is used."""
+        rates(login='1/min', num_proxies=1)
+        data = {'username': 'testuser', 'password': 'wrong'}
+        
+        first = api_client.post(LOGIN_URL, data, HTTP_X_FORWARDED_FOR='203.0.113.1')
+        again = api_client.post(LOGIN_URL, data, HTTP_X_FORWARDED_FOR='203.0.113.1')
+        
+        assert (first.status_code, again.status_code) == (400, 429)
+    
+    def test_login_is_limited_per_username(self, api_client, sample_user, rates):
+        """Test that guesses for one account from many IPs share a bucket."""
+        rates(login='2/min')
+        data = {'username': 'testuser', 'password': 'wrong'}
+        
+        statuses = [
+            api_client.post(LOGIN_URL, data, REMOTE_ADDR=f'10.0.1.{i}').status_code
+            for i in range(3)
+        ]
+        
+        assert statuses == [400, 400, 429]
+        other = {'username': 'someoneelse', 'password': 'wrong'}
+        response = api_client.post(LOGIN_URL, other, REMOTE_ADDR='10.0.1.9')
+        assert response.status_code == 400
+    
+    def test_retry_after(self, api_client, sample_user, rates):
+        """Test that Retry-After tells when the next token is available."""
+        rates(login='1/min')
+        data = {'username': 'testuser', 'password': 'wrong'}
+        api_client.post(LOGIN_URL, data)
+        
+        response = api_client.post(LOGIN_URL, data)
+        
+        assert response.status_code == 429
+        assert 55 <= int(response['Retry-After']) <= 60
+    
+    def test_reads_are_not_throttled(self, api_client, sample_user, rates):
+        """Test that only unsafe methods spend tokens."""
+        rates(posts='1/min')
+        api_client.force_authenticate(user=sample_user)
+        
+        for _ in range(3):
+            assert api_client.get('/api/posts/').status_code == 200
+        first = api_client.post('/api/posts/', {'title': 'One', 'content': 'Body.'})
+        second = api_client.post('/api/posts/', {'title': 'Two', 'content': 'Body.'})
+        assert (first.status_code, second.status_code) == (201, 429)
+        assert BlogPost.objects.count() == 1
+    
+    def test_comments_are_limited_per_user(
+        self, api_client, sample_post, sample_user, rates
+    ):
+        """Test that each user has their own bucket."""
+        rates(comments='1/min')
+        other_user = User.objects.create_user(username='other', password='pass12345')
+        url = f'/api/posts/{sample_post.id}/comments/'
+        
+        for user in [sample_user, other_user]:
+            token = Token.objects.create(user=user)
+            api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+            assert api_client.post(url, {'content': 'First.'}).status_code == 201
+            assert api_client.post(url, {'content': 'Second.'}).status_code == 429
+    
+    def test_bucket_refills(self, monkeypatch):
+        """Test that tokens come back at the configured rate."""
+        now = [1000.0]
+        monkeypatch.setattr(throttling.time, 'time', lambda: now[0])
+        
+        assert throttling.cache_take_token('bucket', 2, 1.0) == (True, 0.0)
+        assert throttling.cache_take_token('bucket', 2, 1.0) == (True, 0.0)
+        assert throttling.cache_take_token('bucket', 2, 1.0) == (False, 1.0)
+        now[0] += 0.5
+        assert throttling.cache_take_token('bucket', 2, 1.0) == (False, 0.5)
+        now[0] += 0.5
+        assert throttling.cache_take_token('bucket', 2, 1.0) == (True, 0.0)
+    
+    def test_fails_open(self, api_client, sample_user, rates, monkeypatch):
+        """Test that requests go through when the cache cannot be reached."""
+        rates(login='1/min')
+        
+        def unavailable(*args):
+            raise ConnectionError('cache down')
+        
+        monkeypatch.setattr(throttling, 'take_token', unavailable)
+        data = {'username': 'testuser', 'password': 'testpass123'}
+        
+        for _ in range(3):
+            assert api_client.post(LOGIN_URL, data).status_code == 200
+
+
+@pytest.mark.django_db
+class TestRedisTokenBucket:
+    """Tests for the Lua token bucket used with Django's Redis cache."""
+    
+    def test_bucket_spends_and_waits(self, redis_cache):
+        """Test that the script allows the burst, then reports the wait for a token."""
+        results = [throttling.take_token('bucket', 2, 1.0) for _ in range(3)]
+        
+        assert [allowed for allowed, _ in results] == [True, True, False]
+        assert results[0][1] == 0
+        assert 0.9 <= results[2][1] <= 1.0
+    
+    def test_bucket_state_expires(self, redis_cache):
+        """Test that an idle bucket expires once it would be full again."""
+        throttling.take_token('bucket', 10, 1.0)
+        
+        redis_key = cache.make_and_validate_key('bucket')
+        assert set(redis_cache.hgetall(redis_key)) == {b'tokens', b'ts'}
+        assert 0 < redis_cache.pttl(redis_key) <= 10000
+    
+    def test_login_throttled_through_redis(
+        self, api_client, sample_user, rates, redis_cache
+    ):
+        """Test that the endpoints are throttled by the Lua script with Redis."""
+        rates(login='2/min')
+        data = {'username': 'testuser', 'password': 'wrong'}
+        
+        statuses = [api_client.post(LOGIN_URL, data).status_code for _ in range(3)]
+        
+        assert statuses == [400, 400, 429]
+        assert throttling._script is not None
+    
+    def test_one_client_per_process(self, settings, redis_cache, monkeypatch):
+        """Test that the script runs on one client opened from REDIS_URL."""
+        opened = []
+        from_url = throttling.redis.Redis.from_url
+        
+        def spy(url):
+            opened.append(url)
+            return from_url(url)
+        
+        monkeypatch.setattr(throttling.redis.Redis, 'from_url', spy)
+        for key in ['first', 'second', 'first']:
+            throttling.take_token(key, 5, 1.0)
+        
+        assert opened == [settings.REDIS_URL]
+        redis_key = cache.make_and_validate_key('first')
+        assert float(redis_cache.hget(redis_key, 'tokens')) == pytest.approx(3, abs=0.1)
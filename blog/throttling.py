@@ -0,0 +1,176 @@
+"""
+Token bucket rate limiting for the write and authentication endpoints.
+
+``ScopedTokenBucketThrottle`` limits the views that set ``throttle_scope``,
+per user for authenticated requests and per client IP otherwise, at the rate
+configured for the scope in ``DEFAULT_THROTTLE_RATES`` (e.g. ``'30/min'``:
+bursts of up to 30 requests, refilled at 30 per minute). Only unsafe methods
+are throttled, so the read side of a view is never limited. Views that set
+``throttle_identity_field`` (login: ``username``) also get a bucket per value
+of that field, so spreading guesses for one account over many IPs does not
+help.
+
+The client IP is DRF's ``get_ident``: ``REMOTE_ADDR``, or the address the
+``NUM_PROXIES`` trusted proxies put in ``X-Forwarded-For``, so clients cannot
+get a fresh bucket by sending their own ``X-Forwarded-For``.
+
+With Django's Redis cache each check is a single atomic Lua script (one round
+trip, using Redis' clock), so concurrent workers cannot overspend a bucket. The
+script runs on a client each process opens to ``REDIS_URL``. Other cache
+backends (locmem in tests and development) fall back to a
+read-modify-write under a per-process lock.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+
+import redis
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_CACHE_KEY = 'throttle_{}_{}'
+
+# KEYS[1]: bucket; ARGV[1]: capacity; ARGV[2]: tokens refilled per millisecond.
+# Returns {allowed (0/1), milliseconds until the next token}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_per_ms = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local last = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * refill_per_ms)
+local allowed = 0
+local wait_ms = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait_ms = math.ceil((1 - tokens) / refill_per_ms)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill_per_ms))
+return {allowed, wait_ms}
+"""
+
+_fallback_lock = threading.Lock()
+_script = None
+
+
+def token_bucket_script():
+    """The token bucket script, registered on this process' Redis client."""
+    global _script
+    if _script is None:
+        client = redis.Redis.from_url(settings.REDIS_URL)
+        # Script objects use EVALSHA and only send the source after NOSCRIPT
+        _script = client.register_script(TOKEN_BUCKET_SCRIPT)
+    return _script
+
+
+def redis_take_token(key, capacity, refill_per_second):
+    """Run the token bucket script for ``key``; return ``(allowed, wait_seconds)``."""
+    redis_key = caches[DEFAULT_CACHE_ALIAS].make_and_validate_key(key)
+    allowed, wait_ms = token_bucket_script()(
+        keys=[redis_key], args=[capacity, refill_per_second / 1000]
+    )
+    return bool(allowed), int(wait_ms) / 1000
+
+
+def cache_take_token(key, capacity, refill_per_second):
+    """Token bucket on a non-Redis cache, atomic within this process only."""
+    with _fallback_lock:
+        now = time.time()
+        tokens, last = cache.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + max(0.0, now - last) * refill_per_second)
+        if tokens >= 1:
+            allowed, wait = True, 0.0
+            tokens -= 1
+        else:
+            allowed, wait = False, (1 - tokens) / refill_per_second
+        cache.set(key, (tokens, now), math.ceil(capacity / refill_per_second))
+    return allowed, wait
+
+
+def take_token(key, capacity, refill_per_second):
+    # ``cache`` is a proxy; check the backend it stands for
+    if isinstance(caches[DEFAULT_CACHE_ALIAS], RedisCache):
+        return redis_take_token(key, capacity, refill_per_second)
+    return cache_take_token(key, capacity, refill_per_second)
+
+
+class ScopedTokenBucketThrottle(SimpleRateThrottle):
+    """Token bucket per ``throttle_scope`` and user (or IP for anonymous requests)."""
+
+    scope_attr = 'throttle_scope'
+
+    def __init__(self):
+        # The rate depends on the view, so it is resolved in allow_request
+        pass
+
+    def get_rate(self):
+        # Read at call time (DRF's class attribute is frozen at import)
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f'user-{request.user.pk}'
+        else:
+            ident = f'ip-{self.get_ident(request)}'
+        return THROTTLE_CACHE_KEY.format(self.scope, ident)
+
+    def get_identity_cache_key(self, request, view):
+        """Bucket of the account named by ``throttle_identity_field``, if any."""
+        field = getattr(view, 'throttle_identity_field', None)
+        if not field:
+            return None
+        try:
+            value = request.data.get(field)
+        except (AttributeError, ParseError):
+            return None
+        if not isinstance(value, str) or not value.strip():
+            return None
+        digest = hashlib.sha256(value.strip().lower().encode()).hexdigest()
+        return THROTTLE_CACHE_KEY.format(self.scope, f'{field}-{digest}')
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        if request.method in SAFE_METHODS:
+            return True
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        keys = [
+            self.get_cache_key(request, view),
+            self.get_identity_cache_key(request, view),
+        ]
+        for key in filter(None, keys):
+            try:
+                allowed, self.wait_seconds = take_token(
+                    key, self.num_requests, self.num_requests / self.duration
+                )
+            except Exception:
+                # Fail open: an unavailable cache must not take the API down with it
+                logger.exception('Rate limit check for %s failed', key)
+                return True
+            if not allowed:
+                return False
+        return True
+
+    def wait(self):
+        return self.wait_seconds
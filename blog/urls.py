@@ -1,7 +1,12 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     BlogPostListCreateView, 
+    BlogPostBatchView,
+    BlogPostBulkCreateView,
+    BlogPostExportView,
     BlogPostDetailView, 
+    BlogSyncView,
     CommentCreateView,
     RegisterView,
     LoginView,
@@ -10,6 +15,16 @@ from .views import (
 
 app_name = 'blog'
 
+# Under ASGI the read endpoints can run on the async ORM and cache instead
+if settings.BLOG_ASYNC_READS:
+    from .async_views import AsyncBlogPostDetailView, AsyncBlogPostListView
+
+    post_list_view = AsyncBlogPostListView.as_view()
+    post_detail_view = AsyncBlogPostDetailView.as_view()
+else:
+    post_list_view = BlogPostListCreateView.as_view()
+    post_detail_view = BlogPostDetailView.as_view()
+
 urlpatterns = [
     # Authentication endpoints
     path('api/auth/register/', RegisterView.as_view(), name='register'),
@@ -19,10 +34,22 @@ urlpatterns = [
     # Blog endpoints
     # GET /api/posts - List all posts with comment count
     # POST /api/posts - Create a new post
-    path('api/posts/', BlogPostListCreateView.as_view(), name='post-list-create'),
+    path('api/posts/', post_list_view, name='post-list-create'),
+    
+    # POST /api/posts/bulk - Create many posts in one request
+    path('api/posts/bulk/', BlogPostBulkCreateView.as_view(), name='post-bulk-create'),
+    
+    # GET /api/posts/export - Stream every post as NDJSON
+    path('api/posts/export/', BlogPostExportView.as_view(), name='post-export'),
+    
+    # GET /api/posts/batch?ids=a,b,c - Retrieve several posts in one request
+    path('api/posts/batch/', BlogPostBatchView.as_view(), name='post-batch'),
     
     # GET /api/posts/{id} - Retrieve a specific post with comments
-    path('api/posts/<uuid:id>/', BlogPostDetailView.as_view(), name='post-detail'),
+    path('api/posts/<uuid:id>/', post_detail_view, name='post-detail'),
+    
+    # GET /api/sync?since={cursor} - Posts and comments changed since the cursor
+    path('api/sync/', BlogSyncView.as_view(), name='sync'),
     
     # POST /api/posts/{id}/comments - Add a new comment to the post
     path('api/posts/<uuid:post_id>/comments/', CommentCreateView.as_view(), name='comment-create'),
@@ -1,21 +1,96 @@
+import uuid
+
 from django.shortcuts import render
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import Throttled, ValidationError
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.db.models import Prefetch
 from django.contrib.auth.models import User
-from .models import BlogPost, Comment
+from .models import BlogPost, Comment, PostSummary
 from .serializers import (
     BlogPostSerializer,
     BlogPostDetailSerializer,
-    BlogPostListSerializer,
     CommentSerializer,
     LoginSerializer,
+    PostSummarySerializer,
     RegisterSerializer,
     UserSerializer
 )
+from . import fast_serializers
 from .cache_helpers import BlogCacheHelper
+from .edge_cache import (
+    POSTS_LIST_SURROGATE_KEY,
+    post_detail_surrogate_keys,
+    post_list_surrogate_keys,
+    post_surrogate_key,
+    purge_surrogate_keys,
+)
+from .exports import PostExportStream, export_limit
+from .pagination import PostListPagination
+from .conditional import (
+    build_metadata,
+    conditional_response,
+    set_validators,
+)
+from .routers import CacheFill
+from .sync import InvalidCursor, changes_since
+
+
+class CachedResponseMixin:
+    """
+    Serve GET from BlogCacheHelper with ETag and Last-Modified validators.
+    
+    Conditional requests (If-None-Match / If-Modified-Since) are answered with
+    304 from the cached validators alone, without querying or serializing.
+    Responses are also marked cacheable by CDNs and tagged with surrogate keys.
+    """
+    
+    def get_cache_key(self):
+        raise NotImplementedError
+    
+    def get_surrogate_keys(self, data):
+        """Surrogate keys to purge ``data`` from edge caches by."""
+        return []
+    
+    def cached_get(self, request, *args, **kwargs):
+        key = self.get_cache_key()
+        metadata = BlogCacheHelper.get_metadata(key)
+        if metadata is not None:
+            response = conditional_response(request, metadata)
+            if response is not None:
+                return response
+        
+        data = BlogCacheHelper.get(key)
+        if data is None:
+            # A replica may lag behind the write that invalidated the entry
+            fill = CacheFill.start()
+            with fill.reads():
+                response = super().get(request, *args, **kwargs)
+            metadata = build_metadata(
+                response.data, surrogate_keys=self.get_surrogate_keys(response.data)
+            )
+            if fill.cacheable():
+                BlogCacheHelper.set(key, response.data, metadata)
+        else:
+            response = Response(data)
+            if metadata is None:
+                metadata = build_metadata(
+                    data, surrogate_keys=self.get_surrogate_keys(data)
+                )
+                BlogCacheHelper.set_metadata(key, metadata)
+        
+        # The validators may only be known now and still match the request
+        not_modified = conditional_response(request, metadata)
+        if not_modified is not None:
+            return not_modified
+        # Lets CompressionMiddleware cache the compressed body next to the data
+        response.blog_cache_key = key
+        return set_validators(response, metadata)
 
 
 class RegisterView(generics.CreateAPIView):
@@ -25,6 +100,7 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
     permission_classes = [AllowAny]
+    throttle_scope = 'register'
 
 
 class LoginView(generics.GenericAPIView):
@@ -33,6 +109,9 @@ class LoginView(generics.GenericAPIView):
     """
     serializer_class = LoginSerializer
     permission_classes = [AllowAny]
+    throttle_scope = 'login'
+    # Also limit attempts per account, whatever IP they come from
+    throttle_identity_field = 'username'
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -57,16 +136,24 @@ class UserProfileView(generics.RetrieveAPIView):
         return self.request.user
 
 
-class BlogPostListCreateView(generics.ListCreateAPIView):
+class BlogPostListCreateView(CachedResponseMixin, generics.ListCreateAPIView):
     """
     GET /api/posts - List all posts with comment count
     POST /api/posts - Create a new post (requires authentication)
     """
     queryset = BlogPost.objects.all()
+    pagination_class = PostListPagination
+    throttle_scope = 'posts'
+    
+    def get_queryset(self):
+        if self.request.method == 'GET':
+            # Reads only touch the denormalized read model (no joins or aggregates)
+            return PostSummary.objects.order_by('-created_at')
+        return super().get_queryset()
     
     def get_serializer_class(self):
         if self.request.method == 'GET':
-            return BlogPostListSerializer
+            return PostSummarySerializer
         return BlogPostSerializer
     
     def get_permissions(self):
@@ -74,47 +161,239 @@ class BlogPostListCreateView(generics.ListCreateAPIView):
             return [IsAuthenticated()]
         return [AllowAny()]
     
+    def get_cache_key(self):
+        # One entry per page, whatever other parameters the query string has
+        query = self.paginator.cache_query(self.request.query_params)
+        return BlogCacheHelper.posts_list_key(query)
+    
+    def get_surrogate_keys(self, data):
+        return post_list_surrogate_keys(data)
+    
     def get(self, request, *args, **kwargs):
-        """Override get to implement caching for posts list."""
-        cached_data = BlogCacheHelper.get_posts_list()
-        if cached_data is not None:
-            return Response(cached_data)
-        
-        response = super().get(request, *args, **kwargs)
-        
-        BlogCacheHelper.set_posts_list(response.data)
-        
-        return response
+        """Override get to implement caching and conditional GETs for posts list."""
+        return self.cached_get(request, *args, **kwargs)
+    
+    def list(self, request, *args, **kwargs):
+        """List from values() rows (same output as PostSummarySerializer)."""
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *fast_serializers.POST_SUMMARY_FIELDS
+        )
+        page = self.paginate_queryset(queryset)
+        rows = queryset if page is None else page
+        data = [fast_serializers.post_summary_from_row(row) for row in rows]
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
     
     def perform_create(self, serializer):
         """Override perform_create to associate user and invalidate cache on new post."""
         post = serializer.save(author=self.request.user)
         BlogCacheHelper.invalidate_posts_list()
+        purge_surrogate_keys(POSTS_LIST_SURROGATE_KEY)
         return post
 
 
-class BlogPostDetailView(generics.RetrieveAPIView):
+class BlogPostBulkCreateView(generics.GenericAPIView):
+    """
+    POST /api/posts/bulk - Create many posts in one request (requires authentication)
+    """
+    serializer_class = BlogPostSerializer
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'posts'
+
+    def post(self, request, *args, **kwargs):
+        max_batch_size = settings.BLOG_BULK_CREATE_MAX_BATCH_SIZE
+        if isinstance(request.data, list) and len(request.data) > max_batch_size:
+            return Response(
+                {'detail': f'Batch size cannot exceed {max_batch_size} posts.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(
+                {'errors': self.format_errors(serializer.errors)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer.save(author=request.user)
+        BlogCacheHelper.invalidate_posts_list()
+        purge_surrogate_keys(POSTS_LIST_SURROGATE_KEY)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @staticmethod
+    def format_errors(errors):
+        """Report errors per failing item, keyed by its index in the payload."""
+        if isinstance(errors, dict):
+            # The payload itself is invalid (e.g. not a list)
+            return errors
+        return [
+            {'index': index, 'errors': item_errors}
+            for index, item_errors in enumerate(errors)
+            if item_errors
+        ]
+
+
+class BlogPostExportView(generics.GenericAPIView):
+    """
+    GET /api/posts/export - Stream every post as NDJSON (requires authentication)
+    
+    Pass ``?comments=true`` to embed each post's comments.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        if not export_limit.try_acquire():
+            raise Throttled(detail='Too many exports in progress. Try again later.')
+        try:
+            comments = request.query_params.get('comments', '').lower()
+            include_comments = comments in ('1', 'true', 'yes')
+            stream = PostExportStream(
+                include_comments=include_comments,
+                chunk_size=settings.BLOG_EXPORT_CHUNK_SIZE,
+                on_close=export_limit.release,
+            )
+        except Exception:
+            export_limit.release()
+            raise
+        return StreamingHttpResponse(stream, content_type='application/x-ndjson')
+
+
+class BlogPostBatchView(generics.GenericAPIView):
+    """
+    GET /api/posts/batch?ids=a,b,c - Retrieve several posts with comments, keyed by id
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        post_ids, errors = self.parse_ids(request.query_params.get('ids', ''))
+        if errors:
+            return Response({'ids': errors}, status=status.HTTP_400_BAD_REQUEST)
+        max_batch_size = settings.BLOG_BATCH_MAX_SIZE
+        if len(post_ids) > max_batch_size:
+            return Response(
+                {'detail': f'Batch size cannot exceed {max_batch_size} posts.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        cached = BlogCacheHelper.get_post_details(post_ids)
+        misses = [post_id for post_id in post_ids if post_id not in cached]
+        if misses:
+            # Same freshness rule as CachedResponseMixin for the shared detail entries
+            fill = CacheFill.start()
+            with fill.reads():
+                loaded = fast_serializers.get_post_details(misses)
+            entries = {
+                post_id: (data, self.build_detail_metadata(data))
+                for post_id, data in loaded.items()
+            }
+            if fill.cacheable():
+                BlogCacheHelper.set_post_details(entries)
+            cached.update(entries)
+        details = {post_id: data for post_id, (data, _) in cached.items()}
+
+        data = {
+            'results': {
+                str(post_id): details[post_id]
+                for post_id in post_ids
+                if post_id in details
+            },
+            'not_found': [
+                str(post_id) for post_id in post_ids if post_id not in details
+            ],
+        }
+        # Ids not found yet may exist after the next post is created
+        surrogate_keys = [POSTS_LIST_SURROGATE_KEY] if data['not_found'] else []
+        for detail in details.values():
+            surrogate_keys.extend(post_detail_surrogate_keys(detail))
+        # The newest regeneration of the details; now when an id is not found
+        # (it may just have been deleted) or a detail's validators were evicted
+        regenerated = [metadata for _, metadata in cached.values()]
+        last_modified = None
+        if not data['not_found'] and None not in regenerated:
+            last_modified = max(metadata['last_modified'] for metadata in regenerated)
+        surrogate_keys = list(dict.fromkeys(surrogate_keys))
+        metadata = build_metadata(data, last_modified, surrogate_keys)
+        not_modified = conditional_response(request, metadata)
+        if not_modified is not None:
+            return not_modified
+        return set_validators(Response(data), metadata)
+
+    @staticmethod
+    def parse_ids(value):
+        """Unique post ids in request order, and the errors for invalid ones."""
+        post_ids, errors = [], []
+        for item in filter(None, (part.strip() for part in value.split(','))):
+            try:
+                post_ids.append(uuid.UUID(item))
+            except ValueError:
+                errors.append(f'"{item}" is not a valid UUID.')
+        if not post_ids and not errors:
+            errors.append('Provide at least one post id.')
+        return list(dict.fromkeys(post_ids)), errors
+
+    @staticmethod
+    def build_detail_metadata(data):
+        """Validators of a detail as BlogPostDetailView would cache them."""
+        return build_metadata(
+            data, surrogate_keys=post_detail_surrogate_keys(data)
+        )
+
+
+class BlogSyncView(generics.GenericAPIView):
+    """
+    GET /api/sync?since={cursor} - Posts and comments changed after the cursor
+    
+    Omit ``since`` for the first sync; pass the returned ``next_cursor`` on the
+    following calls, straight away while ``has_more`` is true.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        # Reads stay on the primary: a lagging replica could move the cursor
+        # past rows it has not received yet
+        try:
+            data = changes_since(
+                request.query_params.get('since', ''), settings.BLOG_SYNC_PAGE_SIZE
+            )
+        except InvalidCursor as exc:
+            raise ValidationError({'since': [str(exc)]})
+        return Response(data)
+
+
+class BlogPostDetailView(CachedResponseMixin, generics.RetrieveAPIView):
     """
     GET /api/posts/{id} - Retrieve a specific post with comments
     """
-    queryset = BlogPost.objects.all()
+    queryset = BlogPost.objects.select_related('author').prefetch_related(
+        Prefetch(
+            'comments',
+            queryset=Comment.objects.select_related('author').order_by(
+                'created_at', 'id'
+            ),
+        )
+    )
     serializer_class = BlogPostDetailSerializer
     lookup_field = 'id'
     permission_classes = [AllowAny]
     
+    def get_cache_key(self):
+        return BlogCacheHelper.post_detail_key(self.kwargs.get('id'))
+    
+    def get_surrogate_keys(self, data):
+        return post_detail_surrogate_keys(data)
+    
     def get(self, request, *args, **kwargs):
-        """Override get to implement caching for post detail."""
-        post_id = self.kwargs.get('id')
-        
-        cached_data = BlogCacheHelper.get_post_detail(post_id)
-        if cached_data is not None:
-            return Response(cached_data)
-        
-        response = super().get(request, *args, **kwargs)
-        
-        BlogCacheHelper.set_post_detail(post_id, response.data)
-        
-        return response
+        """Override get to implement caching and conditional GETs for post detail."""
+        return self.cached_get(request, *args, **kwargs)
+    
+    def retrieve(self, request, *args, **kwargs):
+        """Build the detail from values() rows (same output as the serializer)."""
+        data = fast_serializers.get_post_detail(self.kwargs.get('id'))
+        if data is None:
+            raise Http404
+        return Response(data)
 
 
 class CommentCreateView(generics.CreateAPIView):
@@ -123,6 +402,7 @@ class CommentCreateView(generics.CreateAPIView):
     """
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'comments'
     
     def perform_create(self, serializer):
         post_id = self.kwargs.get('post_id')
@@ -130,5 +410,7 @@ class CommentCreateView(generics.CreateAPIView):
         comment = serializer.save(post=post, author=self.request.user)
         
         BlogCacheHelper.invalidate_all_post_cache(post_id)
+        # The comment changes the post detail and its comment count in the list
+        purge_surrogate_keys(post_surrogate_key(post_id), POSTS_LIST_SURROGATE_KEY)
         
         return comment
@@ -0,0 +1,42 @@
+"""
+Process warm-up for the application server (see ``gunicorn.conf.py``).
+
+``warm_imports`` runs in the gunicorn master before it forks, so the modules
+it loads are shared copy-on-write by every worker. ``warm_connections`` runs
+in each worker thread after the fork, so the first requests do not pay for
+opening database and cache connections.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import connections
+from django.urls import get_resolver
+
+
+logger = logging.getLogger(__name__)
+
+WARMUP_CACHE_KEY = 'warmup'
+
+
+def warm_imports():
+    """Import every view module (and what they import) by loading the URLconf."""
+    get_resolver().url_patterns
+
+
+def warm_connections():
+    """Open this thread's database connections and the cache connection pool."""
+    for connection in connections.all():
+        if not connection.settings_dict['CONN_MAX_AGE']:
+            # Closed again at the start of the first request
+            continue
+        try:
+            connection.ensure_connection()
+        except Exception:
+            # The request path reconnects (and reports) on its own
+            logger.warning(
+                'Could not open database connection %r during warm-up', connection.alias
+            )
+    try:
+        cache.get(WARMUP_CACHE_KEY)
+    except Exception:
+        logger.warning('Could not reach the cache during warm-up')
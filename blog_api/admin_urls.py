@@ -0,0 +1,12 @@
+"""
+Admin URLconf, imported the first time an /admin/ URL is resolved or reversed.
+
+The admin app is installed as ``SimpleAdminConfig``, so registering the
+``admin`` modules of the installed apps (auth, authtoken, ...) happens here
+instead of in every worker at start-up.
+"""
+from django.contrib import admin
+
+admin.autodiscover()
+
+urlpatterns = admin.site.get_urls()
@@ -14,10 +14,21 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
 from django.urls import path, include
+from django.urls.resolvers import RoutePattern, URLResolver
+
+from blog.metrics import metrics_view
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
+    # Unlike include(), a resolver given a module path imports it on first use,
+    # so API-only workers never load the admin
+    URLResolver(
+        RoutePattern('admin/'),
+        'blog_api.admin_urls',
+        app_name='admin',
+        namespace='admin',
+    ),
+    # Prometheus scrape endpoint (allowed addresses or token only)
+    path('metrics', metrics_view, name='metrics'),
     path('', include('blog.urls')),
 ]
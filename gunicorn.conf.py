@@ -0,0 +1,115 @@
+"""
+Gunicorn configuration for blog_api (loaded automatically from the working directory).
+
+Every value can be overridden with the ``GUNICORN_*`` environment variables
+below or on the command line.
+
+* Workers: one per CPU available to the process plus one; each runs
+  ``GUNICORN_THREADS`` threads (gthread), since requests mostly wait on
+  Postgres and Redis rather than use the CPU.
+* ``preload_app``: the application is imported once in the master, the URLconf
+  is loaded and ``gc.freeze()`` moves everything into the permanent
+  generation before forking, so workers share those pages copy-on-write
+  instead of dirtying them on their first garbage collection.
+* Workers are recycled after ``max_requests`` +/- jitter requests, so they do
+  not all restart at once.
+* After the fork each worker thread opens its database and cache connections.
+* With ``PROMETHEUS_MULTIPROC_DIR`` set, the metrics files of the previous run
+  are removed at start-up and those of exited workers are marked dead, so
+  ``/metrics`` aggregates only live workers (and the counters they kept).
+"""
+import gc
+import os
+from pathlib import Path
+import threading
+from concurrent.futures import wait
+
+
+def env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def available_cpus():
+    try:
+        # Honours CPU affinity / cpuset limits (containers)
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = env_int(
+    'GUNICORN_WORKERS', os.getenv('WEB_CONCURRENCY', available_cpus() + 1)
+)
+threads = env_int('GUNICORN_THREADS', 4)
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread' if threads > 1 else 'sync')
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True').lower() == 'true'
+
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10)
+
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def on_starting(server):
+    """Master, before anything else: start the metrics from zero."""
+    multiproc_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if not multiproc_dir:
+        return
+    directory = Path(multiproc_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob('*.db'):
+        path.unlink()
+
+
+def when_ready(server):
+    """Master, after the app is loaded and before the first fork."""
+    if not preload_app:
+        return
+    from blog.warmup import warm_imports
+
+    warm_imports()
+    # Do not freeze garbage into every worker
+    gc.collect()
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    """Worker, after the app is loaded: open connections in every thread."""
+    from blog.warmup import warm_connections
+
+    pool = getattr(worker, 'tpool', None)
+    if pool is None:
+        warm_connections()
+        return
+    # Connections are per thread: the barrier makes each task run on its own one
+    barrier = threading.Barrier(worker.cfg.threads, timeout=10)
+
+    def warm_thread():
+        warm_connections()
+        barrier.wait()
+
+    futures = [pool.submit(warm_thread) for _ in range(worker.cfg.threads)]
+    for future in wait(futures).done:
+        if future.exception() is not None:
+            worker.log.warning('Worker warm-up failed: %s', future.exception())
+
+
+def child_exit(server, worker):
+    """Master, after a worker exited: drop its live-only (gauge) metrics."""
+    if not os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        return
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
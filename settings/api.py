@@ -0,0 +1,39 @@
+"""
+API-only production settings for blog_api project.
+
+Requests under /api/ skip the session, CSRF, auth, messages and clickjacking
+middleware and authenticate with tokens only; /admin/ keeps the full stack.
+"""
+
+from .prod import *
+
+# Middleware only the non-API paths (the admin) need, run by FullStackMiddleware
+BLOG_FULL_STACK_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+BLOG_LEAN_PATH_PREFIXES = os.getenv('BLOG_LEAN_PATH_PREFIXES', '/api/').split(',')
+
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE
+    if middleware not in BLOG_FULL_STACK_MIDDLEWARE
+]
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('django.middleware.common.CommonMiddleware') + 1,
+    'blog.middleware.FullStackMiddleware',
+)
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'blog.authentication.CachedTokenAuthentication',
+    ],
+}
+
+# The admin's middleware runs inside FullStackMiddleware, where these checks
+# cannot see it
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
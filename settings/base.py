@@ -4,19 +4,25 @@ Base Django settings for blog_api project.
 
 import os
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
+# Load environment variables from the project's .env file, when there is one
+# (containers get their environment directly and skip importing python-dotenv)
+DOTENV_PATH = Path(__file__).resolve().parent.parent / '.env'
+if DOTENV_PATH.is_file():
+    from dotenv import load_dotenv
+
+    load_dotenv(DOTENV_PATH)
+
 
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    # Admin modules are discovered when the admin URLs are first resolved
+    # (blog_api/admin_urls.py), not at start-up
+    'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -28,14 +34,19 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.middleware.HealthCheckMiddleware',
+    'blog.middleware.RequestIDMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'blog.middleware.CompressionMiddleware',
+    'blog.middleware.QueryCountMiddleware',
+    'blog.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blog.middleware.ReplicaPinningMiddleware',
 ]
 
 ROOT_URLCONF = 'blog_api.urls'
@@ -62,6 +73,15 @@ WSGI_APPLICATION = 'blog_api.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Set when DB_HOST points at PgBouncer in transaction pooling mode. Consecutive
+# transactions may then run on different server connections, so nothing may rely
+# on session state: server-side cursors are disabled, and the database role should
+# default to UTC (ALTER ROLE ... SET timezone = 'UTC') so Django never issues
+# SET TIME ZONE on a pooled connection.
+DB_PGBOUNCER_TRANSACTION_POOLING = (
+    os.getenv('DB_PGBOUNCER_TRANSACTION_POOLING', 'False').lower() == 'true'
+)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -70,9 +90,40 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', 'postgres'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # Keep connections open between requests (seconds, 0 closes after each request)
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        # Check a reused connection before the first query of each request
+        'CONN_HEALTH_CHECKS': (
+            os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true'
+        ),
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER_TRANSACTION_POOLING,
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+        },
     }
 }
 
+# Read replicas: comma-separated hosts sharing the primary's name and credentials
+DB_REPLICA_HOSTS = [
+    host.strip()
+    for host in os.getenv('DB_REPLICA_HOSTS', '').split(',')
+    if host.strip()
+]
+DATABASES.update({
+    f'replica_{index}': {
+        **DATABASES['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}
+    }
+    for index, host in enumerate(DB_REPLICA_HOSTS, start=1)
+})
+
+# Aliases that may serve the GET paths of the post list and detail views
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['blog.routers.PrimaryReplicaRouter']
+
+# Seconds a client keeps reading from the primary after it writes (read-your-writes)
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+REPLICA_PIN_COOKIE = 'primary_pin'
+
 # Redis Configuration
 REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 
@@ -133,11 +184,99 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'blog.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
-} 
\ No newline at end of file
+    # orjson-backed JSON; falls back to the stdlib when orjson is not installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'blog.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'blog.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Number of trusted proxies in front of the app: client IPs come from their
+    # X-Forwarded-For entries, otherwise from REMOTE_ADDR (never from a header
+    # the client can set itself)
+    'NUM_PROXIES': int(os.getenv('BLOG_NUM_PROXIES', '0')),
+    # Token buckets for the writes and logins of views with a throttle_scope,
+    # per user (or per IP when anonymous)
+    'DEFAULT_THROTTLE_CLASSES': [
+        'blog.throttling.ScopedTokenBucketThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'login': os.getenv('BLOG_THROTTLE_LOGIN', '10/min'),
+        'register': os.getenv('BLOG_THROTTLE_REGISTER', '5/min'),
+        'posts': os.getenv('BLOG_THROTTLE_POSTS', '30/min'),
+        'comments': os.getenv('BLOG_THROTTLE_COMMENTS', '30/min'),
+    },
+}
+
+# Blog API Configuration
+# Seconds CachedTokenAuthentication keeps a token -> user lookup in the cache,
+# and in a per-process cache in front of it (0 disables that one)
+BLOG_AUTH_CACHE_TIMEOUT = int(os.getenv('BLOG_AUTH_CACHE_TIMEOUT', '60'))
+BLOG_AUTH_L1_TIMEOUT = int(os.getenv('BLOG_AUTH_L1_TIMEOUT', '0'))
+# Who may scrape /metrics: addresses or networks (REMOTE_ADDR), or clients
+# sending "Authorization: Bearer <BLOG_METRICS_TOKEN>" (empty disables tokens)
+BLOG_METRICS_ALLOWED_IPS = [
+    network.strip()
+    for network in os.getenv('BLOG_METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+    if network.strip()
+]
+BLOG_METRICS_TOKEN = os.getenv('BLOG_METRICS_TOKEN', '')
+# Seconds each process reuses its /readyz database and cache check results
+BLOG_READINESS_INTERVAL = float(os.getenv('BLOG_READINESS_INTERVAL', '5'))
+# Threads per gunicorn worker (read by gunicorn.conf.py as well)
+GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', '4'))
+# Password hashes (login/register) run at once per process, requests allowed to
+# wait for one, and how long they wait (seconds) before getting a 503. Running
+# plus waiting must stay below GUNICORN_THREADS so reads always get a thread;
+# the defaults give hashing half the threads and queue into all but one of the rest
+BLOG_PASSWORD_HASH_CONCURRENCY = int(
+    os.getenv('BLOG_PASSWORD_HASH_CONCURRENCY', max(1, GUNICORN_THREADS // 2))
+)
+BLOG_PASSWORD_HASH_QUEUE_DEPTH = int(
+    os.getenv(
+        'BLOG_PASSWORD_HASH_QUEUE_DEPTH',
+        max(0, GUNICORN_THREADS - 1 - BLOG_PASSWORD_HASH_CONCURRENCY),
+    )
+)
+BLOG_PASSWORD_HASH_QUEUE_TIMEOUT = float(
+    os.getenv('BLOG_PASSWORD_HASH_QUEUE_TIMEOUT', '1')
+)
+# Maximum number of posts accepted by POST /api/posts/bulk/ in a single request
+BLOG_BULK_CREATE_MAX_BATCH_SIZE = int(
+    os.getenv('BLOG_BULK_CREATE_MAX_BATCH_SIZE', '500')
+)
+# Maximum number of ids accepted by GET /api/posts/batch/
+BLOG_BATCH_MAX_SIZE = int(os.getenv('BLOG_BATCH_MAX_SIZE', '50'))
+# GET /api/posts/export/: posts fetched per query and concurrent exports per process
+BLOG_EXPORT_CHUNK_SIZE = int(os.getenv('BLOG_EXPORT_CHUNK_SIZE', '500'))
+BLOG_EXPORT_MAX_CONCURRENCY = int(os.getenv('BLOG_EXPORT_MAX_CONCURRENCY', '2'))
+# GET /api/sync/: posts and comments per page, and how old (seconds) a change
+# must be before it is returned, so late-committing writes are not skipped
+BLOG_SYNC_PAGE_SIZE = int(os.getenv('BLOG_SYNC_PAGE_SIZE', '100'))
+BLOG_SYNC_SETTLE_SECONDS = float(os.getenv('BLOG_SYNC_SETTLE_SECONDS', '2'))
+# Serve GET /api/posts/ and /api/posts/{id}/ from the async views (ASGI deployments)
+BLOG_ASYNC_READS = os.getenv('BLOG_ASYNC_READS', 'False').lower() == 'true'
+# Cache-Control of the public post list/detail responses (seconds; 0 omits
+# s-maxage / stale-while-revalidate) and the edge cache purger used on writes
+BLOG_CACHE_CONTROL_MAX_AGE = int(os.getenv('BLOG_CACHE_CONTROL_MAX_AGE', '0'))
+BLOG_CACHE_CONTROL_S_MAXAGE = int(os.getenv('BLOG_CACHE_CONTROL_S_MAXAGE', '60'))
+BLOG_CACHE_CONTROL_STALE_WHILE_REVALIDATE = int(
+    os.getenv('BLOG_CACHE_CONTROL_STALE_WHILE_REVALIDATE', '30')
+)
+BLOG_PURGER = os.getenv('BLOG_PURGER', 'blog.edge_cache.NullPurger')
+BLOG_PURGE_URL = os.getenv('BLOG_PURGE_URL', '')
+BLOG_PURGE_TOKEN = os.getenv('BLOG_PURGE_TOKEN', '')
+BLOG_PURGE_TOKEN_HEADER = os.getenv('BLOG_PURGE_TOKEN_HEADER', 'Fastly-Key')
+BLOG_PURGE_TIMEOUT = float(os.getenv('BLOG_PURGE_TIMEOUT', '2'))
+# JSON responses smaller than this many bytes are not gzip/brotli compressed
+BLOG_COMPRESSION_MIN_SIZE = int(os.getenv('BLOG_COMPRESSION_MIN_SIZE', '1024'))
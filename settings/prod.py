@@ -28,26 +28,40 @@ SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 SESSION_COOKIE_SECURE = True
 CSRF_COOKIE_SECURE = True
 
-# Logging configuration
+# Logging configuration: JSON lines written by a listener thread, so log I/O
+# never blocks a request. When the bounded queue is full, records are dropped
+# (and counted) rather than waited for.
+LOG_FILE = os.getenv('LOG_FILE', '/var/log/django/blog_api.log')
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
-        'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
-            'style': '{',
+        'json': {
+            '()': 'blog.log_handlers.JSONFormatter',
+        },
+    },
+    'filters': {
+        'request_id': {
+            '()': 'blog.log_handlers.RequestIDFilter',
         },
     },
     'handlers': {
-        'file': {
+        'queue': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': '/var/log/django/blog_api.log',
-            'formatter': 'verbose',
+            'class': 'blog.log_handlers.QueueLoggingHandler',
+            # An empty LOG_FILE logs to stderr (e.g. for container log drivers)
+            'target': (
+                {'class': 'logging.FileHandler', 'filename': LOG_FILE}
+                if LOG_FILE else {'class': 'logging.StreamHandler'}
+            ),
+            'queue_size': int(os.getenv('LOG_QUEUE_SIZE', '10000')),
+            'formatter': 'json',
+            'filters': ['request_id'],
         },
     },
     'root': {
-        'handlers': ['file'],
+        'handlers': ['queue'],
         'level': 'INFO',
     },
-} 
\ No newline at end of file
+}
@@ -1,8 +1,14 @@
 """
 Test settings for blog_api project.
 """
+import os
+
 from .base import *
 
+# The PostgreSQL-only tests (marked ``postgres``) need TEST_POSTGRES=True and
+# the usual DB_* variables; otherwise the suite runs on in-memory SQLite
+POSTGRES_DATABASE = DATABASES['default']
+
 SECRET_KEY = 'test-secret-key'
 DEBUG = True
 ALLOWED_HOSTS = ['localhost', '127.0.0.1']
@@ -11,11 +17,36 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
-    }
+    },
+    # Separate database so router tests can tell which side served a read
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
 }
 
+if os.getenv('TEST_POSTGRES', 'False').lower() == 'true':
+    DATABASES['default'] = POSTGRES_DATABASE
+
+# Replica routing is enabled per test with settings.DATABASE_REPLICAS = ['replica']
+DATABASE_REPLICAS = []
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
-} 
\ No newline at end of file
+}
+
+# Record edge cache purges instead of sending them
+BLOG_PURGER = 'blog.edge_cache.RecordingPurger'
+
+# Return sync changes as soon as they are written
+BLOG_SYNC_SETTLE_SECONDS = 0
+
+# Rates high enough for the suite; throttling tests override them
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {
+        scope: '10000/min' for scope in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+    },
+}